@@ -0,0 +1,46 @@
+"""Add organization soft delete indexes
+
+Revision ID: c4d1e7a9f2b6
+Revises: 5b3efea308c9
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d1e7a9f2b6'
+down_revision: Union[str, None] = '5b3efea308c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The queries are scoped to `deleted_at IS NULL`, so the index leads
+    # with deleted_at and then the keyset pagination columns
+    op.create_index(
+        op.f('ix_organizations_deleted_at_id'),
+        'organizations', ['deleted_at', 'id'], unique=False)
+    op.create_index(
+        op.f('ix_organizations_deleted_at_display_name'),
+        'organizations', ['deleted_at', 'display_name', 'id'], unique=False)
+    op.create_index(
+        op.f('ix_organizations_deleted_at_created_at'),
+        'organizations', ['deleted_at', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_organizations_deleted_at_created_at'),
+        table_name='organizations', )
+    op.drop_index(
+        op.f('ix_organizations_deleted_at_display_name'),
+        table_name='organizations', )
+    op.drop_index(
+        op.f('ix_organizations_deleted_at_id'),
+        table_name='organizations', )
@@ -15,7 +15,7 @@ def start_server():
         port=config.APP_PORT,
         log_level="debug" if config.ENVIRONMENT != "production" else "info",
         reload=True if config.ENVIRONMENT != "production" else False,
-        workers=1 if config.ENVIRONMENT != "production" else 4,
+        workers=config.APP_WORKERS,
     )
 
     # Open the browser automatically
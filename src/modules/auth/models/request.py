@@ -2,11 +2,12 @@ import phonenumbers
 
 from typing import Annotated, Union
 from typing_extensions import Self
-from pydantic import BaseModel, Field, model_validator, TypeAdapter, EmailStr
+from pydantic import BaseModel, Field, model_validator, EmailStr
 from pydantic_extra_types.phone_numbers import PhoneNumber, PhoneNumberValidator
 
 # Import configuration file
 from modules.base.config import config
+from modules.base.models.adapter import get_adapter
 
 # MyNumberType = Annotated[ Union[str, PhoneNumber], PhoneNumberValidator() ] 
 # USNumberType = Annotated[ Union[str, PhoneNumber], 
@@ -29,7 +30,7 @@ class UserNameModel(BaseModel):
         """
         # Check the username is for empty, email and phone number
         if '@' in self.username: # Email Validation
-            ta_email = TypeAdapter(EmailStr)
+            ta_email = get_adapter(EmailStr)
             if not ta_email.validate_python(self.username):
                 raise ValueError('Invalid email')
         elif str(self.username).isdigit(): # Phone Number Validation
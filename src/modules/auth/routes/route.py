@@ -40,7 +40,7 @@ async def logout(
     """
     Logout a user with the given access token.
     """
-    access_token: str = auth.valid_token()
+    access_token: str = await auth.valid_token()
     return await AuthController().logout(access_token, is_forced=False)
 
 
@@ -55,7 +55,7 @@ async def logout_forced(
     Logout a user with the given access token for all devices.
     This is a forced logout.
     """
-    access_token: str = auth.valid_token()
+    access_token: str = await auth.valid_token()
     return await AuthController().logout(access_token, is_forced=True)
 
 
@@ -104,5 +104,5 @@ async def refresh_token(
     """
     Refresh the access token of the user with the given refresh token.
     """
-    access_token: str = auth.valid_token()
+    access_token: str = await auth.valid_token()
     return await AuthController().refresh_token(access_token, request)
@@ -1,13 +1,13 @@
 """ Import the required modules """
 import json
-from typing import List
-from pydantic import TypeAdapter
+import logging
 
 # Include the project models
 from ..models.base import Auth
 from ..models.request import *
 from modules.user.models.user import User
 from modules.base.models.auth.claim import AuthClaim
+from modules.base.models.adapter import get_adapter
 
 # include the project services
 from modules.base.services.base import BaseService
@@ -22,6 +22,12 @@ from ..events.login_event import LoginEvent
 # Include the module exceptions
 from modules.base.exceptions.base import *
 
+# Load data from config file
+from modules.base.config import config
+
+# Initialize the logger
+logger = logging.getLogger(__name__)
+
 class AuthService:
     """ AuthService class to handle authentication related operations. """
     def __init__(self):
@@ -47,7 +53,7 @@ class AuthService:
                 raise AuthenticationException()
             else:
                 # Create and store the claim
-                claim: AuthClaim = self.claim_service.create(
+                claim: AuthClaim = await self.claim_service.create(
                     payload={
                         "user_id": authenticated_user.id
                     },
@@ -74,26 +80,29 @@ class AuthService:
         """
         try:
             # Get the claim from storage
-            claim = self.claim_service.get(value=token)
+            claim = await self.claim_service.get(value=token)
             if not claim:
                 raise InvalidTokenException()
 
-            if (is_forced is True) and (claim.token is not None):
-                refresh_token = claim.token.refresh_token
-                if refresh_token:
-                    # Get all the claims for the user from refresh token
-                    claims: List[AuthClaim] = self.claim_service.get_all(
-                        {
-                            refresh_token: refresh_token
-                        }
+            if (is_forced is True) and (claim.user_id is not None):
+                # Delete all the claims for the user, found through the
+                # user index. The index is eventually consistent, so the
+                # current claim is always revoked as well.
+                try:
+                    await self.claim_service.delete_user(
+                        user_id=claim.user_id, values=[token]
+                    )
+                except AWSValueException as e:
+                    # The user index is not provisioned (see
+                    # DynamoDBService.create_claim_user_index)
+                    logger.error(
+                        "Unable to query the claims of the user %s, only the "
+                        "current claim is revoked: %s", claim.user_id, e.message
                     )
-                    if claims:
-                        # Delete all the claims for the user
-                        for claim in claims:
-                            self.claim_service.delete(value=claim.token)
+                    await self.claim_service.delete(value=token)
             else:
                 # Delete the claim from storage
-                self.claim_service.delete(value=token)
+                await self.claim_service.delete(value=token)
 
             # Raise event for successful logout
 
@@ -203,18 +212,18 @@ class AuthService:
         """
         try:
             # Get the claim from storage
-            claim = self.claim_service.get(value=token)
+            claim = await self.claim_service.get(value=token)
             if not claim:
                 raise InvalidTokenException()
             
             print(f"Claim: {claim}")
 
-            authenticated_user: User = TypeAdapter(User).validate_python(claim.user, experimental_allow_partial=True)
+            authenticated_user: User = get_adapter(User).validate_python(claim.user, experimental_allow_partial=True)
             if not authenticated_user:
                 raise InvalidTokenException()
 
             # Create and store the claim
-            claim: AuthClaim = self.claim_service.create(
+            claim: AuthClaim = await self.claim_service.create(
                 payload={
                     "user_id": authenticated_user.id
                 },
@@ -222,7 +231,7 @@ class AuthService:
             )
 
             # Delete the old claim from storage
-            self.claim_service.delete(value=token)
+            await self.claim_service.delete(value=token)
 
             return claim
         except Exception as e:
@@ -1,7 +1,7 @@
 """ Import the required modules """
 import datetime
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 # Importing necessary modules from SQLAlchemy
 from sqlalchemy import (
@@ -54,6 +54,7 @@ class BaseSchemaAuditLog(AbstractBaseSchema):
     # Audit fields
     created_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(tz=datetime.timezone.utc),
         server_default=func.UTC_TIMESTAMP(),
         sort_order=1000
     )
@@ -86,6 +87,7 @@ class BaseSchemaUUID(AbstractBaseSchema):
     # Unique identifiers
     hash: Mapped[UUID] = mapped_column(
         String(length=36), unique=True, index=True,
+        default=lambda: str(uuid4()),
         server_default=func.UUID(),
         sort_order=-9
     )
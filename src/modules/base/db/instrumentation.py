@@ -0,0 +1,112 @@
+""" Import the required modules """
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from modules.base.config import config
+
+# Initialize the logger
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    The SQL statements run within a scope (e.g. a request): their number,
+    the total time spent in the database and the slowest one.
+    """
+    __slots__ = ("count", "total_time", "slowest_time", "slowest_statement", "parent")
+
+    def __init__(self, parent: "QueryStats | None" = None):
+        self.count: int = 0
+        self.total_time: float = 0.0
+        self.slowest_time: float = 0.0
+        self.slowest_statement: str | None = None
+        self.parent = parent
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+        if self.parent is not None:
+            self.parent.record(statement, duration)
+
+
+# The statistics of the current scope, None when not collected
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    """
+    Time every statement run by the engine, record it in the statistics
+    of the current scope and log the statements slower than
+    `DB_SLOW_QUERY_THRESHOLD` milliseconds.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn, _cursor, _statement, _parameters, _context, _executemany
+    ):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn, _cursor, statement, _parameters, _context, _executemany
+    ):
+        duration = time.perf_counter() - conn.info["query_started_at"].pop()
+
+        stats = query_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+
+        if duration * 1000 >= config.DB_SLOW_QUERY_THRESHOLD:
+            logger.warning(
+                "Slow query on %s (%.1f ms): %s",
+                sync_engine.pool.logging_name, duration * 1000, statement
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(context):
+        # A failed statement never reaches after_cursor_execute, drop its
+        # start time so the stack of the pooled connection stays balanced
+        if context.connection is None or context.execution_context is None:
+            return
+        if context.is_pre_ping:
+            return
+
+        started_at = context.connection.info.get("query_started_at")
+        if started_at:
+            started_at.pop()
+
+
+@contextmanager
+def count_queries(budget: int | None = None) -> Iterator[QueryStats]:
+    """
+    Collect the statistics of the statements run within the block. The
+    statements are still counted in the enclosing scope.
+
+    When a budget is given, an AssertionError is raised if the block runs
+    more statements than the budget.
+
+        with count_queries(budget=2) as stats:
+            await repository.get_all(limit=100)
+    """
+    stats = QueryStats(parent=query_stats.get())
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+
+    if budget is not None and stats.count > budget:
+        raise AssertionError(
+            f"Expected at most {budget} queries, {stats.count} were run"
+        )
@@ -0,0 +1,128 @@
+""" Import the required modules """
+import time
+from typing import Any, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+class PoolMetrics:
+    """
+    Live statistics of a connection pool, collected from the SQLAlchemy
+    pool events. It tracks the checkouts, the time spent waiting for a
+    connection and the age of the open connections. The connection time
+    is kept in the `info` of the connection record.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts: int = 0
+        self.invalidations: int = 0
+        self.wait_time_total: float = 0.0
+        self.wait_time_max: float = 0.0
+        self.records: set[Any] = set()
+
+    def record_wait(self, duration: float) -> None:
+        self.checkouts += 1
+        self.wait_time_total += duration
+        self.wait_time_max = max(self.wait_time_max, duration)
+
+    def record_connect(self, connection_record: Any) -> None:
+        connection_record.info["connected_at"] = time.time()
+        self.records.add(connection_record)
+
+    def record_close(self, connection_record: Any) -> None:
+        self.records.discard(connection_record)
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        """ Get the statistics of the pool """
+        now = time.time()
+        ages = [
+            now - record.info["connected_at"]
+            for record in list(self.records)
+            if "connected_at" in record.info
+        ]
+
+        stats = {
+            "connections": len(ages),
+            "checkouts": self.checkouts,
+            "invalidations": self.invalidations,
+            "wait_time_total": round(self.wait_time_total, 6),
+            "wait_time_max": round(self.wait_time_max, 6),
+            "wait_time_avg": round(self.wait_time_total / self.checkouts, 6)
+                if self.checkouts else 0.0,
+            "oldest_connection_age": round(max(ages), 3) if ages else 0.0,
+            "average_connection_age": round(sum(ages) / len(ages), 3) if ages else 0.0,
+        }
+
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+            })
+
+        return stats
+
+
+# Metrics of the instrumented pools, keyed by pool logging name
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default async queue pool, timing how long each checkout waits for
+    a connection (including the time to open a new one).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics = pool_metrics.get(self.logging_name)
+            if metrics is not None:
+                metrics.record_wait(time.perf_counter() - started)
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> PoolMetrics:
+    """
+    Register the pool event listeners of the engine. The engine must be
+    created with the InstrumentedAsyncAdaptedQueuePool pool class and the
+    same `pool_logging_name`.
+    """
+    metrics = pool_metrics.setdefault(name, PoolMetrics(name))
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(_dbapi_connection, connection_record):
+        metrics.record_connect(connection_record)
+
+    @event.listens_for(pool, "close")
+    def _on_close(_dbapi_connection, connection_record):
+        metrics.record_close(connection_record)
+
+    @event.listens_for(pool, "detach")
+    def _on_detach(_dbapi_connection, connection_record):
+        metrics.record_close(connection_record)
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(_dbapi_connection, connection_record, _exception):
+        metrics.invalidations += 1
+        metrics.record_close(connection_record)
+
+    return metrics
+
+
+def get_pool_stats(engines: Iterable[AsyncEngine]) -> dict[str, dict[str, Any]]:
+    """ Get the live statistics of the pools of the given engines """
+    stats = {}
+    for engine in engines:
+        pool = engine.sync_engine.pool
+        metrics = pool_metrics.get(pool.logging_name)
+        if metrics is not None:
+            stats[metrics.name] = metrics.snapshot(pool)
+
+    return stats
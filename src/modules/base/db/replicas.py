@@ -0,0 +1,202 @@
+""" Import the required modules """
+import asyncio
+import itertools
+import logging
+import random
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from modules.base.config import config
+
+# Initialize the logger
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    """ A read replica and its health state """
+
+    def __init__(self, engine: AsyncEngine, weight: int = 1):
+        self.engine = engine
+        self.name = engine.sync_engine.pool.logging_name
+        self.weight = max(weight, 0)
+        self.healthy = True
+        self.ejected_at: float | None = None
+        self.lag: int | None = None
+
+    @property
+    def outstanding(self) -> int:
+        """ The connections checked out of the replica pool """
+        return self.engine.sync_engine.pool.checkedout()
+
+    def eject(self, reason: str) -> None:
+        if self.healthy:
+            logger.warning("Ejecting read replica %s: %s", self.name, reason)
+        self.healthy = False
+        self.ejected_at = time.time()
+
+    def readmit(self) -> None:
+        if not self.healthy:
+            logger.info("Readmitting read replica %s", self.name)
+        self.healthy = True
+        self.ejected_at = None
+
+
+class ReplicaBalancer:
+    """ ReplicaBalancer class to spread the reads across the read replicas.
+
+    The replica is chosen with one of the strategies below:
+        - `round_robin`: each replica in turn
+        - `least_connections`: the replica with the fewest checked out connections
+        - `weighted`: at random, in proportion to the replica weight
+
+    A replica is ejected when one of its connections is lost, or when the
+    background health check fails or finds it lagging behind the source
+    by more than `READER_DB_MAX_LAG` seconds. Ejected replicas are checked
+    again on every run and readmitted once healthy. Without the health
+    checks, an ejected replica is readmitted by `choose` once it has been
+    out for `READER_DB_EJECT_COOLDOWN` seconds, and ejected again on its
+    next lost connection. When no replica is healthy, `choose` returns
+    None and the reads go to the writer.
+    """
+
+    def __init__(self, engines: list[AsyncEngine],
+            weights: list[int] | None = None,
+            strategy: str = config.READER_DB_BALANCER,
+            health_check_interval: int = config.READER_DB_HEALTH_CHECK_INTERVAL,
+            max_lag: int = config.READER_DB_MAX_LAG,
+            eject_cooldown: int = config.READER_DB_EJECT_COOLDOWN
+        ):
+        weights = weights or []
+        self.replicas = [
+            Replica(engine, weights[index] if index < len(weights) else 1)
+            for index, engine in enumerate(engines)
+        ]
+        self.strategy = strategy
+        self.health_check_interval = health_check_interval
+        self.max_lag = max_lag
+        self.eject_cooldown = eject_cooldown
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+        for replica in self.replicas:
+            self._listen(replica)
+
+
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        return [replica.engine for replica in self.replicas]
+
+
+    def choose(self) -> AsyncEngine | None:
+        """ Choose the replica engine of the next read """
+        if self.health_check_interval <= 0:
+            self._readmit_cooled_down()
+
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+
+        if len(healthy) == 1:
+            return healthy[0].engine
+
+        match self.strategy:
+            case "least_connections":
+                replica = min(healthy, key=lambda replica: replica.outstanding)
+            case "weighted":
+                weights = [replica.weight for replica in healthy]
+                if not any(weights):
+                    return None
+                replica = random.choices(healthy, weights=weights)[0]
+            case _:
+                replica = healthy[next(self._counter) % len(healthy)]
+
+        return replica.engine
+
+
+    async def check_health(self) -> None:
+        """ Check every replica, ejecting or readmitting it """
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+
+    async def start(self) -> None:
+        """ Start the background health checks """
+        if self._task is None and self.health_check_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+
+    async def stop(self) -> None:
+        """ Stop the background health checks """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "weight": replica.weight,
+                "lag": replica.lag,
+                "outstanding": replica.outstanding,
+            }
+            for replica in self.replicas
+        ]
+
+
+    def _readmit_cooled_down(self) -> None:
+        """ Readmit the replicas ejected for longer than the cool-down """
+        now = time.time()
+        for replica in self.replicas:
+            if (not replica.healthy and replica.ejected_at is not None
+                    and now - replica.ejected_at >= self.eject_cooldown):
+                replica.readmit()
+
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.error("Unable to check the read replicas: %s", e)
+
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as connection:
+                if self.max_lag > 0:
+                    result = await connection.execute(text("SHOW REPLICA STATUS"))
+                    status = result.mappings().first()
+                    lag = None
+                    if status is not None:
+                        lag = status.get("Seconds_Behind_Source",
+                            status.get("Seconds_Behind_Master"))
+                    replica.lag = lag
+                    if lag is None:
+                        replica.eject("replication is not running")
+                        return
+                    if lag > self.max_lag:
+                        replica.eject(f"replication lag of {lag}s")
+                        return
+                else:
+                    await connection.execute(text("SELECT 1"))
+
+            replica.readmit()
+        except Exception as e:
+            replica.eject(str(e))
+
+
+    def _listen(self, replica: Replica) -> None:
+        @event.listens_for(replica.engine.sync_engine, "handle_error")
+        def _on_error(context):
+            # A stale pooled connection found by the pre-ping is replaced
+            # transparently, it does not make the replica unhealthy
+            if context.is_disconnect and not context.is_pre_ping:
+                replica.eject("connection lost")
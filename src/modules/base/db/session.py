@@ -3,17 +3,27 @@ from contextlib import asynccontextmanager
 from contextvars import ContextVar, Token
 from enum import Enum
 from typing import AsyncGenerator
+from uuid import uuid4
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
 from sqlalchemy.sql.expression import Delete, Insert, Update
 
 from modules.base.config import config
+from modules.base.db.base import BaseSchemaAuditLogDeleteLog
+from modules.base.db.pool_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    instrument_engine,
+)
+from modules.base.db.replicas import ReplicaBalancer
+from modules.base.db.instrumentation import instrument_queries
 
 session_context: ContextVar[str] = ContextVar("session_context")
 
@@ -35,15 +45,37 @@ class EngineType(Enum):
     READER = "reader"
 
 
+def create_engine(url: str, engine_type: EngineType, name: str) -> AsyncEngine:
+    """
+    Create an engine with the pool settings of its type (e.g.
+    `WRITER_DB_POOL_SIZE`), the pool metrics and the query listeners.
+    """
+    prefix = engine_type.name
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_logging_name=name,
+        pool_size=getattr(config, f"{prefix}_DB_POOL_SIZE"),
+        max_overflow=getattr(config, f"{prefix}_DB_MAX_OVERFLOW"),
+        pool_timeout=getattr(config, f"{prefix}_DB_POOL_TIMEOUT"),
+        pool_recycle=getattr(config, f"{prefix}_DB_POOL_RECYCLE"),
+        pool_pre_ping=getattr(config, f"{prefix}_DB_POOL_PRE_PING"),
+        pool_use_lifo=getattr(config, f"{prefix}_DB_POOL_USE_LIFO"),
+    )
+    instrument_engine(engine, name)
+    instrument_queries(engine)
+    return engine
+
+
+reader_engines = [
+    create_engine(url, EngineType.READER, "reader" if index == 0 else f"reader_{index}")
+    for index, url in enumerate(config.READER_DB_URLS or [config.READER_DB_URL])
+]
+replica_balancer = ReplicaBalancer(reader_engines, weights=config.READER_DB_WEIGHTS)
+
 engines = {
-    EngineType.WRITER: create_async_engine(
-        config.WRITER_DB_URL,
-        pool_recycle=3600
-    ),
-    EngineType.READER: create_async_engine(
-        config.READER_DB_URL,
-        pool_recycle=3600
-    ),
+    EngineType.WRITER: create_engine(config.WRITER_DB_URL, EngineType.WRITER, "writer"),
+    EngineType.READER: reader_engines[0],
 }
 
 
@@ -56,12 +88,46 @@ class RoutingSession(Session):
         """
         Returns the appropriate engine based on the operation type.
         If the operation is a write operation (Update, Delete, Insert),
-        it uses the writer engine. Otherwise, it uses the reader engine.
+        it uses the writer engine. Otherwise, it uses a read replica
+        chosen by the balancer, kept for the rest of the session.
+
+        Once the session has written, its reads also go to the writer
+        so the request reads its own writes (`DB_READ_YOUR_WRITES`).
         """
         if self._flushing or isinstance(clause, (Update, Delete, Insert)):
+            self.info["has_written"] = True
             return engines[EngineType.WRITER].sync_engine
 
-        return engines[EngineType.READER].sync_engine
+        if config.DB_READ_YOUR_WRITES and self.info.get("has_written"):
+            return engines[EngineType.WRITER].sync_engine
+
+        reader = self.info.get("reader")
+        if reader is None:
+            reader = replica_balancer.choose() or engines[EngineType.WRITER]
+            self.info["reader"] = reader
+
+        return reader.sync_engine
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _exclude_soft_deleted(execute_state: ORMExecuteState) -> None:
+    """
+    Scopes the SELECTs (including the relationship loads) to the rows that
+    are not soft deleted. The `include_deleted` execution option turns the
+    scoping off for a statement.
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                BaseSchemaAuditLogDeleteLog,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True,
+            )
+        )
 
 
 _async_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
@@ -86,3 +152,18 @@ async def session_factory() -> AsyncGenerator[AsyncSession, None]:
         yield _session
     finally:
         await _session.close()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[None, None]:
+    """
+    Scopes the session to the block, for the work run outside of a request
+    (e.g. a background task). The session is removed when the block exits.
+    """
+    context = set_session_context(session_id=f"task-{uuid4().hex}")
+    try:
+        yield
+    finally:
+        if session.registry.has():
+            await session.remove()
+        reset_session_context(context=context)
@@ -1,18 +1,39 @@
+from contextvars import ContextVar
 from functools import wraps
 
 from modules.base.db import session
 
+# The depth of the nested Transactional calls of the current request
+transaction_depth: ContextVar[int] = ContextVar("transaction_depth", default=0)
+
+
+def in_transaction() -> bool:
+    """ Check if the caller runs within a Transactional boundary """
+    return transaction_depth.get() > 0
+
 
 class Transactional:
+    """
+    Wraps the function in a unit of work. The writes of the repositories
+    are only tracked by the session, and flushed and committed once, when
+    the outermost Transactional call returns. Any error rolls back the
+    whole unit of work.
+    """
     def __call__(self, func):
         @wraps(func)
         async def _transactional(*args, **kwargs):
+            depth = transaction_depth.get()
+            token = transaction_depth.set(depth + 1)
             try:
                 result = await func(*args, **kwargs)
-                await session.commit()
+                if depth == 0:
+                    await session.commit()
             except Exception as e:
-                await session.rollback()
+                if depth == 0:
+                    await session.rollback()
                 raise e
+            finally:
+                transaction_depth.reset(token)
 
             return result
 
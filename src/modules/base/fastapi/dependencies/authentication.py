@@ -1,6 +1,6 @@
 """ Import the required modules """
 from typing import Annotated
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 # Include the project models
@@ -9,6 +9,11 @@ from modules.user.models.user import User
 
 # Include the project services
 from modules.base.services.auth.claim_service import ClaimService
+from modules.base.services.auth.revocation_service import revocation_list
+from modules.base.helpers.token import TokenHelper
+
+# Load data from config file
+from modules.base.config import config
 
 # Include the project exceptions
 from modules.base.exceptions import (
@@ -22,6 +27,7 @@ class AuthGaurd:
 
     def __init__(
         self,
+        request: Request,
         token: Annotated[HTTPAuthorizationCredentials, Depends(HTTPBearer(auto_error=False))],
         claim_service: ClaimService = Depends(ClaimService)
     ):
@@ -30,6 +36,7 @@ class AuthGaurd:
         associated with the token. If the token is not provided or invalid,
         an InvalidTokenException is raised.
         Args:
+            request (Request): The request, used to share the resolved claim.
             token (HTTPAuthorizationCredentials): The access token provided in the request.
             claim_service (ClaimService): The service to handle claims and user retrieval.
         """
@@ -38,6 +45,7 @@ class AuthGaurd:
                 raise InvalidTokenException(
                     error_msg_code="error_code_claim_not_found"
                 )
+            self.request = request
             self.access_token = token.credentials
             self.claim_service = claim_service
         except Exception as e:
@@ -48,14 +56,19 @@ class AuthGaurd:
         return self.access_token
 
 
-    def valid_token(self)-> str:
+    async def valid_token(self)-> str:
         """
         Validate the access token and return it if valid.
         Raise an exception if invalid.
         """
         try:
-            # This could be JWT validation.
-            claim: AuthClaim = self.claim_service.get(value=self.access_token)
+            # Verify the signature and expiry locally, without any I/O
+            if config.AUTH_VERIFICATION_MODE == "jwt":
+                jti = self._verify_jwt()
+                if jti is not None:
+                    return self.access_token
+
+            claim: AuthClaim = await self.get_claim()
             if claim is None:
                 raise InvalidTokenException(
                     error_msg_code="error_code_claim_not_found1"
@@ -66,10 +79,9 @@ class AuthGaurd:
             raise e
 
 
-    def get_user(self) -> User:
+    async def get_user(self) -> User:
         try:
-            # This could be JWT validation.
-            claim: AuthClaim = self.claim_service.get(value=self.access_token)
+            claim: AuthClaim = await self.get_claim()
             if claim == None:
                 raise InvalidTokenException(
                     error_msg_code="error_code_claim_not_found2"
@@ -82,6 +94,48 @@ class AuthGaurd:
             raise e
 
     
+    async def get_claim(self) -> AuthClaim:
+        """
+        Resolve the claim of the access token, at most once per request.
+        The claim is shared through the request state, so every dependency
+        and route handler of the request reuses the same claim. The
+        `claim_fetch_count` of the request state counts the fetches.
+        """
+        state = self.request.state
+        claim: AuthClaim | None = getattr(state, "auth_claim", None)
+        if claim is not None and getattr(state, "auth_claim_token", None) == self.access_token:
+            return claim
+
+        claim = await self.claim_service.get(value=self.access_token)
+        state.auth_claim = claim
+        state.auth_claim_token = self.access_token
+        state.claim_fetch_count = getattr(state, "claim_fetch_count", 0) + 1
+
+        return claim
+
+
+    def _verify_jwt(self) -> str | None:
+        """
+        Verify the access token signature and expiry, and check it has not
+        been revoked. Returns the token id, or None for the tokens issued
+        without one, which have to be verified against the claim storage.
+        """
+        try:
+            payload: dict = TokenHelper.decode(self.access_token)
+        except Exception as e:
+            raise InvalidTokenException(
+                error_msg_code="error_code_invalid_token"
+            ) from e
+
+        jti = payload.get("jti")
+        if jti is not None and revocation_list.is_revoked(jti):
+            raise InvalidTokenException(
+                error_msg_code="error_code_token_revoked"
+            )
+
+        return jti
+
+
     # async def valid_token(self, token: str) -> str:
     #     try:
     #         # This could be JWT validation, looking up a session token in the DB, etc.
@@ -1,2 +1,11 @@
-async def common_parameters(q: str | None = None, skip: int = 0, limit: int = 100):
-    return {"q": q, "skip": skip, "limit": limit}
\ No newline at end of file
+from typing import Literal
+
+
+async def common_parameters(
+        q: str | None = None, skip: int = 0, limit: int = 100,
+        cursor: str | None = None, sort_by: str = "id",
+        order: Literal["asc", "desc"] = "asc"):
+    return {
+        "q": q, "skip": skip, "limit": limit,
+        "cursor": cursor, "sort_by": sort_by, "order": order
+    }
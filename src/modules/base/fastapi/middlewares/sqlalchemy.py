@@ -1,24 +1,69 @@
 """ Import the required modules """
-from uuid import uuid4
+import itertools
+import logging
 
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from modules.base.config import config
 from modules.base.db.session import set_session_context, reset_session_context, session
+from modules.base.db.instrumentation import QueryStats, query_stats
+
+# Initialize the logger
+logger = logging.getLogger(__name__)
+
+# Unique per worker process, cheaper than an uuid per request
+_session_ids = itertools.count()
 
 
 class SQLAlchemyMiddleware:
-    """ SQL Alchemy Middleware """
+    """ SQL Alchemy Middleware
+
+    Scopes the session to the request. The session is created on its first
+    use, and it checks out a connection only on its first statement, so the
+    routes that never touch the database pay for neither.
+
+    The statements of the request are counted and timed. The statistics
+    are logged once the request ends, and sent in the `X-DB-Query-*`
+    response headers when `DB_QUERY_STATS_HEADERS` is set. The headers
+    of a streaming response only cover the statements run before the
+    body.
+    """
     def __init__(self, app: ASGIApp) -> None:
         self.app = app
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        session_id = str(uuid4())
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        session_id = str(next(_session_ids))
         context = set_session_context(session_id=session_id)
+        stats = QueryStats()
+        stats_context = query_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start" and stats.count:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Query-Count", str(stats.count))
+                headers.append("X-DB-Query-Time", f"{stats.total_time * 1000:.1f}")
+            await send(message)
 
         try:
-            await self.app(scope, receive, send)
-        except Exception as e:
-            raise e
+            await self.app(
+                scope, receive,
+                send_with_stats if config.DB_QUERY_STATS_HEADERS else send
+            )
         finally:
-            await session.remove()
+            # Nothing to close when the request never used the session
+            if session.registry.has():
+                await session.remove()
             reset_session_context(context=context)
+            query_stats.reset(stats_context)
+
+            if config.DB_QUERY_STATS_LOG and stats.count:
+                logger.info(
+                    "%s %s (session %s): %d queries in %.1f ms, slowest %.1f ms: %s",
+                    scope["method"], scope["path"], session_id, stats.count,
+                    stats.total_time * 1000, stats.slowest_time * 1000,
+                    stats.slowest_statement
+                )
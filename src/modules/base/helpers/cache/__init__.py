@@ -1,11 +1,23 @@
 from .cache_manager import Cache
 from .cache_tag import CacheTag
+from .codec import JsonCodec, MsgpackCodec, PydanticCodec
 from .custom_key_maker import CustomKeyMaker
+from .factory import create_backend
+from .memory_backend import MemoryBackend
 from .redis_backend import RedisBackend
+from .sqlite_backend import SqliteBackend
+from .tiered_backend import TieredBackend
 
 __all__ = [
     "Cache",
     "RedisBackend",
+    "MemoryBackend",
+    "SqliteBackend",
+    "TieredBackend",
+    "create_backend",
     "CustomKeyMaker",
     "CacheTag",
+    "JsonCodec",
+    "MsgpackCodec",
+    "PydanticCodec",
 ]
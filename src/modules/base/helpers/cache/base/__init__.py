@@ -1,7 +1,9 @@
 from .backend import BaseBackend
+from .codec import BaseCodec
 from .key_maker import BaseKeyMaker
 
 __all__ = [
     "BaseKeyMaker",
     "BaseBackend",
+    "BaseCodec",
 ]
@@ -1,16 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import Any
 
 
 class BaseBackend(ABC):
     @abstractmethod
-    async def get(self, *, key: str) -> Any:
-        """Get"""
+    async def get(self, *, key: str) -> bytes | None:
+        """Get the encoded value, None when missing"""
 
     @abstractmethod
-    async def set(self, *, response: Any, key: str, ttl: int = 60) -> None:
-        """Set"""
+    async def set(self, *, response: bytes, key: str, ttl: int = 60) -> None:
+        """Set the encoded value"""
 
     @abstractmethod
     async def delete_startswith(self, *, value: str) -> None:
         """Delete starts with"""
+
+    async def lock(self, *, key: str, token: str, timeout: int) -> bool:
+        """
+        Lock the key across the workers for at most `timeout` seconds,
+        False when held by another token. The local backends are not shared,
+        the single-flight of the worker is enough, so it always succeeds.
+        """
+        # pylint: disable=unused-argument
+        return True
+
+    async def unlock(self, *, key: str, token: str) -> None:
+        """Unlock the key, when still held by the token"""
+
+    async def startup(self) -> None:
+        """Acquire the resources of the backend, when the server starts"""
+
+    async def shutdown(self) -> None:
+        """Release the resources of the backend, when the server stops"""
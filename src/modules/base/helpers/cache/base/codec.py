@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class BaseCodec(ABC):
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """Encode"""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Decode"""
@@ -1,8 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Any, Callable
 
 
 class BaseKeyMaker(ABC):
     @abstractmethod
-    async def make(self, *, function: Callable, prefix: str) -> str:
+    async def make(
+        self,
+        *,
+        function: Callable,
+        prefix: str,
+        args: tuple = (),
+        kwargs: dict[str, Any] | None = None,
+        exclude: set[str] | None = None,
+    ) -> str:
         """Base key maker"""
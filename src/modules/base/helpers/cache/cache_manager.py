@@ -1,13 +1,31 @@
+import asyncio
+import logging
+import math
+import random
+import time
+import typing
+from contextlib import AbstractAsyncContextManager, nullcontext
 from functools import wraps
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
 
-from .base import BaseBackend, BaseKeyMaker
+from modules.base.config import config
+
+from .base import BaseBackend, BaseCodec, BaseKeyMaker
 from .cache_tag import CacheTag
+from .codec import JsonCodec, PydanticCodec
+from .entry import pack_entry, unpack_entry
+
+# Initialize the logger
+logger = logging.getLogger(__name__)
 
 
 class CacheManager:
     def __init__(self):
         self.backend = None
         self.key_maker = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._refreshes: set[asyncio.Task] = set()
 
     def init(self, *, backend: BaseBackend, key_maker: BaseKeyMaker) -> None:
         self.backend = backend
@@ -19,34 +37,239 @@ class CacheManager:
         prefix: str | None = None,
         tag: CacheTag | None = None,
         ttl: int = 60,
+        codec: BaseCodec | None = None,
+        exclude: set[str] | None = None,
+        stale_ttl: int = 0,
+        beta: float = 1.0,
+        lock: bool = False,
+        scope: Callable[[], AbstractAsyncContextManager] | None = None,
     ):
+        """
+        Caches the result of the function, per distinct argument values.
+
+        The result is encoded with the codec. By default, a function with
+        a return annotation is cached with a PydanticCodec of that type, so
+        the cached result comes back as the same type. Otherwise the JSON
+        codec is used. The `exclude` arguments are left out of the key.
+
+        A key is computed once at a time: the concurrent misses of the
+        worker wait for the first one (single-flight). With `lock`, the
+        other workers also wait for it, through a lock of the backend, at
+        most `CACHE_LOCK_WAIT` seconds. A stale result is served meanwhile.
+
+        After `ttl`, the result is still served for `stale_ttl` seconds
+        while it is refreshed in the background (stale-while-revalidate).
+        Before `ttl`, the result may be refreshed early, more likely as the
+        expiry nears and the longer it took to compute (XFetch, `beta`
+        scales the eagerness, 0 turns it off). The background refresh runs
+        in the `scope` context, e.g. the session scope of the service, as
+        the request may be over before the refresh ends.
+
+        The errors of the backend are logged, and the function is called
+        as if the result was not cached.
+        """
         def _cached(function):
+            _codec = codec
+
             @wraps(function)
             async def __cached(*args, **kwargs):
+                nonlocal _codec
                 if not self.backend or not self.key_maker:
                     raise Exception("backend or key_maker is None")
 
+                if _codec is None:
+                    _codec = self._default_codec(function)
+
                 key = await self.key_maker.make(
                     function=function,
                     prefix=prefix if prefix else tag.value,
+                    args=args,
+                    kwargs=kwargs,
+                    exclude=exclude,
                 )
-                cached_response = await self.backend.get(key=key)
-                if cached_response:
-                    return cached_response
 
-                response = await function(*args, **kwargs)
-                await self.backend.set(response=response, key=key, ttl=ttl)
-                return response
+                async def compute() -> Any:
+                    return await self._compute(
+                        key, lambda: function(*args, **kwargs),
+                        _codec, ttl, stale_ttl, lock
+                    )
+
+                try:
+                    cached_response = await self.backend.get(key=key)
+                    entry = unpack_entry(cached_response) if cached_response is not None else None
+                    if entry is not None:
+                        payload, expires_at, delta = entry
+                        now = time.time()
+                        if now < expires_at + stale_ttl:
+                            if now >= expires_at or self._expires_early(expires_at, delta, beta):
+                                self._refresh(key, compute, scope)
+                            return _codec.decode(payload)
+                except Exception as e:
+                    logger.warning("Unable to read the cache key %s: %s", key, e)
+
+                return await self._single_flight(key, compute)
 
             return __cached
 
         return _cached
 
+    async def startup(self) -> None:
+        if self.backend:
+            await self.backend.startup()
+
+    async def shutdown(self) -> None:
+        for task in list(self._refreshes):
+            task.cancel()
+
+        if self.backend:
+            await self.backend.shutdown()
+
     async def remove_by_tag(self, *, tag: CacheTag) -> None:
         await self.backend.delete_startswith(value=tag.value)
 
     async def remove_by_prefix(self, *, prefix: str) -> None:
         await self.backend.delete_startswith(value=prefix)
 
+    async def _single_flight(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """ Computes the key once at a time, the other callers share the result """
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Computed again when the first caller was cancelled
+                if not future.cancelled():
+                    raise
+
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here, the other callers may not be waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _compute(
+        self,
+        key: str,
+        function: Callable[[], Awaitable[Any]],
+        codec: BaseCodec,
+        ttl: int,
+        stale_ttl: int,
+        lock: bool,
+    ) -> Any:
+        """ Calls the function and caches its result """
+        token = None
+        if lock:
+            token = uuid4().hex
+            try:
+                acquired = await self.backend.lock(
+                    key=key, token=token, timeout=config.CACHE_LOCK_TIMEOUT
+                )
+            except Exception as e:
+                logger.warning("Unable to lock the cache key %s: %s", key, e)
+                acquired = True
+
+            if not acquired:
+                token = None
+                payload = await self._wait_for(key, stale_ttl)
+                if payload is not None:
+                    return codec.decode(payload)
+
+        try:
+            started = time.monotonic()
+            response = await function()
+            delta = time.monotonic() - started
+
+            try:
+                await self.backend.set(
+                    response=pack_entry(codec.encode(response), time.time() + ttl, delta),
+                    key=key, ttl=ttl + stale_ttl
+                )
+            except Exception as e:
+                logger.warning("Unable to write the cache key %s: %s", key, e)
+
+            return response
+        finally:
+            if token is not None:
+                try:
+                    await self.backend.unlock(key=key, token=token)
+                except Exception as e:
+                    logger.warning("Unable to unlock the cache key %s: %s", key, e)
+
+    async def _wait_for(self, key: str, stale_ttl: int) -> bytes | None:
+        """
+        Waits for the worker holding the lock to cache the key, at most
+        `CACHE_LOCK_WAIT` seconds. A result still in its stale window is
+        served right away. None when the wait is over.
+        """
+        deadline = time.monotonic() + config.CACHE_LOCK_WAIT
+        delay = 0.01
+        while True:
+            cached_response = await self.backend.get(key=key)
+            entry = unpack_entry(cached_response) if cached_response is not None else None
+            if entry is not None and time.time() < entry[1] + stale_ttl:
+                return entry[0]
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.2)
+
+    def _refresh(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        scope: Callable[[], AbstractAsyncContextManager] | None,
+    ) -> None:
+        """ Refreshes the key in the background, unless already computing """
+        if key in self._inflight:
+            return
+
+        async def refresh() -> None:
+            try:
+                async with scope() if scope else nullcontext():
+                    await self._single_flight(key, compute)
+            except Exception as e:
+                logger.warning("Unable to refresh the cache key %s: %s", key, e)
+
+        task = asyncio.create_task(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    @staticmethod
+    def _expires_early(expires_at: float, delta: float, beta: float) -> bool:
+        """ XFetch: whether to recompute before the expiry """
+        if beta <= 0 or delta <= 0:
+            return False
+
+        return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+    @staticmethod
+    def _default_codec(function: Callable) -> BaseCodec:
+        try:
+            return_type = typing.get_type_hints(function).get("return")
+        except Exception:
+            return_type = None
+
+        if return_type is None or return_type is Any:
+            return JsonCodec()
+
+        return PydanticCodec(return_type)
+
 
 Cache = CacheManager()
@@ -3,3 +3,4 @@ from enum import Enum
 
 class CacheTag(Enum):
     GET_USER_LIST = "get_user_list"
+    GET_ORGANIZATION = "get_organization"
@@ -0,0 +1,67 @@
+from typing import Any
+
+import msgpack
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json, to_jsonable_python
+
+from modules.base.models.adapter import get_adapter
+
+from .base import BaseCodec
+
+
+class JsonCodec(BaseCodec):
+    """ JSON, the pydantic models are stored as their JSON mode dump """
+
+    def encode(self, value: Any) -> bytes:
+        return to_json(value)
+
+    def decode(self, data: bytes) -> Any:
+        return from_json(data)
+
+
+class MsgpackCodec(BaseCodec):
+    """ MessagePack, smaller and faster than JSON """
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(to_jsonable_python(value))
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data)
+
+
+class PydanticCodec(BaseCodec):
+    """ JSON, validated back into the given type (e.g. a pydantic model)
+
+    The models are stored with all their fields, the fields excluded from
+    the responses (e.g. the audit fields) included, and without their
+    computed fields, which the models forbidding extra fields would reject
+    when validated back.
+    """
+
+    def __init__(self, type_: Any):
+        self.adapter = get_adapter(type_)
+
+    def encode(self, value: Any) -> bytes:
+        return to_json(_fields(value))
+
+    def decode(self, data: bytes) -> Any:
+        return self.adapter.validate_json(data)
+
+
+def _fields(value: Any) -> Any:
+    """ The value with its models as the dicts of their fields """
+    if isinstance(value, BaseModel):
+        fields = {
+            field.alias or name: _fields(getattr(value, name))
+            for name, field in type(value).model_fields.items()
+        }
+        fields.update(_fields(value.model_extra or {}))
+        return fields
+
+    if isinstance(value, dict):
+        return {key: _fields(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_fields(item) for item in value]
+
+    return value
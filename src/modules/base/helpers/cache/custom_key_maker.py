@@ -1,18 +1,78 @@
+import enum
+import hashlib
 import inspect
-from typing import Callable
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import UUID
 
-from base.helpers.cache.base import BaseKeyMaker
+from pydantic import BaseModel
+from starlette.requests import HTTPConnection
+
+from modules.base.helpers.cache.base import BaseKeyMaker
 
 
 class CustomKeyMaker(BaseKeyMaker):
-    async def make(self, *, function: Callable, prefix: str) -> str:
-        path = f"{prefix}::{inspect.getmodule(function).__name__}.{function.__name__}"  # type: ignore
-        args = ""
+    """
+    Makes the key from the function path and a stable hash of the values
+    of its arguments, so each distinct call gets its own key:
+
+        <prefix>::<module>.<function>:<hash>
+
+    The arguments named in `exclude` (and `self`, `cls`, `request`) are
+    left out of the hash, as well as the request and websocket objects.
+    """
+    excluded: frozenset[str] = frozenset({"self", "cls", "request"})
+
+    def __init__(self):
+        self._signatures: dict[Callable, inspect.Signature] = {}
+
+    async def make(
+        self,
+        *,
+        function: Callable,
+        prefix: str,
+        args: tuple = (),
+        kwargs: dict[str, Any] | None = None,
+        exclude: set[str] | None = None,
+    ) -> str:
+        path = f"{prefix}::{inspect.getmodule(function).__name__}.{function.__qualname__}"  # type: ignore
+
+        signature = self._signatures.get(function)
+        if signature is None:
+            signature = self._signatures[function] = inspect.signature(function)
+
+        bound = signature.bind_partial(*args, **(kwargs or {}))
+        bound.apply_defaults()
+
+        excluded = self.excluded | exclude if exclude else self.excluded
+        values = {
+            name: value for name, value in bound.arguments.items()
+            if name not in excluded and not isinstance(value, HTTPConnection)
+        }
+        if not values:
+            return path
+
+        payload = json.dumps(
+            values, sort_keys=True, separators=(",", ":"), default=_normalize
+        )
+        return f"{path}:{hashlib.sha256(payload.encode()).hexdigest()[:32]}"
 
-        for arg in inspect.signature(function).parameters.values():
-            args += arg.name
 
-        if args:
-            return f"{path}.{args}"
+def _normalize(value: Any) -> Any:
+    """ Returns a JSON serializable form of the value, stable across runs """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, (tuple, bytes)):
+        return list(value)
+    if isinstance(value, (datetime, date, time, UUID, Decimal)):
+        return str(value)
 
-        return path
+    raise TypeError(
+        f"Unable to make a cache key from {type(value).__name__}, exclude the argument"
+    )
@@ -0,0 +1,20 @@
+import struct
+
+# version, logical expiry (epoch seconds), recompute time (seconds)
+HEADER = struct.Struct(">Bdd")
+VERSION = 1
+
+
+def pack_entry(payload: bytes, expires_at: float, delta: float) -> bytes:
+    """ Frames the encoded value with its expiry and recompute time """
+    return HEADER.pack(VERSION, expires_at, delta) + payload
+
+
+def unpack_entry(data: bytes) -> tuple[bytes, float, float] | None:
+    """ Returns the encoded value, its expiry and recompute time, None
+    when the entry was not framed by this version """
+    if len(data) < HEADER.size or data[0] != VERSION:
+        return None
+
+    _, expires_at, delta = HEADER.unpack_from(data)
+    return data[HEADER.size:], expires_at, delta
@@ -0,0 +1,22 @@
+from modules.base.config import config
+
+from .base import BaseBackend
+from .memory_backend import MemoryBackend
+from .redis_backend import RedisBackend
+from .sqlite_backend import SqliteBackend
+from .tiered_backend import TieredBackend
+
+
+def create_backend(name: str = config.CACHE_BACKEND) -> BaseBackend:
+    """ Returns the cache backend of the given name """
+    match name:
+        case "redis":
+            return RedisBackend()
+        case "tiered":
+            return TieredBackend(RedisBackend())
+        case "memory":
+            return MemoryBackend()
+        case "sqlite":
+            return SqliteBackend()
+        case _:
+            raise ValueError(f"Unknown cache backend: {name}")
@@ -0,0 +1,80 @@
+import bisect
+import time
+from collections import OrderedDict
+
+from modules.base.config import config
+from modules.base.helpers.cache.base import BaseBackend
+
+
+class LocalCache:
+    """
+    A bounded in-process LRU, with a TTL per entry.
+
+    The keys are also kept sorted, so the keys starting with a prefix are
+    found with a binary search rather than a walk of every key.
+    """
+
+    def __init__(self, max_size: int = config.CACHE_MEMORY_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._keys: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        if key not in self._entries:
+            bisect.insort(self._keys, key)
+
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self.delete(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def delete_startswith(self, value: str) -> None:
+        start = bisect.bisect_left(self._keys, value)
+        end = start
+        while end < len(self._keys) and self._keys[end].startswith(value):
+            del self._entries[self._keys[end]]
+            end += 1
+        del self._keys[start:end]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys.clear()
+
+
+class MemoryBackend(BaseBackend):
+    """
+    Stores the cached values in the worker memory, e.g. for the local runs
+    and the tests. The values are not shared across the workers.
+    """
+
+    def __init__(self, max_size: int = config.CACHE_MEMORY_MAX_SIZE):
+        self.local = LocalCache(max_size)
+
+    async def get(self, *, key: str) -> bytes | None:
+        return self.local.get(key)
+
+    async def set(self, *, response: bytes, key: str, ttl: int = 60) -> None:
+        self.local.set(key, response, ttl)
+
+    async def delete_startswith(self, *, value: str) -> None:
+        self.local.delete_startswith(value)
@@ -1,28 +1,112 @@
-import pickle
-from typing import Any
+import re
+import time
+from uuid import uuid4
 
-import ujson
+from redis.exceptions import ResponseError
 
-from core.helpers.cache.base import BaseBackend
-from core.helpers.redis import redis_client
+from modules.base.helpers.cache.base import BaseBackend
+from modules.base.helpers.redis import redis_client
+
+# The keys deleted per UNLINK, and the UNLINKs sent per pipeline
+DELETE_BATCH_SIZE = 500
+PIPELINE_BATCHES = 20
+
+# Releases the lock only when it is still held by the caller
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 
 class RedisBackend(BaseBackend):
-    async def get(self, *, key: str) -> Any:
-        result = await redis_client.get(key)
-        if not result:
-            return
+    """
+    Stores the cached values in Redis.
+
+    The keys are made as `<prefix>::<path>`, and each key is added to the
+    index of its prefix (tag) when it is set, a sorted set scored by the
+    expiry of the key. The expired members are pruned on every set, and
+    the index lives as long as its longest lived key.
 
-        return ujson.loads(result)
+    Deleting a tag renames its index to a key of its own, then deletes
+    the keys of that index, so the keys set meanwhile go to a new index and
+    are kept. Any other prefix, e.g. a part of the path, has no index and
+    falls back to a SCAN of the keyspace, a batch of keys at a time.
+    """
+    index_prefix: str = "cache:index"
 
-    async def set(self, *, response: Any, key: str, ttl: int = 60) -> None:
-        if isinstance(response, dict):
-            response = ujson.dumps(response)
-        else:
-            response = pickle.dumps(response)
+    async def get(self, *, key: str) -> bytes | None:
+        return await redis_client.get(key)
 
-        await redis_client.set(name=key, value=response, ex=ttl)
+    async def set(self, *, response: bytes, key: str, ttl: int = 60) -> None:
+        prefix, separator, _ = key.partition("::")
+        if not separator:
+            await redis_client.set(name=key, value=response, ex=ttl)
+            return
+
+        index = self._index(prefix)
+        now = time.time()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(name=key, value=response, ex=ttl)
+            pipe.zadd(index, {key: now + ttl})
+            pipe.zremrangebyscore(index, "-inf", now)
+            pipe.expire(index, ttl, nx=True)
+            pipe.expire(index, ttl, gt=True)
+            await pipe.execute()
 
     async def delete_startswith(self, *, value: str) -> None:
-        async for key in redis_client.scan_iter(f"{value}*"):
-            await redis_client.delete(key)
+        index = self._index(value)
+        # Keeps the expiry of the index, in case the deletion is interrupted
+        draining = f"{index}:draining:{uuid4().hex}"
+        try:
+            await redis_client.rename(index, draining)
+        except ResponseError:
+            # No such key, not a tag
+            await self._delete_scanned(value)
+            return
+
+        await self._delete_indexed(draining)
+
+    async def lock(self, *, key: str, token: str, timeout: int) -> bool:
+        return bool(await redis_client.set(f"{key}:lock", token, nx=True, ex=timeout))
+
+    async def unlock(self, *, key: str, token: str) -> None:
+        await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"{key}:lock", token)
+
+    async def _delete_indexed(self, index: str) -> None:
+        """ Deletes the keys of the index, then the index.
+
+        The keys are deleted with UNLINK in batches, a pipeline of batches
+        at a time, so the memory stays bounded whatever the index size.
+        """
+        batch = []
+        pipe = redis_client.pipeline(transaction=False)
+        async for key, _expires_at in redis_client.zscan_iter(index, count=DELETE_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= DELETE_BATCH_SIZE:
+                pipe.unlink(*batch)
+                batch = []
+                if len(pipe) >= PIPELINE_BATCHES:
+                    await pipe.execute()
+
+        if batch:
+            pipe.unlink(*batch)
+        pipe.unlink(index)
+        await pipe.execute()
+
+    async def _delete_scanned(self, prefix: str) -> None:
+        """ Deletes the keys starting with the prefix, found with a SCAN """
+        batch = []
+        match = re.sub(r"([*?\[\]\\])", r"\\\1", prefix) + "*"
+        async for key in redis_client.scan_iter(match=match, count=DELETE_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= DELETE_BATCH_SIZE:
+                await redis_client.unlink(*batch)
+                batch = []
+
+        if batch:
+            await redis_client.unlink(*batch)
+
+    def _index(self, prefix: str) -> str:
+        return f"{self.index_prefix}:{prefix}"
@@ -0,0 +1,115 @@
+import asyncio
+import sqlite3
+import sys
+import threading
+import time
+
+from modules.base.config import config
+from modules.base.helpers.cache.base import BaseBackend
+
+
+def _upper_bound(value: str) -> str | None:
+    """
+    The first string after every string starting with the value, None when
+    there is none, i.e. the value is only made of the last code point.
+    """
+    value = value.rstrip(chr(sys.maxunicode))
+    if not value:
+        return None
+
+    code_point = ord(value[-1]) + 1
+    if 0xD800 <= code_point <= 0xDFFF:
+        # The surrogates can not be encoded, the next code point follows them
+        code_point = 0xE000
+    return value[:-1] + chr(code_point)
+
+
+class SqliteBackend(BaseBackend):
+    """
+    Stores the cached values in a SQLite file, so they survive restarts
+    with no external service, e.g. for the local runs and the benchmarks.
+
+    The keys are the primary key of the table, so the keys starting with a
+    prefix are deleted with a range on the key index. The expired entries
+    are dropped when read, and all at once on startup. The blocking calls
+    run in the default executor.
+    """
+
+    def __init__(self, path: str = config.CACHE_FILE_PATH):
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def get(self, *, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, *, response: bytes, key: str, ttl: int = 60) -> None:
+        await asyncio.to_thread(self._execute,
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, response, time.time() + ttl)
+        )
+
+    async def delete_startswith(self, *, value: str) -> None:
+        if not value:
+            await asyncio.to_thread(self._execute, "DELETE FROM cache", ())
+            return
+
+        # Every key starting with the value sorts between these bounds
+        upper = _upper_bound(value)
+        if upper is None:
+            await asyncio.to_thread(self._execute,
+                "DELETE FROM cache WHERE key >= ?", (value,)
+            )
+            return
+
+        await asyncio.to_thread(self._execute,
+            "DELETE FROM cache WHERE key >= ? AND key < ?", (value, upper)
+        )
+
+    async def startup(self) -> None:
+        await asyncio.to_thread(self._execute,
+            "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+        )
+
+    async def shutdown(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._connection = connection
+
+        return self._connection
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at <= time.time():
+                with connection:
+                    connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+
+            return value
+
+    def _execute(self, statement: str, parameters: tuple) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(statement, parameters)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+
+from redis.exceptions import RedisError
+
+from modules.base.config import config
+from modules.base.helpers.cache.base import BaseBackend
+from modules.base.helpers.cache.memory_backend import LocalCache
+from modules.base.helpers.redis import redis_client
+
+# Initialize the logger
+logger = logging.getLogger(__name__)
+
+
+class TieredBackend(BaseBackend):
+    """
+    Serves the hot keys from an in-process LRU (L1) in front of a shared
+    backend (L2, e.g. Redis), so a L1 hit costs no network round trip.
+
+    The L1 entries live at most `CACHE_L1_TTL` seconds. The invalidations
+    are published on a Redis channel, and every worker drops the matching
+    L1 entries when it receives them, so the workers stay coherent.
+
+    The L1 is only used while subscribed to the invalidations. Until then,
+    e.g. when Redis is down on startup, every call goes to the L2, and the
+    subscription is retried in the background.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        max_size: int = config.CACHE_L1_MAX_SIZE,
+        ttl: int = config.CACHE_L1_TTL,
+        channel: str = config.CACHE_INVALIDATION_CHANNEL,
+    ):
+        self.backend = backend
+        self.local = LocalCache(max_size)
+        self.ttl = ttl
+        self.channel = channel
+        self._pubsub = None
+        self._task: asyncio.Task | None = None
+        self._subscribed = False
+
+    async def get(self, *, key: str) -> bytes | None:
+        if self._subscribed:
+            response = self.local.get(key)
+            if response is not None:
+                return response
+
+        response = await self.backend.get(key=key)
+        if response is not None and self._subscribed:
+            self.local.set(key, response, self.ttl)
+
+        return response
+
+    async def set(self, *, response: bytes, key: str, ttl: int = 60) -> None:
+        await self.backend.set(response=response, key=key, ttl=ttl)
+        if self._subscribed:
+            self.local.set(key, response, min(ttl, self.ttl))
+
+    async def delete_startswith(self, *, value: str) -> None:
+        self.local.delete_startswith(value)
+        await self.backend.delete_startswith(value=value)
+        try:
+            await redis_client.publish(self.channel, value)
+        except RedisError as e:
+            # The L1 entries of the other workers expire with the L1 TTL
+            logger.error("Unable to publish the cache invalidation of %s: %s", value, e)
+
+    async def lock(self, *, key: str, token: str, timeout: int) -> bool:
+        return await self.backend.lock(key=key, token=token, timeout=timeout)
+
+    async def unlock(self, *, key: str, token: str) -> None:
+        await self.backend.unlock(key=key, token=token)
+
+    async def startup(self) -> None:
+        await self.backend.startup()
+        if self._task is None:
+            self._pubsub = redis_client.pubsub()
+            self._task = asyncio.create_task(self._listen())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+        self._disconnect()
+        await self.backend.shutdown()
+
+    async def _listen(self) -> None:
+        """ Drop the L1 entries invalidated by the other workers """
+        while True:
+            try:
+                if not self._pubsub.subscribed:
+                    await self._pubsub.subscribe(self.channel)
+
+                async for message in self._pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self._subscribed = True
+                    elif message["type"] == "message":
+                        data = message["data"]
+                        self.local.delete_startswith(
+                            data.decode() if isinstance(data, bytes) else data
+                        )
+            except RedisError as e:
+                logger.error("Unable to receive the cache invalidations: %s", e)
+                self._disconnect()
+                await asyncio.sleep(1)
+
+    def _disconnect(self) -> None:
+        """ Serve from the L2 only, the invalidations may have been missed """
+        self._subscribed = False
+        self.local.clear()
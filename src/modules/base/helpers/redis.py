@@ -1,5 +1,15 @@
-#from redis import asyncio as redis
+from redis import asyncio as redis
 
 from modules.base.config import config
 
-#redis_client = redis.from_url(url=f"redis://{config.REDIS_HOST}", decode_responses=True)
+# Shared connection pool of the worker process. The responses are kept as
+# bytes, the callers decode the values they store.
+redis_pool = redis.ConnectionPool(
+    host=config.REDIS_HOST,
+    port=config.REDIS_PORT,
+    db=config.REDIS_DB,
+    password=config.REDIS_PASSWORD or None,
+    max_connections=config.REDIS_MAX_CONNECTIONS,
+)
+
+redis_client = redis.Redis(connection_pool=redis_pool)
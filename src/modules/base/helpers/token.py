@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 import jwt
 
@@ -27,17 +28,22 @@ class TokenHelper:
         expires_at = datetime.now(tz=timezone.utc) + timedelta(seconds=expire_period)
 
         # Set the payload
+        claims = {
+            **payload,
+            "exp": expires_at,                      # expiration time
+            "iat": datetime.now(tz=timezone.utc),   # issued at
+            "nbf": datetime.now(tz=timezone.utc),   # not before
+            "iss": config.JWT_ISSUER,               # issuer
+            "aud": config.JWT_AUDIENCE,             # audience
+            "jti": uuid4().hex,                     # token id
+        }
+        if subject is not None:
+            # The subject must be a string when present
+            claims["sub"] = subject                 # subject
+
         token: Token = Token()
         token.access_token = jwt.encode(
-            payload={
-                **payload,
-                "exp": expires_at,                      # expiration time
-                "iat": datetime.now(tz=timezone.utc),   # issued at
-                "nbf": datetime.now(tz=timezone.utc),   # not before
-                "iss": config.JWT_ISSUER,               # issuer
-                "aud": config.JWT_AUDIENCE,             # audience
-                "sub": subject,                         # subject
-            },
+            payload=claims,
             key=config.JWT_SECRET_KEY,
             algorithm=config.JWT_ALGORITHM,
         )
@@ -50,12 +56,16 @@ class TokenHelper:
             return jwt.decode(
                 token,
                 config.JWT_SECRET_KEY,
-                config.JWT_ALGORITHM,
+                [config.JWT_ALGORITHM],
+                audience=config.JWT_AUDIENCE,
+                issuer=config.JWT_ISSUER,
             )
         except jwt.exceptions.DecodeError:
             raise DecodeTokenException
         except jwt.exceptions.ExpiredSignatureError:
             raise ExpiredTokenException
+        except jwt.exceptions.InvalidTokenError:
+            raise DecodeTokenException
 
     @staticmethod
     def decode_expired_token(token: str) -> dict:
@@ -63,8 +73,12 @@ class TokenHelper:
             return jwt.decode(
                 token,
                 config.JWT_SECRET_KEY,
-                config.JWT_ALGORITHM,
+                [config.JWT_ALGORITHM],
+                audience=config.JWT_AUDIENCE,
+                issuer=config.JWT_ISSUER,
                 options={"verify_exp": False},
             )
         except jwt.exceptions.DecodeError:
             raise DecodeTokenException
+        except jwt.exceptions.InvalidTokenError:
+            raise DecodeTokenException
@@ -0,0 +1,28 @@
+""" Import the required modules """
+import threading
+from typing import Any
+
+from pydantic import TypeAdapter
+
+# Registry of the adapters built so far, keyed by type
+_adapters: dict[Any, TypeAdapter] = {}
+_lock = threading.Lock()
+
+
+def get_adapter(type_: Any) -> TypeAdapter:
+    """ Get the TypeAdapter for the given type.
+
+    Building a TypeAdapter builds the pydantic core schema of the type,
+    which is expensive. The adapter is built once, on first use, and
+    reused by every later call for the same type, e.g. `AuthClaim` or
+    `List[Organization]`.
+    """
+    adapter = _adapters.get(type_)
+    if adapter is None:
+        with _lock:
+            adapter = _adapters.get(type_)
+            if adapter is None:
+                adapter = TypeAdapter(type_)
+                _adapters[type_] = adapter
+
+    return adapter
@@ -23,6 +23,14 @@ class AuthClaim(BaseModel):
         return self.token.access_token
 
 
+    @computed_field(description="Claim User ID")
+    @property
+    def user_id(self) -> int | None:
+        if not self.user:
+            return None
+        return self.user.get("id")
+
+
     @computed_field(description="Claim TTL")
     @property
     def ttl(self) -> int:
@@ -1,8 +1,9 @@
 import typing
-import json
-from typing import Generic, Optional
+from typing import AsyncIterable, Generic, Literal, Optional
 from fastapi import status, Response
-from pydantic import SerializeAsAny, BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import SerializeAsAny, BaseModel, TypeAdapter
+from pydantic_core import to_json
 from starlette.background import BackgroundTask
 
 # Imclude the project modules
@@ -54,12 +55,44 @@ class ErrorModel(GenericResponseModel, Generic[T]):
     success: bool = False
 
 
+# The static response headers, encoded once for all the responses
+RESPONSE_RAW_HEADERS: list[tuple[bytes, bytes]] = [
+    (key.lower().encode("latin-1"), value.encode("latin-1"))
+    for key, value in config.RESPONSE_HEADERS.items()
+]
+
+
+def add_static_headers(raw_headers: list[tuple[bytes, bytes]]) -> None:
+    """ Append the static response headers not already set """
+    names = {name for name, _ in raw_headers}
+    raw_headers.extend(
+        header for header in RESPONSE_RAW_HEADERS if header[0] not in names
+    )
+
+
 class BaseResponse(Response):
     """
     Base class for all response models.
+
+    The content is serialized straight to bytes in a single pass, with
+    pydantic-core. Pydantic models are never dumped to an intermediate
+    dict, and the rendering of dicts and lists matches `mode="json"`.
     """
     media_type: str = "application/json"
 
+    def render(self, content: typing.Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+
+        return to_json(content)
+
+    def add_static_headers(self) -> None:
+        """
+        Append the precomputed static response headers. The headers set
+        by the caller take precedence.
+        """
+        add_static_headers(self.raw_headers)
+
 
 class JsonErrorResponse(BaseResponse):
     media_type: str = "application/json"
@@ -93,19 +126,10 @@ class JsonErrorResponse(BaseResponse):
             if exception.__class__:
                 error_model.errors['context'] = exception.__class__.__name__
 
-            content = error_model.model_dump(mode="json")
+            content = error_model
 
         super().__init__(content, status_code, headers, media_type, background)
 
-    def render(self, content: typing.Any) -> bytes:
-        return json.dumps(
-            content,
-            ensure_ascii=False,
-            allow_nan=False,
-            indent=None,
-            separators=(",", ":"),
-        ).encode("utf-8")
-
 
 """ JSON Success Response
 
@@ -123,47 +147,124 @@ class JsonSuccessResponse(BaseResponse):
         headers: typing.Mapping[str, str] | None = None,
         media_type: str | None = None,
         background: BackgroundTask | None = None,
+        metadata: dict | None = None,
     ) -> None:
+        # The envelope is kept as a model and rendered to bytes in one
+        # pass, so large lists never go through an intermediate dict.
+
         # check content is a class of pydantic model
         if isinstance(content, BaseModel):
-            model = SuccessModel[BaseModel](
+            content = SuccessModel[BaseModel](
                 status_code=status_code,
                 message=message,
-                data=content
+                data=content,
+                metadata=metadata
             )
-            content = model.model_dump(mode="json")
 
         # check content is a boolean
         if isinstance(content, bool):
-            model = SuccessModel[bool](
+            content = SuccessModel[bool](
                 status_code=status_code,
                 message=message,
-                data=content
+                data=content,
+                metadata=metadata
             )
-            content = model.model_dump(mode="json")
 
         # check content is a list
         if isinstance(content, list):
-            model = SuccessModel[list](
+            content = SuccessModel[list](
                 status_code=status_code,
                 message=message,
-                data=content
+                data=content,
+                metadata=metadata
             )
-            content = model.model_dump(mode="json")
+
+        super().__init__(content, status_code, headers, media_type, background)
 
         # Add custom headers to the response
-        if headers is None:
-            headers = {}
-        headers.update(config.RESPONSE_HEADERS)
+        self.add_static_headers()
 
-        super().__init__(content, status_code, headers, media_type, background)
 
-    def render(self, content: typing.Any) -> bytes:
-        return json.dumps(
-            content,
-            ensure_ascii=False,
-            allow_nan=False,
-            indent=None,
-            separators=(",", ":"),
-        ).encode("utf-8")
-    
\ No newline at end of file
+""" JSON Streaming Response
+
+This response class is used to stream large collections. The success
+envelope is written first and the rows are serialized one by one as they
+come from the async iterator, so the memory stays bounded whatever the
+number of rows.
+"""
+class JsonStreamingResponse(StreamingResponse):
+    """
+    Streams the rows as a JSON array inside the success envelope, or as
+    NDJSON: the envelope on the first line, then one row per line.
+
+    The rows are validated and serialized with the given adapter, e.g.
+    `get_adapter(Organization)` for the ORM rows of the organizations.
+    """
+    chunk_size: int = 64 * 1024
+
+    def __init__(
+        self,
+        content: AsyncIterable[typing.Any],
+        adapter: TypeAdapter | None = None,
+        framing: Literal["json", "ndjson"] = "json",
+        message: str = "success",
+        status_code: int = status.HTTP_200_OK,
+        headers: typing.Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        if framing not in ("json", "ndjson"):
+            raise ValueError(f"Unsupported framing: {framing}")
+
+        self.adapter = adapter
+        self.framing = framing
+        self.message = message
+
+        media_type = "application/x-ndjson" if framing == "ndjson" else "application/json"
+        super().__init__(
+            self._render(content, status_code), status_code,
+            headers, media_type, background
+        )
+
+        # Add custom headers to the response
+        add_static_headers(self.raw_headers)
+
+    def render_row(self, row: typing.Any) -> bytes:
+        if self.adapter is None:
+            return to_json(row)
+
+        return self.adapter.dump_json(self.adapter.validate_python(row))
+
+    async def _render(
+        self, content: AsyncIterable[typing.Any],
+        status_code: int) -> typing.AsyncIterator[bytes]:
+        """ Serialize the envelope and the rows incrementally """
+        if self.framing == "ndjson":
+            envelope = SuccessModel[list](status_code=status_code, message=self.message)
+            head, separator, tail = to_json(envelope) + b"\n", b"\n", b"\n"
+        else:
+            # Split an empty envelope at its data, to write the rows inside.
+            # The quotes of a message are escaped, only the key matches.
+            envelope = SuccessModel[list](
+                status_code=status_code, message=self.message, data=[]
+            )
+            head, _, tail = to_json(envelope).partition(b'"data":[]')
+            head += b'"data":['
+            separator = b","
+            tail = b"]" + tail
+
+        buffer = bytearray(head)
+        first = True
+        async for row in content:
+            if not first:
+                buffer += separator
+            buffer += self.render_row(row)
+            first = False
+
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if self.framing == "ndjson" and first:
+            tail = b""
+        buffer += tail
+        yield bytes(buffer)
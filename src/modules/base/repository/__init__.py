@@ -1,5 +1,7 @@
 from .base import BaseRepository
+from .loader import BatchLoader
 
 __all__ = [
-    "BaseRepository"
+    "BaseRepository",
+    "BatchLoader"
 ]
\ No newline at end of file
@@ -1,28 +1,53 @@
 """ Import the required modules """
+from datetime import datetime, timezone
 from functools import reduce
-from typing import Any, Generic, Type, TypeVar
+from typing import Any, AsyncIterator, Callable, Generic, Type, TypeVar
 from uuid import UUID
 
-from sqlalchemy import Select, func
+from sqlalchemy import Integer, Select, and_, bindparam, func, insert, or_, update
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     AsyncSession
 )
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 from sqlalchemy.sql.expression import select
 
 from modules.base.db.base import BaseDB
 from modules.base.exceptions import (
+    BadRequestException,
     EntityNotFoundException,
-    EntityNotSavedException,
 )
 from modules.base.db import session
+from modules.base.db.transactional import in_transaction
+from modules.base.config import config
+from .loader import BatchLoader, get_loader
+from .pagination import Cursor
 
 T = TypeVar("T", bound=BaseDB)
 
+# The relationships to load, as a set of names or a name to strategy map
+JoinSpec = set[str] | dict[str, str]
+
+# The prebuilt statements of the common lookups, per model
+_statements: dict[tuple[type, str], Select] = {}
+
+# The loader options of the eager-loading strategies
+JOIN_STRATEGIES = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "raise": raiseload,
+}
+
 
 class BaseRepository(Generic[T]):
     """Base class for data repositories."""
 
+    # The indexed columns the keyset pagination can sort by
+    keyset_columns: set[str] = {"id"}
+
+    # The default loading strategy of the relationships joined by name
+    join_strategies: dict[str, str] = {}
+
     def __init__(self, model: Type[T]):
         self.session = session
         self.model_class: Type[T] = model
@@ -36,48 +61,266 @@ class BaseRepository(Generic[T]):
         :param attributes: The attributes to create the model with.
         :return: The created model instance.
         """
-        try:
-            if attributes is None:
-                attributes = {}
+        if attributes is None:
+            attributes = {}
 
-            # Create the model instance
-            model = self.model_class(**attributes)
+        # Create the model instance
+        model = self.model_class(**attributes)
 
-            # Add the model instance to the session
-            self.session.add(model)
+        # Add the model instance to the session. Within a Transactional
+        # boundary it is flushed, so its id is set before the commit.
+        self.session.add(model)
+        await self._save(flush=True)
 
-            return model
-        except EntityNotSavedException as e:
-            raise e
+        return model
+
+    async def bulk_create(
+        self,
+        items: list[dict[str, Any]],
+        user_id: int = 0,
+        chunk_size: int = config.DB_BULK_CHUNK_SIZE) -> list[T] | int:
+        """
+        Creates the model instances with executemany INSERTs, one per chunk.
+
+        When the dialect supports RETURNING with executemany, the created
+        model instances are returned with their server generated columns.
+        Otherwise (e.g. MySQL) only the number of created rows is returned.
+        No items return an empty list, whatever the dialect.
+
+        :param items: The attributes of each model instance.
+        :param user_id: The user id creating the models.
+        :param chunk_size: The number of rows per INSERT.
+        :return: The created model instances, or the number of created rows.
+        """
+        if not items:
+            return []
+
+        if hasattr(self.model_class, "created_by"):
+            items = [{"created_by": user_id, **item} for item in items]
+
+        statement = insert(self.model_class)
+        dialect = self.session.get_bind(clause=statement).dialect
+
+        if dialect.insert_executemany_returning:
+            models: list[T] = []
+            for chunk in self._chunks(items, chunk_size):
+                result = await self.session.scalars(
+                    statement.returning(self.model_class), chunk
+                )
+                models.extend(result.all())
+
+            await self._save()
+            return models
+
+        for chunk in self._chunks(items, chunk_size):
+            await self.session.execute(statement, chunk)
+
+        await self._save()
+        return len(items)
+
+    async def bulk_update(
+        self,
+        ids: list[int],
+        attributes: dict[str, Any],
+        user_id: int = 0,
+        chunk_size: int = config.DB_BULK_CHUNK_SIZE) -> int:
+        """
+        Updates the rows matching the ids with the same attributes, using
+        a single UPDATE ... WHERE id IN per chunk. The audit columns are
+        set in Python, so the statement is portable across the dialects.
+
+        :param ids: The ids of the rows to update.
+        :param attributes: The attributes to set.
+        :param user_id: The user id updating the rows.
+        :param chunk_size: The number of ids per UPDATE.
+        :return: The number of updated rows.
+        """
+        values = dict(attributes)
+        if hasattr(self.model_class, "updated_at"):
+            values["updated_at"] = datetime.now(tz=timezone.utc)
+        if hasattr(self.model_class, "updated_by"):
+            values["updated_by"] = user_id
+
+        return await self._bulk_update(ids, values, chunk_size)
+
+    async def bulk_soft_delete(
+        self,
+        ids: list[int],
+        user_id: int = 0,
+        chunk_size: int = config.DB_BULK_CHUNK_SIZE) -> int:
+        """
+        Soft deletes the rows matching the ids, using a single
+        UPDATE ... WHERE id IN per chunk. The rows already deleted are
+        left untouched.
+
+        :param ids: The ids of the rows to soft delete.
+        :param user_id: The user id deleting the rows.
+        :param chunk_size: The number of ids per UPDATE.
+        :return: The number of deleted rows.
+        """
+        return await self._bulk_update(
+            ids,
+            {"deleted_at": datetime.now(tz=timezone.utc), "deleted_by": user_id},
+            chunk_size,
+            self.model_class.deleted_at.is_(None)
+        )
 
     async def get_all(
         self,
         skip: int = 0, limit: int = 100,
-        join_: set[str] | None = None) -> list[T]:
+        join_: JoinSpec | None = None,
+        include_deleted: bool = False) -> list[T]:
         """
         Returns a list of model instances.
 
         :param skip: The number of records to skip.
         :param limit: The number of record to return.
         :param join_: The joins to make.
+        :param include_deleted: Whether to include the soft deleted rows.
         :return: A list of model instances.
         """
         try:
-            query = self._query(join_)
+            if join_ is None:
+                query = self._statement("get_all", lambda: (
+                    select(self.model_class)
+                    .offset(bindparam("skip", type_=Integer))
+                    .limit(bindparam("limit", type_=Integer))
+                ))
+                if include_deleted:
+                    query = query.execution_options(include_deleted=True)
+                return await self._all(query, {"skip": skip, "limit": limit})
+
+            query = self._query(join_, include_deleted=include_deleted)
             query = query.offset(skip).limit(limit)
 
-            if join_ is not None:
+            if self._is_joined(join_):
                 return await self._all_unique(query)
 
             return await self._all(query)
         except EntityNotFoundException as e:
             raise e
 
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        sort_by: str = "id",
+        order: str = "asc",
+        join_: JoinSpec | None = None,
+        include_deleted: bool = False) -> tuple[list[T], str | None]:
+        """
+        Returns a page of model instances, using keyset pagination.
+
+        The page starts right after the row of the cursor, with a range
+        condition on the (sort column, id) pair, so every page costs the
+        same whatever its depth. The sort column and order of the cursor
+        take precedence over the given ones.
+
+        :param limit: The number of record to return.
+        :param cursor: The cursor of the previous page, None for the first.
+        :param sort_by: The indexed column to sort by.
+        :param order: The order to sort by. (e.g desc, asc)
+        :param join_: The joins to make.
+        :param include_deleted: Whether to include the soft deleted rows.
+        :return: The model instances and the cursor of the next page.
+        """
+        after: Cursor | None = Cursor.decode(cursor) if cursor else None
+        if after is not None:
+            sort_by, order = after.sort_by, after.order
+
+        if sort_by not in self.keyset_columns or order not in ("asc", "desc"):
+            raise BadRequestException(
+                message=f"Unable to paginate by {sort_by} {order}",
+                error_msg_code="error_code_invalid_sort"
+            )
+
+        id_column = self.model_class.id
+        sort_column = getattr(self.model_class, sort_by)
+        descending = order == "desc"
+
+        query = self._query(join_, include_deleted=include_deleted)
+        if after is not None:
+            if sort_by == "id":
+                query = query.where(
+                    id_column < after.id if descending else id_column > after.id
+                )
+            elif descending:
+                query = query.where(or_(
+                    sort_column < after.value,
+                    and_(sort_column == after.value, id_column < after.id)
+                ))
+            else:
+                query = query.where(or_(
+                    sort_column > after.value,
+                    and_(sort_column == after.value, id_column > after.id)
+                ))
+
+        if sort_by == "id":
+            query = query.order_by(id_column.desc() if descending else id_column.asc())
+        else:
+            query = query.order_by(
+                sort_column.desc() if descending else sort_column.asc(),
+                id_column.desc() if descending else id_column.asc()
+            )
+
+        # Fetch one more row to know if there is a next page
+        query = query.limit(limit + 1)
+        if self._is_joined(join_):
+            models = list(await self._all_unique(query))
+        else:
+            models = list(await self._all(query))
+
+        next_cursor: str | None = None
+        if len(models) > limit:
+            models = models[:limit]
+            last = models[-1]
+            next_cursor = Cursor(
+                sort_by=sort_by, order=order,
+                value=getattr(last, sort_by), id=last.id
+            ).encode()
+
+        return models, next_cursor
+
+    async def stream(
+        self,
+        skip: int = 0, limit: int | None = None,
+        join_: JoinSpec | None = None,
+        include_deleted: bool = False,
+        yield_per: int = config.DB_STREAM_YIELD_PER) -> AsyncIterator[T]:
+        """
+        Streams the model instances, ordered by id.
+
+        The rows are fetched with a server side cursor, `yield_per` at a
+        time, so the memory stays bounded whatever the number of rows.
+
+        :param skip: The number of records to skip.
+        :param limit: The number of record to return, all when None.
+        :param join_: The joins to make.
+        :param include_deleted: Whether to include the soft deleted rows.
+        :param yield_per: The number of rows fetched per batch.
+        :return: An async iterator of model instances.
+        """
+        query = self._query(join_, order_={"asc": ["id"]}, include_deleted=include_deleted)
+        if skip:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = await self.session.stream_scalars(
+            query, execution_options={"yield_per": yield_per}
+        )
+        if self._is_joined(join_):
+            result = result.unique()
+
+        async for model in result:
+            yield model
+
     async def get_by(
         self,
         field: str,
         value: Any,
-        join_: set[str] | None = None,
+        join_: JoinSpec | None = None,
+        include_deleted: bool = False,
         unique: bool = False) -> T:
         """
         Returns the model instance matching the field and value.
@@ -85,85 +328,137 @@ class BaseRepository(Generic[T]):
         :param field: The field to match.
         :param value: The value to match.
         :param join_: The joins to make.
+        :param include_deleted: Whether to include the soft deleted rows.
         :return: The model instance.
         """
         try:
-            query = self._query(join_)
+            if join_ is None:
+                query = self._statement(f"get_by:{field}", lambda: (
+                    select(self.model_class)
+                    .where(getattr(self.model_class, field) == bindparam("value"))
+                ))
+                if include_deleted:
+                    query = query.execution_options(include_deleted=True)
+                if unique:
+                    return await self._one(query, {"value": value})
+                return await self._all(query, {"value": value})
+
+            query = self._query(join_, include_deleted=include_deleted)
             query = await self._get_by(query, field, value)
 
-            if join_ is not None:
-                return await self._all_unique(query)
             if unique:
+                if self._is_joined(join_):
+                    return await self._one_unique(query)
                 return await self._one(query)
+            if self._is_joined(join_):
+                return await self._all_unique(query)
 
             return await self._all(query)
         except EntityNotFoundException as e:
             raise e
 
+    async def get_many(
+        self,
+        field: str,
+        values: list[Any],
+        join_: JoinSpec | None = None,
+        include_deleted: bool = False,
+        chunk_size: int = config.DB_BULK_CHUNK_SIZE) -> list[T]:
+        """
+        Returns the model instances matching any of the values, using a
+        single WHERE field IN query per chunk. The order is not kept.
+
+        :param field: The field to match.
+        :param values: The values to match.
+        :param join_: The joins to make.
+        :param include_deleted: Whether to include the soft deleted rows.
+        :param chunk_size: The number of values per query.
+        :return: The model instances.
+        """
+        column = getattr(self.model_class, field)
+        models: list[T] = []
+        for chunk in self._chunks(list(dict.fromkeys(values)), chunk_size):
+            query = self._query(join_, include_deleted=include_deleted).where(column.in_(chunk))
+            if self._is_joined(join_):
+                models.extend(await self._all_unique(query))
+            else:
+                models.extend(await self._all(query))
+
+        return models
+
+    def loader(self, field: str = "id") -> BatchLoader[T]:
+        """
+        Returns the batching loader of the model by the field, for the
+        current request.
+
+        :param field: The field to load by. (e.g id, hash, uuid)
+        :return: The loader.
+        """
+        return get_loader(self, field)
+
     async def update(
         self,
         model: T,
+        attributes: dict[str, Any] | None = None,
         user_id: int = 0) -> T:
         """
         Updates the model instance.
+
+        The audit columns are set in Python, so the model is up to date
+        without a refresh SELECT after the UPDATE.
+
         :param model: The model instance to update.
+        :param attributes: The attributes to update.
         :param user_id: The user id to update.
         :return: The updated model instance.
         """
-        try:
-            for key, value in attributes.items():
-                setattr(model, key, value)
+        for key, value in (attributes or {}).items():
+            setattr(model, key, value)
 
-            model.updated_at = func.now()
-            model.updated_by = user_id
+        model.updated_at = datetime.now(tz=timezone.utc)
+        model.updated_by = user_id
 
-            self.session.add(model)
-            await self.session.commit()
-            await self.session.flush()
-            await self.session.refresh(model)
-            await self.session.expire(model)
+        self.session.add(model)
+        await self._save()
 
-            return model
-        except EntityNotSavedException as e:
-            await self.session.rollback()
-            raise e
-        finally:
-            await self.session.close()
-            await self.session.remove()
+        return model
 
     async def delete(
         self,
         model: T,
-        is_hard_delete: bool=False) -> None:
+        is_hard_delete: bool=False,
+        user_id: int = 0) -> None:
         """
         Deletes the model.
 
         :param model: The model to delete.
+        :param is_hard_delete: Whether to delete the row.
+        :param user_id: The user id deleting the model.
         :return: None
         """
-        try:
-            if is_hard_delete:
-                await self._hard_delete(model)
-            else:
-                await self._soft_delete(model)
-        except Exception as e:
-            raise e
+        if is_hard_delete:
+            await self._hard_delete(model)
+        else:
+            await self._soft_delete(model, user_id)
 
 
     async def get_by_id(
         self,
         id_: int,
-        join_: set[str] | None = None) -> T:
+        join_: JoinSpec | None = None,
+        include_deleted: bool = False) -> T:
         """
         Returns the model instance matching the id.
 
         :param id_: The id to match.
         :param join_: The joins to make.
+        :param include_deleted: Whether to include the soft deleted rows.
         :return: The model instance.
         """
         try:
             db_obj = await self.get_by(
-                field="id", value=id_, join_=join_, unique=True
+                field="id", value=id_, join_=join_, unique=True,
+                include_deleted=include_deleted
             )
             if not db_obj:
                 raise EntityNotFoundException(
@@ -179,17 +474,20 @@ class BaseRepository(Generic[T]):
     async def get_by_hash(
         self,
         uid: UUID,
-        join_: set[str] | None = None) -> T:
+        join_: JoinSpec | None = None,
+        include_deleted: bool = False) -> T:
         """
         Returns the model instance matching the uid.
 
         :param uid: The uid to match.
         :param join_: The joins to make.
+        :param include_deleted: Whether to include the soft deleted rows.
         :return: The model instance.
         """
         try:
             db_obj = await self.get_by(
-                field="hash", value=uid, join_=join_, unique=True
+                field="hash", value=uid, join_=join_, unique=True,
+                include_deleted=include_deleted
             )
             if not db_obj:
                 raise EntityNotFoundException(
@@ -204,17 +502,20 @@ class BaseRepository(Generic[T]):
     async def get_by_uuid(
         self,
         uuid: UUID,
-        join_: set[str] | None = None) -> T:
+        join_: JoinSpec | None = None,
+        include_deleted: bool = False) -> T:
         """
         Returns the model instance matching the uuid.
 
         :param uuid: The uuid to match.
         :param join_: The joins to make.
+        :param include_deleted: Whether to include the soft deleted rows.
         :return: The model instance.
         """
         try:
             db_obj = await self.get_by(
-                field="uuid", value=uuid, join_=join_, unique=True
+                field="uuid", value=uuid, join_=join_, unique=True,
+                include_deleted=include_deleted
             )
             if not db_obj:
                 raise EntityNotFoundException(
@@ -229,36 +530,65 @@ class BaseRepository(Generic[T]):
 
     def _query(
         self,
-        join_: set[str] | None = None,
+        join_: JoinSpec | None = None,
         order_: dict | None = None,
+        include_deleted: bool = False,
     ) -> Select:
         """
         Returns a callable that can be used to query the model.
 
         :param join_: The joins to make.
         :param order_: The order of the results. (e.g desc, asc)
+        :param include_deleted: Whether to include the soft deleted rows.
         :return: A callable that can be used to query the model.
         """
         query = select(self.model_class)
         query = self._maybe_join(query, join_)
         query = self._maybe_ordered(query, order_)
 
+        if include_deleted:
+            query = query.execution_options(include_deleted=True)
+
         return query
 
-    async def _all(self, query: Select) -> list[T]:
+    def _statement(self, name: str, build: Callable[[], Select]) -> Select:
+        """
+        Returns the prebuilt statement of the model, building it once.
+
+        The statement takes its values as bound parameters, so it is built
+        once per model and its compiled form is reused from the compiled
+        cache of SQLAlchemy on every call.
+
+        :param name: The name of the statement.
+        :param build: Builds the statement on the first call.
+        :return: The statement.
+        """
+        key = (self.model_class, name)
+        statement = _statements.get(key)
+        if statement is None:
+            statement = _statements[key] = build()
+
+        return statement
+
+    async def _all(self, query: Select, params: dict | None = None) -> list[T]:
         """
         Returns all results from the query.
 
         :param query: The query to execute.
+        :param params: The values of the bound parameters.
         :return: A list of model instances.
         """
-        query = await self.session.scalars(query)
+        query = await self.session.scalars(query, params)
         return query.all()
 
     async def _all_unique(self, query: Select) -> list[T]:
         result = await self.session.execute(query)
         return result.unique().scalars().all()
 
+    async def _one_unique(self, query: Select) -> T:
+        result = await self.session.execute(query)
+        return result.unique().scalars().one()
+
     async def _first(self, query: Select) -> T | None:
         """
         Returns the first result from the query.
@@ -274,14 +604,15 @@ class BaseRepository(Generic[T]):
         query = await self.session.scalars(query)
         return query.one_or_none()
 
-    async def _one(self, query: Select) -> T:
+    async def _one(self, query: Select, params: dict | None = None) -> T:
         """
         Returns the first result from the query or raises NoResultFound.
 
         :param query: The query to execute.
+        :param params: The values of the bound parameters.
         :return: The first model instance.
         """
-        query = await self.session.scalars(query)
+        query = await self.session.scalars(query, params)
         return query.one()
 
     async def _count(self, query: Select) -> int:
@@ -342,22 +673,14 @@ class BaseRepository(Generic[T]):
         Soft deletes the model.
 
         :param model: The model to soft delete.
+        :param user_id: The user id deleting the model.
         :return: None
         """
-        try:
-            model.deleted_at = func.now()
-            model.deleted_by = user_id
-            self.session.add(model)
-            await self.session.commit()
-            await self.session.flush()
-            await self.session.refresh(model)
-            await self.session.expire(model)
-        except EntityNotSavedException as e:
-            await self.session.rollback()
-            raise e
-        finally:
-            await self.session.close()
-            await self.session.remove()
+        model.deleted_at = datetime.now(tz=timezone.utc)
+        model.deleted_by = user_id
+
+        self.session.add(model)
+        await self._save()
 
     async def _hard_delete(self, model: T) -> None:
         """
@@ -366,23 +689,83 @@ class BaseRepository(Generic[T]):
         :param model: The model to hard delete.
         :return: None
         """
+        await self.session.delete(model)
+        await self._save()
+
+    async def _save(self, flush: bool = False) -> None:
+        """
+        Saves the pending writes of the session.
+
+        Within a Transactional boundary the writes are left to the unit of
+        work, which flushes and commits them once when the boundary exits.
+        Otherwise they are committed right away, the commit flushing them
+        in the same round trip.
+
+        :param flush: Whether to flush within a Transactional boundary,
+            e.g. for the generated keys of the created models.
+        :return: None
+        """
+        if in_transaction():
+            if flush:
+                await self.session.flush()
+            return
+
         try:
-            await self.session.delete(model)
             await self.session.commit()
-            await self.session.flush()
-            await self.session.refresh(model)
-            await self.session.expire(model)
-        except EntityNotSavedException as e:
+        except Exception as e:
             await self.session.rollback()
             raise e
-        finally:
-            await self.session.close()
-            await self.session.remove()
 
-    def _maybe_join(self, query: Select, join_: set[str] | None = None) -> Select:
+    async def _bulk_update(
+        self,
+        ids: list[int],
+        values: dict[str, Any],
+        chunk_size: int,
+        *criteria) -> int:
+        """
+        Updates the rows matching the ids, chunk by chunk.
+
+        :param ids: The ids of the rows to update.
+        :param values: The values to set.
+        :param chunk_size: The number of ids per UPDATE.
+        :param criteria: The additional conditions of the rows.
+        :return: The number of updated rows.
+        """
+        if not ids:
+            return 0
+
+        count = 0
+        for chunk in self._chunks(list(ids), chunk_size):
+            statement = (
+                update(self.model_class)
+                .where(self.model_class.id.in_(chunk), *criteria)
+                .values(**values)
+            )
+            result = await self.session.execute(statement)
+            count += result.rowcount
+
+        await self._save()
+        return count
+
+    @staticmethod
+    def _chunks(items: list, size: int):
+        """ Yields the items in chunks of the given size """
+        for index in range(0, len(items), size):
+            yield items[index:index + size]
+
+    def _maybe_join(self, query: Select, join_: JoinSpec | None = None) -> Select:
         """
         Returns the query with the given joins.
 
+        The joins are either a set of relationship names, loaded with the
+        `join_strategies` of the repository (selectin by default), or a
+        map of relationship names to strategies. e.g.
+
+            {"type": "joined", "configurations": "selectin"}
+
+        A `_join_<name>` method of the repository takes precedence over
+        the strategy of a name given in a set.
+
         :param query: The query to join.
         :param join_: The joins to make.
         :return: The query with the given joins.
@@ -390,11 +773,60 @@ class BaseRepository(Generic[T]):
         if not join_:
             return query
 
+        if isinstance(join_, dict):
+            return query.options(*(
+                self._join_option(name, strategy)
+                for name, strategy in join_.items()
+            ))
+
         if not isinstance(join_, set):
-            raise TypeError("join_ must be a set")
+            raise TypeError("join_ must be a set or a dict")
 
         return reduce(self._add_join_to_query, join_, query)
 
+    def _join_option(self, name: str, strategy: str):
+        """
+        Returns the loader option of the relationship.
+
+        :param name: The relationship name.
+        :param strategy: The loading strategy. (e.g selectin, joined, raise)
+        :return: The loader option.
+        """
+        relationship = self.model_class.__mapper__.relationships.get(name)
+        if relationship is None:
+            raise BadRequestException(
+                message=f"Unknown relationship {name} of {self.model_class.__name__}",
+                error_msg_code="error_code_invalid_join"
+            )
+        if strategy not in JOIN_STRATEGIES:
+            raise BadRequestException(
+                message=f"Unknown loading strategy {strategy} of {name}, "
+                        f"expected one of {', '.join(JOIN_STRATEGIES)}",
+                error_msg_code="error_code_invalid_join"
+            )
+
+        return JOIN_STRATEGIES[strategy](relationship.class_attribute)
+
+    def _is_joined(self, join_: JoinSpec | None = None) -> bool:
+        """
+        Returns whether the joins can repeat the rows of the model, so the
+        results need to be made unique.
+
+        :param join_: The joins to make.
+        :return: True when a join is made in the query.
+        """
+        if not join_:
+            return False
+
+        if isinstance(join_, dict):
+            return "joined" in join_.values()
+
+        return any(
+            hasattr(self, "_join_" + name)
+            or self.join_strategies.get(name, "selectin") == "joined"
+            for name in join_
+        )
+
     def _maybe_ordered(self, query: Select, order_: dict | None = None) -> Select:
         """
         Returns the query ordered by the given column.
@@ -413,7 +845,7 @@ class BaseRepository(Generic[T]):
 
         return query
 
-    def _add_join_to_query(self, query: Select, join_: set[str]) -> Select:
+    def _add_join_to_query(self, query: Select, join_: str) -> Select:
         """
         Returns the query with the given join.
 
@@ -421,4 +853,10 @@ class BaseRepository(Generic[T]):
         :param join_: The join to make.
         :return: The query with the given join.
         """
-        return getattr(self, "_join_" + join_)(query)
+        join_method = getattr(self, "_join_" + join_, None)
+        if join_method is not None:
+            return join_method(query)
+
+        return query.options(
+            self._join_option(join_, self.join_strategies.get(join_, "selectin"))
+        )
@@ -0,0 +1,127 @@
+""" Import the required modules """
+import asyncio
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from modules.base.exceptions import EntityNotFoundException
+
+if TYPE_CHECKING:
+    from .base import BaseRepository
+
+T = TypeVar("T")
+
+
+class BatchLoader(Generic[T]):
+    """ BatchLoader class to batch the lookups of a repository by key.
+
+    The keys loaded within the same event-loop tick are collected, and
+    fetched with a single `WHERE <field> IN (...)` query once the tick
+    ends. Each key is fetched once per loader, the later loads of the same
+    key share the first result.
+
+        loader = repository.loader("hash")
+        first, second = await asyncio.gather(
+            loader.load(first_uid), loader.load(second_uid)
+        )
+
+    A key that does not match any row raises an EntityNotFoundException.
+
+    An AsyncSession does not allow concurrent operations, so the fetches
+    of the loaders sharing a session run one at a time, under the lock
+    given by `get_loader`.
+    """
+
+    def __init__(self, repository: "BaseRepository[T]", field: str = "id",
+            lock: asyncio.Lock | None = None
+        ):
+        self.repository = repository
+        self.field = field
+        self._lock = lock or asyncio.Lock()
+        self._futures: dict[str, asyncio.Future] = {}
+        self._queue: list[Any] = []
+        self._scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+
+
+    async def load(self, key: Any) -> T:
+        """ Load the model instance matching the key """
+        future = self._futures.get(str(key))
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[str(key)] = loop.create_future()
+            self._queue.append(key)
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+
+        return await asyncio.shield(future)
+
+
+    async def load_many(self, keys: list[Any]) -> list[T]:
+        """ Load the model instances matching the keys, in the keys order """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+
+    def clear(self, key: Any | None = None) -> None:
+        """ Forget the result of the key, or of every key """
+        if key is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(str(key), None)
+
+
+    def _dispatch(self) -> None:
+        keys, self._queue, self._scheduled = self._queue, [], False
+
+        # Referenced until done, the event loop only keeps weak references
+        task = asyncio.create_task(self._fetch(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+    async def _fetch(self, keys: list[Any]) -> None:
+        try:
+            async with self._lock:
+                models = await self.repository.get_many(self.field, keys)
+        except Exception as e:
+            for key in keys:
+                # Failed fetches are not memoized, the key can be loaded again
+                future = self._futures.pop(str(key), None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        found = {str(getattr(model, self.field)): model for model in models}
+        for key in keys:
+            future = self._futures.get(str(key))
+            if future is None or future.done():
+                continue
+
+            model = found.get(str(key))
+            if model is None:
+                future.set_exception(EntityNotFoundException(
+                    f"{self.repository.model_class.__tablename__.title()} "
+                    f"with {self.field}: {key} does not exist"
+                ))
+            else:
+                future.set_result(model)
+
+
+def get_loader(repository: "BaseRepository[T]", field: str = "id") -> BatchLoader[T]:
+    """
+    Returns the loader of the repository model and field for the current
+    request. The loader is kept in the info of the request session, so its
+    results live as long as the session. The loaders of a session share
+    its lock.
+    """
+    info: dict = repository.session.info
+    loaders: dict = info.setdefault("batch_loaders", {})
+    key = (repository.model_class, field)
+
+    loader = loaders.get(key)
+    if loader is None:
+        lock = info.get("batch_loader_lock")
+        if lock is None:
+            lock = info["batch_loader_lock"] = asyncio.Lock()
+        loader = loaders[key] = BatchLoader(repository, field, lock)
+
+    return loader
@@ -0,0 +1,51 @@
+""" Import the required modules """
+import base64
+import binascii
+import datetime
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+from modules.base.exceptions import BadRequestException
+
+
+class Cursor(BaseModel):
+    """ Keyset pagination cursor
+
+    The cursor holds the sort column, the sort order and the values of
+    the last row of the page. It is handed to the clients as an opaque,
+    url-safe string.
+    """
+    sort_by: str = "id"
+    order: str = "asc"
+    value: Any = None
+    id: int
+
+    def encode(self) -> str:
+        value, value_type = self.value, None
+        if isinstance(value, datetime.datetime):
+            value, value_type = value.isoformat(), "datetime"
+
+        payload = json.dumps(
+            [self.sort_by, self.order, value, value_type, self.id],
+            separators=(",", ":"), default=str
+        )
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "Cursor":
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            payload = base64.urlsafe_b64decode(cursor + padding)
+            sort_by, order, value, value_type, id_ = json.loads(payload)
+
+            if value_type == "datetime":
+                value = datetime.datetime.fromisoformat(value)
+
+            return cls(sort_by=sort_by, order=order, value=value, id=id_)
+        except (binascii.Error, ValueError, TypeError) as e:
+            raise BadRequestException(
+                message="Invalid pagination cursor",
+                error_msg_code="error_code_invalid_cursor"
+            ) from e
@@ -0,0 +1,223 @@
+""" Import the required modules """
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from redis.exceptions import RedisError
+
+from modules.base.models.auth.claim import AuthClaim
+from modules.base.helpers.redis import redis_client
+
+# Load data from config file
+from modules.base.config import config
+
+# Initialize the logger
+logger = logging.getLogger(__name__)
+
+
+class ClaimCache:
+    """ ClaimCache class to keep recently used claims in memory.
+
+    This class is a bounded LRU cache placed in front of the claim
+    storage. Each entry expires at the lesser of the configured TTL and
+    the expiry of the claim itself, so a cached claim never outlives its
+    token.
+
+    Each worker process has its own cache, so the invalidations are
+    published on a Redis channel and every worker drops the claims it
+    receives. The claims are only served while the worker is subscribed
+    to the channel, so a claim revoked by another worker is never served
+    from a cache that may have missed the invalidation.
+
+    Every removal bumps the generation of the cache. A claim read from
+    the storage is only cached when the generation is the one recorded
+    before the read, so a claim revoked during the read is not cached.
+
+    The cache keeps hit, miss and eviction counters which can be read
+    with the `stats` method.
+    """
+
+    def __init__(
+            self,
+            max_size: int = config.CLAIM_CACHE_MAX_SIZE,
+            ttl: int = config.CLAIM_CACHE_TTL,
+            channel: str = config.CLAIM_CACHE_INVALIDATION_CHANNEL
+        ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.channel = channel
+        self._entries: OrderedDict[str, tuple[float, AuthClaim]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pubsub = None
+        self._task: asyncio.Task | None = None
+        self._subscribed = False
+        self._generation: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+
+    def get(self, key: str) -> AuthClaim | None:
+        """ Get the claim from the cache
+
+        Returns the cached claim for the given key. If the claim is not
+        cached or has expired, it returns None.
+        """
+        if not self._subscribed:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, claim = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claim
+
+
+    @property
+    def generation(self) -> int:
+        """ The number of removals so far, to be recorded before a read """
+        return self._generation
+
+
+    def set(self, key: str, claim: AuthClaim, generation: int | None = None) -> None:
+        """ Set the claim in the cache
+
+        The claim is cached until the configured TTL or the claim expiry,
+        whichever comes first. The least recently used entries are
+        evicted once the cache is full. With a `generation`, the claim is
+        not cached when a claim was removed since it was recorded.
+        """
+        if not key or self.max_size <= 0 or not self._subscribed:
+            return
+
+        now = time.time()
+        expires_at = now + self.ttl
+        if claim.ttl:
+            expires_at = min(expires_at, float(claim.ttl))
+        if expires_at <= now:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[key] = (expires_at, claim)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+    def delete(self, *keys: str) -> None:
+        """ Remove the claims from the cache """
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+    async def invalidate(self, *keys: str) -> None:
+        """ Remove the claims from the cache of every worker
+
+        The claims are removed from the local cache, and the keys are
+        published to the other workers.
+        """
+        self.delete(*keys)
+        if not keys:
+            return
+
+        try:
+            await redis_client.publish(self.channel, "\n".join(keys))
+        except RedisError as e:
+            # The other workers stop serving their claims as well when
+            # they lose the connection to Redis
+            logger.error("Unable to publish the claim invalidations: %s", e)
+
+
+    def clear(self) -> None:
+        """ Remove all the claims from the cache """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+    async def start(self) -> None:
+        """ Subscribe to the invalidations of the other workers """
+        if self._task is None:
+            self._pubsub = redis_client.pubsub()
+            self._task = asyncio.create_task(self._listen())
+
+
+    async def stop(self) -> None:
+        """ Unsubscribe from the invalidations, and stop serving claims """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+        self._disconnect()
+
+
+    def stats(self) -> dict[str, int]:
+        """ Get the cache counters """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "subscribed": self._subscribed,
+            }
+
+
+    async def _listen(self) -> None:
+        """ Drop the claims invalidated by the other workers """
+        while True:
+            try:
+                if not self._pubsub.subscribed:
+                    await self._pubsub.subscribe(self.channel)
+
+                async for message in self._pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self._subscribed = True
+                    elif message["type"] == "message":
+                        data = message["data"]
+                        if isinstance(data, bytes):
+                            data = data.decode()
+                        self.delete(*data.split("\n"))
+            except RedisError as e:
+                logger.error("Unable to receive the claim invalidations: %s", e)
+                self._disconnect()
+                await asyncio.sleep(1)
+
+
+    def _disconnect(self) -> None:
+        """ Stop serving claims, the invalidations may have been missed """
+        self._subscribed = False
+        self.clear()
+
+
+# Shared by every ClaimService instance of the worker process
+claim_cache = ClaimCache()
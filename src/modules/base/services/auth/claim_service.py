@@ -1,9 +1,12 @@
 """ Import the required modules """
+import inspect
 import typing
-from typing import List
+from typing import Any, Callable, List
 
 from pydantic import BaseModel, TypeAdapter
 
+from modules.base.models.adapter import get_adapter
+
 from modules.base.models.auth.token import Token
 from modules.base.models.auth.claim import AuthClaim
 
@@ -14,9 +17,15 @@ from modules.base.exceptions import (
 
 # Load data from config file
 from modules.base.config import config
-from modules.base.services.aws.dynamodb import DynamoDBService
+from modules.base.services.aws.dynamodb_async import (
+    AsyncDynamoDBService,
+    InMemoryDynamoDBService
+)
+from modules.base.services.redis.storage import RedisStorageService
 
 from modules.base.helpers.token import TokenHelper
+from .claim_cache import ClaimCache, claim_cache
+from .revocation_service import revocation_list
 from .token_service import TokenService
 
 
@@ -30,16 +39,24 @@ class ClaimService:
 
     def __init__(self):
         self.token_service = TokenService()
+        self.cache: ClaimCache | None = claim_cache if config.CLAIM_CACHE_ENABLED else None
 
         match config.CLAIM_STORAGE:
-            case "dynamodb":
-                # Initialize the DynamoDB service with the table name
-                self.storage_service = DynamoDBService(table_name=config.CLAIM_TABLE_NAME)
+            case "dynamodb" | "dynamodb_async":
+                # Initialize the non-blocking DynamoDB service with the table
+                # name, the blocking one would stall the event loop
+                self.storage_service = AsyncDynamoDBService(table_name=config.CLAIM_TABLE_NAME)
+            case "redis":
+                # Initialize the Redis service on the shared connection pool
+                self.storage_service = RedisStorageService(prefix=config.CLAIM_REDIS_PREFIX)
+            case "memory":
+                # Initialize the in-process stand-in, for local use and tests
+                self.storage_service = InMemoryDynamoDBService(table_name=config.CLAIM_TABLE_NAME)
             case _:
                 raise NotImplementedError("Claim storage not implemented")
 
 
-    def create(self, payload: dict, user: typing.Any) -> AuthClaim:
+    async def create(self, payload: dict, user: typing.Any) -> AuthClaim:
         """ Create a new claim
         Create a new claim with the given payload. The payload is usually
         the user data that will be included in the token. The claim is
@@ -77,27 +94,37 @@ class ClaimService:
                 )
 
             # Store the claim in storage
-            self.store(claim)
+            await self.store(claim)
 
             return claim
         except (InvalidTokenException, Exception) as e:
             raise e
 
 
-    def delete(self, value: str) -> bool:
+    async def delete(self, value: str) -> bool:
         """ Delete the claim from storage
         Delete the claim from storage using the given value/identifier.
         The value is usually the claim token. If the claim is found, it
         deletes the claim and returns True. If the claim is not found, it
         raises an exception.
         """
-        return self.storage_service.delete_data(
+        # Invalidate the cached claim of every worker before the storage
+        # round trip, so the revoked token stops working right away
+        if self.cache is not None:
+            await self.cache.invalidate(value)
+
+        # Reject the token on the stateless verification path as well
+        if config.AUTH_VERIFICATION_MODE == "jwt":
+            await revocation_list.revoke_token(value)
+
+        return await self._call_storage(
+            self.storage_service.delete_data,
             value=value,
             key=config.CLAIM_TABLE_KEY
         )
 
 
-    def get(self, value: str) -> AuthClaim:
+    async def get(self, value: str) -> AuthClaim:
         """ Get the claim from storage
         Get the claim from storage using the given value/identifier
 
@@ -105,8 +132,18 @@ class ClaimService:
         returns the claim. If the claim is not found, it raises an exception.
         """
         try:
+            # Get the claim from the in-process cache
+            if self.cache is not None:
+                cached_claim = self.cache.get(value)
+                if cached_claim is not None:
+                    return cached_claim
+
+            # Recorded before the read, a revocation meanwhile is not cached
+            generation = self.cache.generation if self.cache is not None else None
+
             # Get the claim from storage
-            claim = self.storage_service.get_data(
+            claim = await self._call_storage(
+                self.storage_service.get_data,
                 value=value,
                 key=config.CLAIM_TABLE_KEY
             )
@@ -117,13 +154,18 @@ class ClaimService:
                 )
 
             # Validate the claim using TypeAdapter
-            ta: TypeAdapter = TypeAdapter(AuthClaim)
-            return ta.validate_python(claim)
+            ta: TypeAdapter = get_adapter(AuthClaim)
+            claim = ta.validate_python(claim)
+
+            if self.cache is not None:
+                self.cache.set(value, claim, generation=generation)
+
+            return claim
         except (InvalidTokenException, Exception):
             raise
 
 
-    def get_all(self, query: dict) -> List[AuthClaim]:
+    async def get_all(self, query: dict, index_name: str | None = None) -> List[AuthClaim]:
         """ Get all the claims from storage
         Get the claims from storage using the given query/identifier
 
@@ -133,8 +175,10 @@ class ClaimService:
         """
         try:
             # Get the claim from storage
-            claims = self.storage_service.query_data(
-                query=query
+            claims = await self._call_storage(
+                self.storage_service.query_data,
+                query=query,
+                index_name=index_name
             )
             if not claims:
                 raise InvalidTokenException(
@@ -143,13 +187,99 @@ class ClaimService:
                 )
             
             # Validate the claim using TypeAdapter
-            ta: TypeAdapter = TypeAdapter(List[AuthClaim])
+            ta: TypeAdapter = get_adapter(List[AuthClaim])
             return ta.validate_python(claims)
         except (InvalidTokenException, Exception) as e:
             raise e
 
 
-    def store(self, claim: AuthClaim) -> bool:
+    async def get_many(self, values: List[str]) -> List[AuthClaim]:
+        """ Get the claims from storage in bulk
+        Get the claims from storage using the given values/identifiers.
+
+        The cached claims are served from memory and the rest are fetched
+        with batched storage reads. The claims which are not found are
+        skipped.
+        """
+        try:
+            claims: List[AuthClaim] = []
+            missing: List[str] = []
+            for value in values:
+                cached_claim = self.cache.get(value) if self.cache is not None else None
+                if cached_claim is not None:
+                    claims.append(cached_claim)
+                else:
+                    missing.append(value)
+
+            if missing:
+                generation = self.cache.generation if self.cache is not None else None
+                items = await self._call_storage(
+                    self.storage_service.get_many,
+                    values=missing,
+                    key=config.CLAIM_TABLE_KEY
+                )
+
+                # Validate the claims using TypeAdapter
+                ta: TypeAdapter = get_adapter(List[AuthClaim])
+                for claim in ta.validate_python(items or []):
+                    if self.cache is not None:
+                        self.cache.set(claim.key, claim, generation=generation)
+                    claims.append(claim)
+
+            return claims
+        except (InvalidTokenException, Exception) as e:
+            raise e
+
+
+    async def delete_many(self, values: List[str]) -> bool:
+        """ Delete the claims from storage in bulk
+        Delete the claims from storage using the given values/identifiers.
+        The deletes are batched by the storage service, so revoking N
+        claims does not cost N round trips.
+        """
+        if not values:
+            return True
+
+        if self.cache is not None:
+            await self.cache.invalidate(*values)
+
+        for value in values:
+            if config.AUTH_VERIFICATION_MODE == "jwt":
+                await revocation_list.revoke_token(value)
+
+        return await self._call_storage(
+            self.storage_service.delete_many,
+            values=values,
+            key=config.CLAIM_TABLE_KEY
+        )
+
+
+    async def delete_user(self, user_id: int | str,
+            values: List[str] | None = None
+        ) -> List[str]:
+        """ Delete all the claims of a user from storage
+        Delete the claims of the user, along with the given claims, in a
+        single storage call. The deleted claims are invalidated in the
+        cache of every worker, and revoked on the stateless verification
+        path. Returns the values of the deleted claims.
+        """
+        deleted = await self._call_storage(
+            self.storage_service.delete_user_data,
+            user_id=user_id,
+            values=values
+        )
+
+        if deleted and self.cache is not None:
+            await self.cache.invalidate(*deleted)
+
+        for value in deleted:
+            if config.AUTH_VERIFICATION_MODE == "jwt":
+                await revocation_list.revoke_token(value)
+
+        return deleted
+
+
+    async def store(self, claim: AuthClaim) -> bool:
         """ Store the claim in storage
         Save the claim in storage using the given claim object.
 
@@ -157,7 +287,8 @@ class ClaimService:
         user data.
         """
         try:
-            response = self.storage_service.set_data(
+            response = await self._call_storage(
+                self.storage_service.set_data,
                 claim.model_dump(mode='python', exclude_none=True),
             )
             if not response:
@@ -166,6 +297,23 @@ class ClaimService:
                     message="Failed to store claim in the storage"
                 )
 
+            if self.cache is not None:
+                self.cache.set(claim.key, claim)
+
             return True
         except (InvalidTokenException, Exception) as e:
             raise e
+
+
+    async def _call_storage(self, method: Callable[..., Any], *args, **kwargs) -> Any:
+        """ Call the storage service method
+
+        The storage services expose the same methods, either blocking or
+        as coroutines. The result is awaited when the storage service is
+        asynchronous.
+        """
+        result = method(*args, **kwargs)
+        if inspect.isawaitable(result):
+            return await result
+
+        return result
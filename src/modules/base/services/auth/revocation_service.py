@@ -0,0 +1,136 @@
+""" Import the required modules """
+import asyncio
+import heapq
+import logging
+import time
+
+from modules.base.config import config
+from modules.base.helpers.redis import redis_client
+from modules.base.helpers.token import TokenHelper
+
+# Initialize the logger
+logger = logging.getLogger(__name__)
+
+
+class TokenRevocationList:
+    """ TokenRevocationList class to track the revoked tokens.
+
+    A token verified locally (signature and expiry only) is still valid
+    after logout until it expires. This class keeps the ids (`jti`) of the
+    tokens revoked before their expiry, so the stateless verification can
+    reject them without a storage round trip.
+
+    The entries are kept only until the token expires. When the revocation
+    storage is `redis`, the revocations are shared through a sorted set
+    scored by expiry, and the local copy is refreshed in the background
+    so every worker sees the revocations of the others.
+    """
+
+    def __init__(self, storage: str = config.AUTH_REVOCATION_STORAGE,
+            key: str = config.AUTH_REVOCATION_KEY,
+            refresh_interval: int = config.AUTH_REVOCATION_REFRESH_INTERVAL
+        ):
+        self.storage = storage
+        self.key = key
+        self.refresh_interval = refresh_interval
+        self._revoked: dict[str, int] = {}
+        self._expiries: list[tuple[int, str]] = []
+        self._task: asyncio.Task | None = None
+
+
+    def is_revoked(self, jti: str) -> bool:
+        """ Check if the token id has been revoked """
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+
+        return expires_at > time.time()
+
+
+    async def revoke(self, jti: str, expires_at: int) -> None:
+        """ Revoke the token id until the token expires """
+        if not jti or expires_at <= time.time():
+            return
+
+        self._add(jti, expires_at)
+
+        if self.storage == "redis":
+            await redis_client.zadd(self.key, {jti: expires_at})
+
+
+    async def revoke_token(self, token: str) -> None:
+        """ Revoke the given access token
+
+        The token is decoded without checking the expiry. Tokens without
+        an id cannot be verified locally, so they need no revocation.
+        """
+        try:
+            payload = TokenHelper.decode_expired_token(token)
+        except Exception:
+            return
+
+        if payload.get("jti") and payload.get("exp"):
+            await self.revoke(payload["jti"], int(payload["exp"]))
+
+
+    async def refresh(self) -> None:
+        """ Refresh the local revocations from the shared storage """
+        self._prune()
+        if self.storage != "redis":
+            return
+
+        now = int(time.time())
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(self.key, "-inf", now)
+            pipe.zrangebyscore(self.key, now, "+inf", withscores=True)
+            _, entries = await pipe.execute()
+
+        for jti, expires_at in entries:
+            jti = jti.decode() if isinstance(jti, bytes) else jti
+            if jti not in self._revoked:
+                self._add(jti, int(expires_at))
+
+
+    async def start(self) -> None:
+        """ Start refreshing the revocations in the background """
+        if self._task is None:
+            await self.refresh()
+            self._task = asyncio.create_task(self._run())
+
+
+    async def stop(self) -> None:
+        """ Stop the background refresh """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.exception("Unable to refresh the token revocations: %s", e)
+
+
+    def _add(self, jti: str, expires_at: int) -> None:
+        self._revoked[jti] = expires_at
+        heapq.heappush(self._expiries, (expires_at, jti))
+
+
+    def _prune(self) -> None:
+        """ Drop the revocations of the tokens that have expired """
+        now = time.time()
+        while self._expiries and self._expiries[0][0] <= now:
+            _, jti = heapq.heappop(self._expiries)
+            if self._revoked.get(jti, now + 1) <= now:
+                del self._revoked[jti]
+
+
+# Shared by every request of the worker process
+revocation_list = TokenRevocationList()
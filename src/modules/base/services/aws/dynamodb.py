@@ -1,4 +1,5 @@
 """ Import the required modules """
+import time
 from typing import List
 import boto3
 from boto3.dynamodb.conditions import Key
@@ -10,6 +11,13 @@ from modules.base.exceptions.base import (
 
 from modules.base.config import config
 
+# DynamoDB batch request limits
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+
+# The capacity of the claim table and of its indexes
+CLAIM_TABLE_THROUGHPUT = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+
 dynamodb_resource = boto3.resource(
     "dynamodb", 
     region_name=config.AWS_REGION,
@@ -38,23 +46,78 @@ class DynamoDBService:
 
 
     def create_table(self, table_name, key_schema,
-            attribute_definitions, provisioned_throughput
+            attribute_definitions, provisioned_throughput,
+            global_secondary_indexes=None
         ):
         """
         Create a DynamoDB table.
+
+        The global secondary indexes are optional. The claim table uses
+        one on the user id, so all the claims of a user can be queried
+        without a scan.
         """
         try:
+            kwargs = {}
+            if global_secondary_indexes:
+                kwargs["GlobalSecondaryIndexes"] = global_secondary_indexes
+
             response = self.dynamodb_connection.create_table(
                 TableName=table_name,
                 KeySchema=key_schema,
                 AttributeDefinitions=attribute_definitions,
-                ProvisionedThroughput=provisioned_throughput
+                ProvisionedThroughput=provisioned_throughput,
+                **kwargs
             )
             return response
         except ClientError as e:
             raise AWSValueException(exception=e) from e
 
 
+    def create_claim_table(self,
+            provisioned_throughput: dict = CLAIM_TABLE_THROUGHPUT
+        ):
+        """
+        Create the claim table, keyed by the access token, with the global
+        secondary index on the user id queried by the forced logout.
+        """
+        return self.create_table(
+            table_name=self.table_name,
+            key_schema=[
+                {"AttributeName": config.CLAIM_TABLE_KEY, "KeyType": "HASH"}
+            ],
+            attribute_definitions=[
+                {"AttributeName": config.CLAIM_TABLE_KEY, "AttributeType": "S"},
+                {"AttributeName": config.CLAIM_TABLE_USER_KEY, "AttributeType": "N"},
+            ],
+            provisioned_throughput=provisioned_throughput,
+            global_secondary_indexes=[_claim_user_index(provisioned_throughput)]
+        )
+
+
+    def create_claim_user_index(self,
+            provisioned_throughput: dict | None = CLAIM_TABLE_THROUGHPUT
+        ):
+        """
+        Add the user id index to an existing claim table. The throughput
+        must be None for an on-demand table.
+
+        DynamoDB backfills the index in the background. Until the index is
+        ACTIVE, a forced logout only revokes the claim of its own token.
+        """
+        try:
+            return self.dynamodb_connection.meta.client.update_table(
+                TableName=self.table_name,
+                AttributeDefinitions=[
+                    {"AttributeName": config.CLAIM_TABLE_USER_KEY, "AttributeType": "N"},
+                ],
+                GlobalSecondaryIndexUpdates=[
+                    {"Create": _claim_user_index(provisioned_throughput)}
+                ]
+            )
+        except ClientError as e:
+            raise AWSValueException(exception=e) from e
+
+
     def delete_table(self, table_name):
         """
         Delete a DynamoDB table.
@@ -106,23 +169,101 @@ class DynamoDBService:
             raise AWSValueException(exception=e) from e
 
 
-    def query_data(self, query: dict[str, str]) -> List[str] | None:
+    def query_data(self, query: dict[str, str],
+            index_name: str | None = None
+        ) -> List[dict] | None:
         """
-        Get an item from a DynamoDB table.
+        Get the items matching the key condition from a DynamoDB table.
+
+        The query is run against the global secondary index when the
+        index name is given. All the result pages are returned.
         """
         try:
-            keys: List[str] = list(query.keys())
+            key, value = next(iter(query.items()))
 
-            # Get the item from the table using the key
-            response = self.dynamodb_table.query(
-                KeyConditionExpression=Key(keys[0]).eq(query[0])
-            )
+            kwargs = {"KeyConditionExpression": Key(key).eq(value)}
+            if index_name:
+                kwargs["IndexName"] = index_name
 
-            # Check if the item exists in the response
-            if 'Items' in response:
-                return str(response['Items'])
+            items: List[dict] = []
+            while True:
+                # Get the items from the table using the key
+                response = self.dynamodb_table.query(**kwargs)
+                items.extend(response.get('Items', []))
 
-            return None
+                if 'LastEvaluatedKey' not in response:
+                    break
+                kwargs["ExclusiveStartKey"] = response['LastEvaluatedKey']
+
+            return items or None
+        except ClientError as e:
+            raise AWSValueException(exception=e) from e
+
+
+    def get_many(self, values: List[str],
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> List[dict]:
+        """ Get the items from a DynamoDB table in batches.
+
+        The keys are sent in BatchGetItem chunks of 100. The unprocessed
+        keys are retried with an exponential backoff. The items are
+        returned in no particular order and the missing keys are skipped.
+        """
+        try:
+            items: List[dict] = []
+            for chunk in _chunks(list(dict.fromkeys(values)), BATCH_GET_LIMIT):
+                request = {
+                    self.table_name: {"Keys": [{key: value} for value in chunk]}
+                }
+
+                for attempt in range(config.DYNAMODB_BATCH_MAX_RETRIES + 1):
+                    response = self.dynamodb_connection.batch_get_item(
+                        RequestItems=request
+                    )
+                    items.extend(response.get('Responses', {}).get(self.table_name, []))
+
+                    request = response.get('UnprocessedKeys')
+                    if not request:
+                        break
+                    time.sleep(_backoff(attempt))
+                else:
+                    raise AWSValueException(exception=_unprocessed_error("BatchGetItem"))
+
+            return items
+        except ClientError as e:
+            raise AWSValueException(exception=e) from e
+
+
+    def delete_many(self, values: List[str],
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> bool:
+        """ Delete the items from a DynamoDB table in batches.
+
+        The deletes are sent in BatchWriteItem chunks of 25, so deleting
+        N items costs N/25 requests. The unprocessed items are retried
+        with an exponential backoff.
+        """
+        try:
+            for chunk in _chunks(list(dict.fromkeys(values)), BATCH_WRITE_LIMIT):
+                request = {
+                    self.table_name: [
+                        {"DeleteRequest": {"Key": {key: value}}} for value in chunk
+                    ]
+                }
+
+                for attempt in range(config.DYNAMODB_BATCH_MAX_RETRIES + 1):
+                    response = self.dynamodb_connection.batch_write_item(
+                        RequestItems=request
+                    )
+
+                    request = response.get('UnprocessedItems')
+                    if not request:
+                        break
+                    time.sleep(_backoff(attempt))
+                else:
+                    raise AWSValueException(exception=_unprocessed_error("BatchWriteItem"))
+
+            return True
         except ClientError as e:
             raise AWSValueException(exception=e) from e
 
@@ -155,3 +296,42 @@ class DynamoDBService:
     #         k: serializer.serialize(v)
     #         for k, v in python_object.items()
     #     }
+
+
+def _claim_user_index(provisioned_throughput: dict | None) -> dict:
+    """ The global secondary index of the claim table on the user id """
+    index = {
+        "IndexName": config.CLAIM_TABLE_USER_INDEX,
+        "KeySchema": [
+            {"AttributeName": config.CLAIM_TABLE_USER_KEY, "KeyType": "HASH"}
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+    }
+    if provisioned_throughput is not None:
+        index["ProvisionedThroughput"] = provisioned_throughput
+
+    return index
+
+
+def _chunks(values: list, size: int):
+    """ Split the values into chunks of the given size """
+    for index in range(0, len(values), size):
+        yield values[index:index + size]
+
+
+def _backoff(attempt: int) -> float:
+    """ Exponential backoff delay (in seconds) for the batch retries """
+    return min(0.05 * (2 ** attempt), 2.0)
+
+
+def _unprocessed_error(operation: str) -> ClientError:
+    """ Error raised when the batch retries are exhausted """
+    return ClientError(
+        {
+            "Error": {
+                "Code": "UnprocessedItems",
+                "Message": f"{operation} left unprocessed items after retries",
+            }
+        },
+        operation,
+    )
@@ -0,0 +1,407 @@
+""" Import the required modules """
+import asyncio
+import copy
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
+from modules.base.exceptions.base import (
+    AWSValueException
+)
+
+from modules.base.config import config
+from .dynamodb import (
+    BATCH_GET_LIMIT,
+    BATCH_WRITE_LIMIT,
+    _backoff,
+    _chunks,
+    _unprocessed_error
+)
+
+# The low level client is thread safe (unlike the boto3 resource), so a
+# single pooled client is shared by all the executor threads.
+dynamodb_client = boto3.client(
+    "dynamodb",
+    region_name=config.AWS_REGION,
+    aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+    aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+    config=BotoConfig(
+        max_pool_connections=config.DYNAMODB_MAX_POOL_CONNECTIONS,
+        retries={"mode": "standard"},
+    ),
+)
+
+# Bounded executor dedicated to the DynamoDB calls, so the blocking
+# network round trips never run on the event loop nor starve the
+# default executor.
+dynamodb_executor = ThreadPoolExecutor(
+    max_workers=config.DYNAMODB_MAX_WORKERS,
+    thread_name_prefix="dynamodb",
+)
+
+
+def shutdown_dynamodb_executor(wait: bool = True) -> None:
+    """ Shutdown the DynamoDB executor """
+    dynamodb_executor.shutdown(wait=wait)
+
+
+class AsyncDynamoDBService:
+    """ AsyncDynamoDBService class to handle DynamoDB operations.
+
+    This class exposes the same operations as the DynamoDBService, as
+    coroutines. The blocking boto3 calls run on a bounded, dedicated
+    executor using a pooled low level client, so the event loop is never
+    stalled by a DynamoDB round trip.
+
+    It is initialized with the table name where the items are stored.
+    """
+
+    serializer = TypeSerializer()
+    deserializer = TypeDeserializer()
+
+    def __init__(self, table_name: str = config.CLAIM_TABLE_NAME):
+        self.dynamodb_client = dynamodb_client
+        self.table_name = table_name
+
+
+    async def set_data(self, data: dict) -> dict:
+        """ Put an item in a DynamoDB table.
+
+        This method takes a dictionary as input and stores it in the
+        table. It returns the response from the DynamoDB service.
+        """
+        try:
+            return await self._run(
+                self.dynamodb_client.put_item,
+                TableName=self.table_name,
+                Item=self.python_to_dynamo(data)
+            )
+        except ClientError as e:
+            raise AWSValueException(exception=e) from e
+
+
+    async def get_data(self, value: str,
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> dict | None:
+        """
+        Get an item from a DynamoDB table.
+        """
+        try:
+            # Get the item from the table using the key
+            response = await self._run(
+                self.dynamodb_client.get_item,
+                TableName=self.table_name,
+                Key=self.python_to_dynamo({key: value})
+            )
+
+            # Check if the item exists in the response
+            if 'Item' in response:
+                return self.dynamo_to_python(response['Item'])
+
+            return None
+        except ClientError as e:
+            raise AWSValueException(exception=e) from e
+
+
+    async def query_data(self, query: dict[str, str],
+            index_name: str | None = None
+        ) -> List[dict] | None:
+        """
+        Get the items matching the key condition from a DynamoDB table.
+
+        The query is run against the global secondary index when the
+        index name is given. All the result pages are returned.
+        """
+        try:
+            key, value = next(iter(query.items()))
+
+            kwargs = {
+                "TableName": self.table_name,
+                "KeyConditionExpression": "#key = :value",
+                "ExpressionAttributeNames": {"#key": key},
+                "ExpressionAttributeValues": self.python_to_dynamo({":value": value}),
+            }
+            if index_name:
+                kwargs["IndexName"] = index_name
+
+            items: List[dict] = []
+            while True:
+                # Query the items from the table using the key
+                response = await self._run(self.dynamodb_client.query, **kwargs)
+                items.extend(
+                    self.dynamo_to_python(item) for item in response.get('Items', [])
+                )
+
+                if 'LastEvaluatedKey' not in response:
+                    break
+                kwargs["ExclusiveStartKey"] = response['LastEvaluatedKey']
+
+            return items or None
+        except ClientError as e:
+            raise AWSValueException(exception=e) from e
+
+
+    async def get_many(self, values: List[str],
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> List[dict]:
+        """ Get the items from a DynamoDB table in batches.
+
+        The keys are sent in BatchGetItem chunks of 100. The unprocessed
+        keys are retried with an exponential backoff. The items are
+        returned in no particular order and the missing keys are skipped.
+        """
+        try:
+            items: List[dict] = []
+            for chunk in _chunks(list(dict.fromkeys(values)), BATCH_GET_LIMIT):
+                request = {
+                    self.table_name: {
+                        "Keys": [self.python_to_dynamo({key: value}) for value in chunk]
+                    }
+                }
+
+                for attempt in range(config.DYNAMODB_BATCH_MAX_RETRIES + 1):
+                    response = await self._run(
+                        self.dynamodb_client.batch_get_item,
+                        RequestItems=request
+                    )
+                    items.extend(
+                        self.dynamo_to_python(item)
+                        for item in response.get('Responses', {}).get(self.table_name, [])
+                    )
+
+                    request = response.get('UnprocessedKeys')
+                    if not request:
+                        break
+                    await asyncio.sleep(_backoff(attempt))
+                else:
+                    raise AWSValueException(exception=_unprocessed_error("BatchGetItem"))
+
+            return items
+        except ClientError as e:
+            raise AWSValueException(exception=e) from e
+
+
+    async def delete_data(self, value: str, key: str = config.CLAIM_TABLE_KEY):
+        """
+        Delete an item from a DynamoDB table.
+        """
+        try:
+            return await self._run(
+                self.dynamodb_client.delete_item,
+                TableName=self.table_name,
+                Key=self.python_to_dynamo({key: value})
+            )
+        except ClientError as e:
+            raise AWSValueException(exception=e) from e
+
+
+    async def delete_many(self, values: List[str],
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> bool:
+        """ Delete the items from a DynamoDB table in batches.
+
+        The deletes are sent in BatchWriteItem chunks of 25, so deleting
+        N items costs N/25 requests. The unprocessed items are retried
+        with an exponential backoff.
+        """
+        try:
+            for chunk in _chunks(list(dict.fromkeys(values)), BATCH_WRITE_LIMIT):
+                request = {
+                    self.table_name: [
+                        {"DeleteRequest": {"Key": self.python_to_dynamo({key: value})}}
+                        for value in chunk
+                    ]
+                }
+
+                for attempt in range(config.DYNAMODB_BATCH_MAX_RETRIES + 1):
+                    response = await self._run(
+                        self.dynamodb_client.batch_write_item,
+                        RequestItems=request
+                    )
+
+                    request = response.get('UnprocessedItems')
+                    if not request:
+                        break
+                    await asyncio.sleep(_backoff(attempt))
+                else:
+                    raise AWSValueException(exception=_unprocessed_error("BatchWriteItem"))
+
+            return True
+        except ClientError as e:
+            raise AWSValueException(exception=e) from e
+
+
+    async def delete_user_data(self, user_id: int | str,
+            values: List[str] | None = None
+        ) -> List[str]:
+        """ Delete the items of a user, and the given items, from a
+        DynamoDB table. The items of the user are found through the user
+        index. Returns the values of the deleted items.
+        """
+        return await _delete_user_data(self, user_id, values)
+
+
+    async def _run(self, func: Callable[..., Any], **kwargs) -> Any:
+        """ Run the blocking call on the DynamoDB executor """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            dynamodb_executor, functools.partial(func, **kwargs)
+        )
+
+
+    # Code referenced from
+    # https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/programming-with-python.html
+    def dynamo_to_python(self, dynamo_object: dict) -> dict:
+        return {
+            k: self.deserializer.deserialize(v)
+            for k, v in dynamo_object.items()
+        }
+
+
+    def python_to_dynamo(self, python_object: dict) -> dict:
+        return {
+            k: self.serializer.serialize(v)
+            for k, v in python_object.items()
+        }
+
+
+class InMemoryDynamoDBService:
+    """ InMemoryDynamoDBService class to stand in for DynamoDB.
+
+    This class implements the AsyncDynamoDBService operations on top of
+    an in-process dictionary. It is meant for local development and
+    tests, where no DynamoDB table is available. The tables are shared
+    by every instance of the worker process.
+
+    The global secondary indexes are declared with their partition key,
+    the claim table has one on the user id. Like DynamoDB, a query must
+    match the partition key of the table or of the queried index.
+    """
+
+    tables: dict[str, dict[str, dict]] = {}
+
+    def __init__(self, table_name: str = config.CLAIM_TABLE_NAME,
+            indexes: dict[str, str] | None = None
+        ):
+        self.table_name = table_name
+        self.table = self.tables.setdefault(table_name, {})
+        self.indexes = indexes if indexes is not None else {
+            config.CLAIM_TABLE_USER_INDEX: config.CLAIM_TABLE_USER_KEY
+        }
+
+
+    async def set_data(self, data: dict) -> dict:
+        """ Put an item in the table """
+        self.table[data[config.CLAIM_TABLE_KEY]] = copy.deepcopy(data)
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+    async def get_data(self, value: str,
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> dict | None:
+        """ Get an item from the table """
+        if key == config.CLAIM_TABLE_KEY:
+            item = self.table.get(value)
+        else:
+            item = next(
+                (item for item in self.table.values() if item.get(key) == value),
+                None
+            )
+
+        return copy.deepcopy(item) if item is not None else None
+
+
+    async def query_data(self, query: dict[str, str],
+            index_name: str | None = None
+        ) -> List[dict] | None:
+        """ Get the items matching the partition key of the table, or of
+        the index when the index name is given.
+        """
+        key, value = next(iter(query.items()))
+
+        if index_name is not None and index_name not in self.indexes:
+            raise AWSValueException(exception=_validation_error(
+                "Query", f"The table does not have the specified index: {index_name}"
+            ))
+
+        partition_key = self.indexes[index_name] if index_name else config.CLAIM_TABLE_KEY
+        if key != partition_key:
+            raise AWSValueException(exception=_validation_error(
+                "Query", f"Query key condition not supported: {key}"
+            ))
+
+        items = [
+            copy.deepcopy(item) for item in self.table.values()
+            if item.get(key) == value
+        ]
+
+        return items or None
+
+
+    async def delete_data(self, value: str, key: str = config.CLAIM_TABLE_KEY):
+        """ Delete an item from the table """
+        if key == config.CLAIM_TABLE_KEY:
+            self.table.pop(value, None)
+        else:
+            for item_key in [k for k, item in self.table.items() if item.get(key) == value]:
+                del self.table[item_key]
+
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+    async def get_many(self, values: List[str],
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> List[dict]:
+        """ Get the items from the table, skipping the missing keys """
+        items = [await self.get_data(value=value, key=key) for value in dict.fromkeys(values)]
+        return [item for item in items if item is not None]
+
+
+    async def delete_many(self, values: List[str],
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> bool:
+        """ Delete the items from the table """
+        for value in dict.fromkeys(values):
+            await self.delete_data(value=value, key=key)
+
+        return True
+
+
+    async def delete_user_data(self, user_id: int | str,
+            values: List[str] | None = None
+        ) -> List[str]:
+        """ Delete the items of a user, and the given items, from the
+        table. Returns the values of the deleted items.
+        """
+        return await _delete_user_data(self, user_id, values)
+
+
+async def _delete_user_data(service, user_id: int | str,
+        values: List[str] | None
+    ) -> List[str]:
+    """ Query the items of a user on the user index, then delete them
+    along with the given items in batches.
+    """
+    items = await service.query_data(
+        {config.CLAIM_TABLE_USER_KEY: user_id},
+        index_name=config.CLAIM_TABLE_USER_INDEX
+    ) or []
+
+    deleted = list(dict.fromkeys(
+        [item[config.CLAIM_TABLE_KEY] for item in items] + list(values or [])
+    ))
+    await service.delete_many(values=deleted)
+
+    return deleted
+
+
+def _validation_error(operation: str, message: str) -> ClientError:
+    """ Error raised by DynamoDB for an invalid request """
+    return ClientError(
+        {"Error": {"Code": "ValidationException", "Message": message}},
+        operation,
+    )
@@ -0,0 +1,238 @@
+""" Import the required modules """
+import json
+from typing import List
+
+from redis.exceptions import RedisError
+
+from modules.base.exceptions.base import (
+    InternalServerErrorException
+)
+
+from modules.base.config import config
+from modules.base.helpers.redis import redis_client
+
+# The keys read or deleted per command
+SCAN_BATCH_SIZE = 500
+
+# Deletes the claims of a user and the given claims, then the index set of
+# the user, in a single step. Returns the values of the deleted claims.
+DELETE_USER_SCRIPT = """
+local values = redis.call('SMEMBERS', KEYS[1])
+for i = 2, #ARGV do
+    values[#values + 1] = ARGV[i]
+end
+for i = 1, #values, 500 do
+    local keys = {}
+    for j = i, math.min(i + 499, #values) do
+        keys[#keys + 1] = ARGV[1] .. ':' .. values[j]
+    end
+    redis.call('UNLINK', unpack(keys))
+end
+redis.call('UNLINK', KEYS[1])
+return values
+"""
+
+
+class RedisStorageService:
+    """ RedisStorageService class to handle Redis storage operations.
+
+    This class stores the items as JSON strings under a prefixed key, and
+    exposes the same operations as the DynamoDB storage services. The item
+    expiry is handed to Redis with the `ttl` attribute of the item, so the
+    expired claims are dropped by Redis itself.
+
+    A set of keys is kept per user id. The claims of a user are read with
+    a single MGET, and revoked along with the set by a Lua script, so a
+    forced logout is a single round trip.
+
+    Requires Redis 7 or later, for the NX and GT flags of EXPIREAT.
+    """
+
+    def __init__(self, prefix: str = config.CLAIM_REDIS_PREFIX):
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self._delete_user = self.redis_client.register_script(DELETE_USER_SCRIPT)
+
+
+    async def set_data(self, data: dict) -> bool:
+        """ Store an item in Redis.
+
+        The item is stored with a native key expiry taken from its `ttl`
+        (epoch seconds) and added to the index set of its user.
+        """
+        try:
+            key = self._key(data[config.CLAIM_TABLE_KEY])
+            expires_at = data.get("ttl")
+            user_id = data.get(config.CLAIM_TABLE_USER_KEY)
+
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, json.dumps(data, default=str), exat=expires_at)
+                if user_id is not None:
+                    user_key = self._user_key(user_id)
+                    pipe.sadd(user_key, data[config.CLAIM_TABLE_KEY])
+                    if expires_at:
+                        # Keep the index alive as long as its last claim
+                        pipe.expireat(user_key, expires_at, nx=True)
+                        pipe.expireat(user_key, expires_at, gt=True)
+                await pipe.execute()
+
+            return True
+        except RedisError as e:
+            raise InternalServerErrorException(message=str(e)) from e
+
+
+    async def get_data(self, value: str,
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> dict | None:
+        """
+        Get an item from Redis.
+        """
+        try:
+            result = await self.redis_client.get(self._key(value))
+            if result is None:
+                return None
+
+            return json.loads(result)
+        except RedisError as e:
+            raise InternalServerErrorException(message=str(e)) from e
+
+
+    async def query_data(self, query: dict[str, str],
+            index_name: str | None = None
+        ) -> List[dict] | None:
+        """ Get the items matching the query from Redis.
+
+        The items of a user are read through the per-user index set, an
+        item key with a GET. Any other attribute is matched on a SCAN of
+        the items, which walks the whole keyspace of the prefix. The index
+        name is accepted for parity with the DynamoDB services.
+        """
+        try:
+            key, value = next(iter(query.items()))
+            if key == config.CLAIM_TABLE_USER_KEY:
+                return await self._query_user(value)
+
+            if key == config.CLAIM_TABLE_KEY:
+                item = await self.get_data(value)
+                return [item] if item is not None else None
+
+            items = []
+            async for item in self._scan():
+                if item.get(key) == value:
+                    items.append(item)
+
+            return items or None
+        except RedisError as e:
+            raise InternalServerErrorException(message=str(e)) from e
+
+
+    async def get_many(self, values: List[str],
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> List[dict]:
+        """ Get the items from Redis with a single MGET """
+        try:
+            if not values:
+                return []
+
+            results = await self.redis_client.mget([self._key(value) for value in values])
+            return [json.loads(result) for result in results if result is not None]
+        except RedisError as e:
+            raise InternalServerErrorException(message=str(e)) from e
+
+
+    async def delete_data(self, value: str, key: str = config.CLAIM_TABLE_KEY):
+        """ Delete an item from Redis
+
+        The index set of the user is pruned lazily on the next query.
+        """
+        try:
+            return await self.redis_client.unlink(self._key(value))
+        except RedisError as e:
+            raise InternalServerErrorException(message=str(e)) from e
+
+
+    async def delete_many(self, values: List[str],
+            key: str = config.CLAIM_TABLE_KEY
+        ) -> bool:
+        """ Delete the items from Redis with a single UNLINK """
+        try:
+            if values:
+                await self.redis_client.unlink(*[self._key(value) for value in values])
+
+            return True
+        except RedisError as e:
+            raise InternalServerErrorException(message=str(e)) from e
+
+
+    async def delete_user_data(self, user_id: int | str,
+            values: List[str] | None = None
+        ) -> List[str]:
+        """ Delete the items of a user, and the given items, from Redis.
+
+        The items and the index set of the user are deleted by a single
+        script call. Returns the values of the deleted items.
+        """
+        try:
+            deleted = await self._delete_user(
+                keys=[self._user_key(user_id)],
+                args=[self.prefix, *(values or [])]
+            )
+            return list(dict.fromkeys(
+                value.decode() if isinstance(value, bytes) else value
+                for value in deleted
+            ))
+        except RedisError as e:
+            raise InternalServerErrorException(message=str(e)) from e
+
+
+    async def _query_user(self, user_id: int | str) -> List[dict] | None:
+        """ Get the items of a user through the index set of the user """
+        user_key = self._user_key(user_id)
+        members = [
+            member.decode() if isinstance(member, bytes) else member
+            for member in await self.redis_client.smembers(user_key)
+        ]
+        if not members:
+            return None
+
+        results = await self.redis_client.mget([self._key(member) for member in members])
+
+        # Drop the index members whose claim has already expired
+        expired = [member for member, result in zip(members, results) if result is None]
+        if expired:
+            await self.redis_client.srem(user_key, *expired)
+
+        items = [json.loads(result) for result in results if result is not None]
+        return items or None
+
+
+    async def _scan(self):
+        """ Yield every item of the prefix, a MGET per SCAN batch """
+        user_prefix = self._user_key("")
+        batch = []
+        async for key in self.redis_client.scan_iter(
+                match=f"{self.prefix}:*", count=SCAN_BATCH_SIZE
+            ):
+            key = key.decode() if isinstance(key, bytes) else key
+            if key.startswith(user_prefix):
+                continue
+
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                for result in await self.redis_client.mget(batch):
+                    if result is not None:
+                        yield json.loads(result)
+                batch = []
+
+        if batch:
+            for result in await self.redis_client.mget(batch):
+                if result is not None:
+                    yield json.loads(result)
+
+
+    def _key(self, value: str) -> str:
+        return f"{self.prefix}:{value}"
+
+
+    def _user_key(self, user_id: int | str) -> str:
+        return f"{self.prefix}:user:{user_id}"
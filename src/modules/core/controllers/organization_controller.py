@@ -1,14 +1,19 @@
 """ Import the required modules """
+from typing import Literal
 from fastapi import Request
 from pydantic import BaseModel
 
 # Include the project modules
-from modules.base.models.response import JsonSuccessResponse
+from modules.base.models.adapter import get_adapter
+from modules.base.models.response import JsonSuccessResponse, JsonStreamingResponse
 from modules.base.controller.base import BaseController
 
 # Include the project services
 from ..services.organization_service import OrganizationService
 
+# Include the project models
+from ..models.organization import Organization
+
 
 class OrganizationController(BaseController):
     """
@@ -34,7 +39,7 @@ class OrganizationController(BaseController):
             # Get the ip address from the request
             ip_address = request.client.host
 
-            response: BaseModel = await self.service.list(
+            response, metadata = await self.service.list(
                 commons=commons,
                 request=request,
                 ip_address=ip_address
@@ -42,7 +47,36 @@ class OrganizationController(BaseController):
 
             # Send data from the service
             return JsonSuccessResponse(
-                content=response
+                content=response,
+                metadata=metadata
+            )
+        except Exception as e:
+            raise e
+
+
+    async def export(
+            self,
+            commons: dict,
+            framing: Literal["json", "ndjson"],
+            request: Request,
+            current_user: BaseModel) -> JsonStreamingResponse:
+        """
+        Stream all the organizations, as a JSON array or as NDJSON.
+        """
+        try:
+            # Get the ip address from the request
+            ip_address = request.client.host
+
+            rows = self.service.stream(
+                commons=commons,
+                ip_address=ip_address
+            )
+
+            # Stream data from the service
+            return JsonStreamingResponse(
+                content=rows,
+                adapter=get_adapter(Organization),
+                framing=framing
             )
         except Exception as e:
             raise e
@@ -2,11 +2,12 @@
 from typing_extensions import Self
 from pydantic import (
     BaseModel, Field, model_validator, 
-    TypeAdapter, EmailStr
+    EmailStr
 )
 
 # Import configuration file
 from modules.base.config import config
+from modules.base.models.adapter import get_adapter
 
 
 class OrganizationBaseModel(BaseModel):
@@ -28,7 +29,7 @@ class OrganizationBaseModel(BaseModel):
         """
         # Check the username is for empty, email and phone number
         if '@' in self.username: # Email Validation
-            ta_email = TypeAdapter(EmailStr)
+            ta_email = get_adapter(EmailStr)
             if not ta_email.validate_python(self.username):
                 raise ValueError('Invalid email')
         elif str(self.username).isdigit(): # Phone Number Validation
@@ -11,6 +11,12 @@ class OrganizationRepository(BaseRepository[OrganizationSchema]):
     This class provides methods to perform CRUD operations on the database.
     It uses SQLAlchemy to interact with the database.
     """
+    keyset_columns: set[str] = {"id", "display_name", "created_at"}
+    join_strategies: dict[str, str] = {
+        "type": "joined",
+        "configurations": "selectin",
+    }
+
     def __init__(self, model = OrganizationSchema):
         self.model = model
         super().__init__(model)
@@ -1,5 +1,5 @@
 """ Import the required modules """
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 from fastapi import APIRouter, Depends, Request
 
 # Import middlewares and dependencies
@@ -44,7 +44,7 @@ async def index(
     Get all organizations.
     """
     #current_user = auth.current_user()
-    access_token: str = auth.valid_token()
+    access_token: str = await auth.valid_token()
     if not access_token:
         raise InvalidTokenException()
 
@@ -52,6 +52,29 @@ async def index(
     return await Controller().index(commons, request, current_user)
 
 
+@router.get("/export",
+        dependencies=[Depends(AuthGaurd)],
+        name="export_organizations"
+    )
+async def export(
+        request: Request,
+        framing: Literal["json", "ndjson"] = "json",
+        skip: int = 0,
+        limit: int | None = None,
+        auth: AuthGaurd = Depends(AuthGaurd)
+    ) -> Any:
+    """
+    Export all organizations, streamed as a JSON array or as NDJSON.
+    """
+    access_token: str = await auth.valid_token()
+    if not access_token:
+        raise InvalidTokenException()
+
+    current_user = {"id":1, "name":"test", "email":"amit@bond.ai"}
+    commons = {"skip": skip, "limit": limit}
+    return await Controller().export(commons, framing, request, current_user)
+
+
 @router.get("/{uid}",
         dependencies=[Depends(AuthGaurd)],
         name="get_organization"
@@ -65,7 +88,7 @@ async def show(
     Get the organization with the given uid.
     """
     #current_user = auth.current_user()
-    access_token: str = auth.valid_token()
+    access_token: str = await auth.valid_token()
     if not access_token:
         raise
 
@@ -6,6 +6,7 @@ from typing import List, Optional, TYPE_CHECKING
 from sqlalchemy import (
     Double,
     ForeignKey,
+    Index,
     Integer,
     DateTime,
     String
@@ -38,6 +39,12 @@ class OrganizationSchema(BaseSchemaUUIDAuditLogDeleteLog, BaseDB):
     
     """
     __tablename__ = "organizations"
+    __table_args__ = (
+        # Soft delete scoped lookups and keyset pagination
+        Index("ix_organizations_deleted_at_id", "deleted_at", "id"),
+        Index("ix_organizations_deleted_at_display_name", "deleted_at", "display_name", "id"),
+        Index("ix_organizations_deleted_at_created_at", "deleted_at", "created_at", "id"),
+    )
 
     # Foreign fields
     type_id: Mapped[int] = mapped_column(ForeignKey("lookups.id"))
@@ -1,8 +1,8 @@
 """ Import the required modules """
 import logging
-from typing import List
+from typing import AsyncIterator, List
 from fastapi import Request
-from pydantic import TypeAdapter, BaseModel
+from pydantic import BaseModel
 
 # Include the project models
 from modules.core.models.organization.request import (
@@ -10,6 +10,10 @@ from modules.core.models.organization.request import (
     OrganizationUpdateRequest
 )
 from modules.core.models.organization import Organization
+from modules.base.models.adapter import get_adapter
+from modules.base.helpers.cache import Cache, CacheTag
+from modules.base.db import Transactional
+from modules.base.db.session import session_scope
 
 # include the project services
 from modules.base.services.base import BaseService
@@ -47,10 +51,8 @@ class OrganizationService(BaseService):
             current_user: BaseModel) -> Organization:
         """ Create a new object """
         try :
-            # Validate the credentials
-            model: Organization = await self.repository.save(
-                payload, ip_address, current_user
-            )
+            # Create the organization, committed on return
+            model: Organization = await self._create(payload, current_user)
             if not model:
                 raise EntityNotSavedException(
                     message="Unable to create the organization"
@@ -69,15 +71,16 @@ class OrganizationService(BaseService):
             ip_address: str, current_user: BaseModel) -> Organization:
         """ Update the model """
         try:
-            # Get the claim from storage
-            model: Organization = await self.repository.update_by_hash(
-                uid, payload, ip_address, current_user
-            )
+            # Update the organization, committed on return
+            model: Organization = await self._update(uid, payload, current_user)
             if not model:
                 raise EntityNotSavedException(
                     message="Unable to update the organization"
                 )
 
+            # Drop the cached organizations
+            await Cache.remove_by_tag(tag=CacheTag.GET_ORGANIZATION)
+
             # Raise event on successful update
             OrganizationUpdateEvent().raise_event(model)
 
@@ -91,14 +94,16 @@ class OrganizationService(BaseService):
             current_user: BaseModel) -> Organization:
         """ Delete the model """
         try:
-            model: Organization = await self.repository.delete_by_hash(
-                uid, ip_address, current_user
-            )
+            # Soft delete the organization, committed on return
+            model: Organization = await self._delete(uid, current_user)
             if not model:
                 raise EntityNotFoundException(
                     message="Unable to delete the organization"
                 )
 
+            # Drop the cached organizations
+            await Cache.remove_by_tag(tag=CacheTag.GET_ORGANIZATION)
+
             # Raise event on successful deletion
             OrganizationDeleteEvent().raise_event(model)
 
@@ -112,14 +117,28 @@ class OrganizationService(BaseService):
             commons: dict,
             request: Request,
             ip_address: str
-        ) -> List[Organization]:
-        """ List all the objects """
+        ) -> tuple[List[Organization], dict]:
+        """ List all the objects
+
+        The objects are paginated with a cursor, returned in the metadata.
+        The offset pagination is still used when `skip` is given.
+        """
         try:
-            # Validate the payload
-            response = await self.repository.get_all(
-                skip=commons.get("skip", 0),
-                limit=commons.get("limit", 100),
-            )
+            metadata: dict = {}
+            if commons.get("skip", 0):
+                response = await self.repository.get_all(
+                    skip=commons.get("skip", 0),
+                    limit=commons.get("limit", 100),
+                )
+            else:
+                response, next_cursor = await self.repository.get_page(
+                    limit=commons.get("limit", 100),
+                    cursor=commons.get("cursor"),
+                    sort_by=commons.get("sort_by", "id"),
+                    order=commons.get("order", "asc"),
+                )
+                metadata["next_cursor"] = next_cursor
+
             logger.debug(f"Organization count: {len(response)}")
             if not response:
                 raise EntityNotFoundException(
@@ -127,13 +146,28 @@ class OrganizationService(BaseService):
                 )
             
             # Validate the response
-            models: List[Organization] = TypeAdapter(List[Organization]).validate_python(response)
+            models: List[Organization] = get_adapter(List[Organization]).validate_python(response)
 
-            return models
+            return models, metadata
         except Exception as e:
             raise e
 
 
+    def stream(
+            self,
+            commons: dict,
+            ip_address: str
+        ) -> AsyncIterator[object]:
+        """ Stream all the objects, for the exports """
+        return self.repository.stream(
+            skip=commons.get("skip", 0),
+            limit=commons.get("limit"),
+        )
+
+
+    @Cache.cached(
+        tag=CacheTag.GET_ORGANIZATION, ttl=60, exclude={"ip_address"}, scope=session_scope
+    )
     async def get(
             self,
             uid: str,
@@ -149,8 +183,56 @@ class OrganizationService(BaseService):
                 )
 
             # Validate the response
-            model: Organization = TypeAdapter(Organization).validate_python(response)
+            model: Organization = get_adapter(Organization).validate_python(response)
 
             return model
         except Exception as e:
             raise e
+
+
+    @Transactional()
+    async def _create(
+            self, payload: OrganizationCreateRequest,
+            current_user: BaseModel) -> Organization:
+        """ Create the organization in a unit of work """
+        schema = await self.repository.create({
+            **_attributes(payload),
+            "created_by": _user_id(current_user)
+        })
+
+        return get_adapter(Organization).validate_python(schema)
+
+
+    @Transactional()
+    async def _update(
+            self, uid: str, payload: OrganizationUpdateRequest,
+            current_user: BaseModel) -> Organization:
+        """ Update the organization in a unit of work """
+        schema = await self.repository.get_by_hash(uid)
+        schema = await self.repository.update(
+            schema, _attributes(payload), user_id=_user_id(current_user)
+        )
+
+        return get_adapter(Organization).validate_python(schema)
+
+
+    @Transactional()
+    async def _delete(self, uid: str, current_user: BaseModel) -> Organization:
+        """ Soft delete the organization in a unit of work """
+        schema = await self.repository.get_by_hash(uid)
+        await self.repository.delete(schema, user_id=_user_id(current_user))
+
+        return get_adapter(Organization).validate_python(schema)
+
+
+def _attributes(payload: BaseModel) -> dict:
+    """ The fields set in the request, the excluded ones included """
+    return {name: getattr(payload, name) for name in payload.model_fields_set}
+
+
+def _user_id(current_user: BaseModel | dict) -> int:
+    """ The id of the current user, 0 when unknown """
+    if isinstance(current_user, dict):
+        return current_user.get("id") or 0
+
+    return getattr(current_user, "id", None) or 0
@@ -3,12 +3,13 @@ from typing import Annotated, Self
 from datetime import date
 from pydantic import (
     ConfigDict, EmailStr, 
-    Field, TypeAdapter, 
+    Field,
     computed_field, model_validator
 )
 
 # Import the project models
 from modules.base.models.base import AppBaseModelWithHashAndAuditLog
+from modules.base.models.adapter import get_adapter
 from modules.core.models.organization.organization import Organization
 
 
@@ -85,7 +86,7 @@ class User(AppBaseModelWithHashAndAuditLog):
         """
         # Check the username is for empty, email and phone number
         if '@' in self.username: # Email Validation
-            ta_email = TypeAdapter(EmailStr)
+            ta_email = get_adapter(EmailStr)
             if not ta_email.validate_python(self.username):
                 raise ValueError('Invalid email')
         elif str(self.username).isdigit(): # Phone Number Validation
@@ -17,6 +17,12 @@ from modules.core.routes.organization_router import router as organization_route
 from modules.core.routes.lookup_router import router as lookup_router
 from modules.user.routes.route import router as user_router
 from modules.base.fastapi.middlewares import SQLAlchemyMiddleware
+from modules.base.db.session import EngineType, engines, reader_engines, replica_balancer
+from modules.base.db.pool_metrics import get_pool_stats
+from modules.base.services.aws.dynamodb_async import shutdown_dynamodb_executor
+from modules.base.services.auth.revocation_service import revocation_list
+from modules.base.services.auth.claim_cache import claim_cache
+from modules.base.helpers.cache import Cache, CustomKeyMaker, create_backend
 
 # Import the project exception handler
 from modules.base.exceptions import (
@@ -177,9 +183,24 @@ async def lifespan(_app: FastAPI):
         # Initialize routers
         init_routers(_app=_app)
 
+        # Initialize the cache
+        Cache.init(backend=create_backend(), key_maker=CustomKeyMaker())
+        await Cache.startup()
+
         # Initilize Exception Handlers
         # init_handlers(_app=_app)
 
+        # Keep the cached claims coherent across the workers
+        if config.CLAIM_CACHE_ENABLED:
+            await claim_cache.start()
+
+        # Keep the token revocations fresh for the stateless verification
+        if config.AUTH_VERIFICATION_MODE == "jwt":
+            await revocation_list.start()
+
+        # Check the read replicas health in the background
+        await replica_balancer.start()
+
         yield
     finally:
         # Stopping the server
@@ -188,6 +209,21 @@ async def lifespan(_app: FastAPI):
         # Cleanup log event handlers
         # cleanup_log_event_handlers()
 
+        # Stop refreshing the token revocations
+        await revocation_list.stop()
+
+        # Stop listening to the claim invalidations
+        await claim_cache.stop()
+
+        # Stop the read replicas health checks
+        await replica_balancer.stop()
+
+        # Release the cache backend
+        await Cache.shutdown()
+
+        # Release the DynamoDB executor threads
+        shutdown_dynamodb_executor(wait=False)
+
         # Cleanup resources here if needed
         logger.info("********** Server Stopped **********")
 
@@ -227,3 +263,12 @@ async def root():
 def health():
     """Api health endpoint."""
     return {"Api is up and running"}
+
+if config.HEALTH_DB_ENABLED:
+    @app.get("/health/db", status_code=200)
+    def health_db():
+        """Database connection pool statistics endpoint."""
+        return {
+            "pools": get_pool_stats([engines[EngineType.WRITER], *reader_engines]),
+            "replicas": replica_balancer.stats(),
+        }
@@ -0,0 +1,55 @@
+""" Import the required modules """
+import inspect
+import os
+import time
+from typing import Any, Callable
+
+import pytest
+
+# The iterations of a benchmark, raise them for figures worth comparing,
+# e.g. BENCHMARK_ITERATIONS=100000 pytest tests/benchmarks
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "1000"))
+
+# The timings of the run, reported in the terminal summary
+_results: list[tuple[str, int, float]] = []
+
+
+class Benchmark:
+    """ Times N iterations of a function, awaiting its result if needed.
+
+    The timings are reported, not asserted: the wall clock of a shared
+    runner is too noisy to fail a build on.
+    """
+
+    async def __call__(self, name: str, func: Callable[[], Any],
+            iterations: int = ITERATIONS
+        ) -> float:
+        """ Run the function `iterations` times and return the seconds
+        per iteration. The result is reported at the end of the run.
+        """
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            result = func()
+            if inspect.isawaitable(result):
+                await result
+        elapsed = (time.perf_counter() - started_at) / iterations
+
+        _results.append((name, iterations, elapsed))
+        return elapsed
+
+
+@pytest.fixture
+def benchmark() -> Benchmark:
+    return Benchmark()
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if not _results:
+        return
+
+    terminalreporter.section("benchmarks")
+    for name, iterations, elapsed in _results:
+        terminalreporter.write_line(
+            f"{name:<60} {iterations:>9} x {elapsed * 1_000_000:>12.2f} us"
+            f" {1 / elapsed:>12.0f} ops/s"
+        )
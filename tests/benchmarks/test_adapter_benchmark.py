@@ -0,0 +1,37 @@
+""" Import the required modules """
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from modules.base.models.adapter import get_adapter
+from modules.base.models.auth.claim import AuthClaim
+from modules.core.models.organization.organization import Organization
+from modules.user.models.user import User
+
+ORGANIZATION = {"id": 1, "display_name": "My Organization", "legal_name": "My Organization Inc"}
+
+PAYLOADS = {
+    "AuthClaim": (AuthClaim, {
+        "token": {"access_token": "token", "expires_at": 1700000000},
+        "user": {"id": 1, "username": "user@example.com"},
+    }),
+    "List[Organization]": (List[Organization], [ORGANIZATION] * 10),
+    "User": (User, {"id": 1, "username": "user@example.com", "organization": ORGANIZATION}),
+}
+
+
+@pytest.mark.parametrize("name", PAYLOADS)
+async def test_cached_adapter_against_per_call_construction(benchmark, name):
+    type_, payload = PAYLOADS[name]
+
+    await benchmark(
+        f"TypeAdapter per call: {name}",
+        lambda: TypeAdapter(type_).validate_python(payload)
+    )
+    await benchmark(
+        f"TypeAdapter cached: {name}",
+        lambda: get_adapter(type_).validate_python(payload)
+    )
+
+    assert get_adapter(type_) is get_adapter(type_)
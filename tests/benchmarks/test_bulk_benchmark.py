@@ -0,0 +1,41 @@
+""" Import the required modules """
+import os
+
+from modules.core.repositories.organization_repository import OrganizationRepository
+
+# The rows created and soft deleted per run
+ROWS = int(os.getenv("BENCHMARK_BULK_ROWS", "1000"))
+
+
+def make_items(prefix: str) -> list[dict]:
+    return [
+        {"type_id": 1, "display_name": f"{prefix} {index}"}
+        for index in range(ROWS)
+    ]
+
+
+async def test_bulk_against_per_row_writes(db, benchmark):
+    repository = OrganizationRepository()
+    per_row, bulk = [], []
+
+    async def create_per_row():
+        for item in make_items("Per row"):
+            per_row.append(await repository.create(item))
+
+    async def create_bulk():
+        bulk.extend(await repository.bulk_create(make_items("Bulk")))
+
+    async def soft_delete_per_row():
+        for model in per_row:
+            await repository.delete(model)
+
+    async def soft_delete_bulk():
+        await repository.bulk_soft_delete([model.id for model in bulk])
+
+    await benchmark(f"create {ROWS} rows, per row", create_per_row, iterations=1)
+    await benchmark(f"create {ROWS} rows, bulk", create_bulk, iterations=1)
+    await benchmark(f"soft delete {ROWS} rows, per row", soft_delete_per_row, iterations=1)
+    await benchmark(f"soft delete {ROWS} rows, bulk", soft_delete_bulk, iterations=1)
+
+    assert len(per_row) == len(bulk) == ROWS
+    assert await repository.get_all() == []
@@ -0,0 +1,42 @@
+""" Import the required modules """
+import os
+import time
+
+import pytest
+
+from modules.base.helpers.cache import RedisBackend
+
+# The keys cached under the tag, raise them for the larger figures,
+# e.g. BENCHMARK_CACHE_KEYS=10000,100000,1000000
+KEYS = [int(keys) for keys in os.getenv("BENCHMARK_CACHE_KEYS", "10000").split(",")]
+
+# The keys written per pipeline, when filling the cache
+FILL_BATCH_SIZE = 10000
+
+
+async def fill(redis, keys: int) -> None:
+    """ Caches the keys under the tag, and as many under another tag """
+    expires_at = time.time() + 600
+    for start in range(0, keys, FILL_BATCH_SIZE):
+        batch = [f"tag::{index}" for index in range(start, min(start + FILL_BATCH_SIZE, keys))]
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in batch:
+                pipe.set(key, b"value", ex=600)
+                pipe.set(f"other::{key}", b"value", ex=600)
+            pipe.zadd("cache:index:tag", {key: expires_at for key in batch})
+            await pipe.execute()
+    await redis.expire("cache:index:tag", 600)
+
+
+@pytest.mark.parametrize("keys", KEYS)
+async def test_invalidation(redis, benchmark, keys):
+    await fill(redis, keys)
+
+    await benchmark(
+        f"invalidate a tag of {keys} keys",
+        lambda: RedisBackend().delete_startswith(value="tag"),
+        iterations=1,
+    )
+
+    assert await redis.exists("cache:index:tag") == 0
+    assert await redis.dbsize() == keys
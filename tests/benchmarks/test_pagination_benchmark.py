@@ -0,0 +1,40 @@
+""" Import the required modules """
+import os
+
+from modules.base.repository.pagination import Cursor
+from modules.core.repositories.organization_repository import OrganizationRepository
+
+# The page size, and the deep page read against the first one
+PAGE_SIZE = 10
+DEEP_PAGE = int(os.getenv("BENCHMARK_DEEP_PAGE", "10000"))
+ITERATIONS = 100
+
+
+async def test_offset_against_keyset_pagination(db, benchmark):
+    repository = OrganizationRepository()
+    await repository.bulk_create([
+        {"type_id": 1, "display_name": f"Organization {index}"}
+        for index in range(DEEP_PAGE * PAGE_SIZE)
+    ])
+
+    skip = (DEEP_PAGE - 1) * PAGE_SIZE
+    after = (await repository.get_all(skip=skip - 1, limit=1))[0]
+    cursor = Cursor(sort_by="id", order="asc", value=after.id, id=after.id).encode()
+
+    for page, offset, page_cursor in ((1, 0, None), (DEEP_PAGE, skip, cursor)):
+        await benchmark(
+            f"offset page {page}",
+            lambda offset=offset: repository.get_all(skip=offset, limit=PAGE_SIZE),
+            iterations=ITERATIONS
+        )
+        await benchmark(
+            f"keyset page {page}",
+            lambda page_cursor=page_cursor: repository.get_page(
+                limit=PAGE_SIZE, cursor=page_cursor
+            ),
+            iterations=ITERATIONS
+        )
+
+    offset_page = await repository.get_all(skip=skip, limit=PAGE_SIZE)
+    keyset_page, _ = await repository.get_page(limit=PAGE_SIZE, cursor=cursor)
+    assert [model.id for model in keyset_page] == [model.id for model in offset_page]
@@ -0,0 +1,32 @@
+""" Import the required modules """
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.middleware import Middleware
+
+from modules.base.fastapi.middlewares.sqlalchemy import SQLAlchemyMiddleware
+
+
+def make_app(middleware: list[Middleware]) -> FastAPI:
+    app = FastAPI(middleware=middleware)
+
+    @app.get("/health")
+    def health():
+        return {"Api is up and running"}
+
+    return app
+
+
+@pytest.mark.parametrize("middleware", [
+    pytest.param([], id="without"),
+    pytest.param([Middleware(SQLAlchemyMiddleware)], id="with"),
+])
+async def test_health_requests_per_second(benchmark, middleware, request):
+    transport = httpx.ASGITransport(app=make_app(middleware))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await benchmark(
+            f"GET /health {request.node.callspec.id} SQLAlchemyMiddleware",
+            lambda: client.get("/health")
+        )
+
+        assert (await client.get("/health")).status_code == 200
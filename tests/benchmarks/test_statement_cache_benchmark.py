@@ -0,0 +1,35 @@
+""" Import the required modules """
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.expression import select
+
+from modules.base.db.base import BaseDB
+from modules.core.repositories.organization_repository import OrganizationRepository
+
+
+async def test_prebuilt_against_rebuilt_get_by_hash(benchmark):
+    """ 100k calls: BENCHMARK_ITERATIONS=100000 """
+    # The in-memory database lives as long as its single connection
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(BaseDB.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repository = OrganizationRepository()
+        repository.session = session
+        model = await repository.create({"type_id": 1, "display_name": "Organization"})
+        model_class = repository.model_class
+
+        async def rebuilt():
+            # The statement as built on every call before the cache
+            query = select(model_class).where(getattr(model_class, "hash") == model.hash)
+            return await repository._one(query)
+
+        await benchmark("get_by_hash, rebuilt statement", rebuilt)
+        await benchmark("get_by_hash, prebuilt statement",
+            lambda: repository.get_by_hash(model.hash)
+        )
+
+        assert (await repository.get_by_hash(model.hash)).id == (await rebuilt()).id
+
+    await engine.dispose()
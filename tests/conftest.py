@@ -0,0 +1,127 @@
+""" Import the required modules """
+import os
+import sys
+import tempfile
+from contextlib import AbstractContextManager
+from datetime import datetime, timezone
+from typing import Callable
+from uuid import uuid4
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from sqlalchemy import BigInteger, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+
+# The settings of the test run, set before the application modules load
+# the configuration. A SQLite file stands in for MySQL, shared by the
+# writer and the reader engines.
+DB_PATH = os.path.join(tempfile.mkdtemp(), "test.sqlite3")
+os.environ.setdefault("ENV", "test")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("WRITER_DB_URL", f"sqlite+aiosqlite:///{DB_PATH}")
+os.environ.setdefault("READER_DB_URL", f"sqlite+aiosqlite:///{DB_PATH}")
+
+import modules.core.schemas  # noqa: E402,F401
+from modules.base.db import session  # noqa: E402
+from modules.base.db.base import BaseDB  # noqa: E402
+from modules.base.db.instrumentation import QueryStats, count_queries  # noqa: E402
+from modules.base.db.session import (  # noqa: E402
+    EngineType,
+    engines,
+    reader_engines,
+    reset_session_context,
+    set_session_context,
+)
+from modules.base.helpers import redis as redis_helper  # noqa: E402
+from modules.base.helpers.cache import (  # noqa: E402
+    Cache,
+    CustomKeyMaker,
+    MemoryBackend,
+)
+from modules.base.helpers.cache.cache_manager import CacheManager  # noqa: E402
+
+
+@compiles(BigInteger, "sqlite")
+def _compile_big_integer(type_, compiler, **kw) -> str:
+    """ SQLite only autoincrements the INTEGER primary keys """
+    return "INTEGER"
+
+
+def _register_functions(dbapi_connection, connection_record) -> None:
+    """ The MySQL functions of the server defaults """
+    dbapi_connection.create_function(
+        "UTC_TIMESTAMP", 0,
+        lambda: datetime.now(tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+    )
+    dbapi_connection.create_function("UUID", 0, lambda: str(uuid4()))
+
+
+@pytest.fixture(scope="session")
+async def database() -> None:
+    """ Creates the tables once for the run """
+    writer = engines[EngineType.WRITER]
+    for engine in {writer, *reader_engines}:
+        event.listen(engine.sync_engine, "connect", _register_functions)
+
+    async with writer.begin() as connection:
+        await connection.run_sync(BaseDB.metadata.create_all)
+
+    yield
+
+    for engine in {writer, *reader_engines}:
+        await engine.dispose()
+
+
+@pytest.fixture
+async def db(database) -> AsyncSession:
+    """
+    The scoped session of a request. The rows are deleted after the test.
+    """
+    context = set_session_context(session_id=f"test-{uuid4().hex}")
+
+    yield session
+
+    await session.remove()
+    async with engines[EngineType.WRITER].begin() as connection:
+        for table in reversed(BaseDB.metadata.sorted_tables):
+            await connection.execute(table.delete())
+    reset_session_context(context=context)
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """
+    Asserts a block runs at most `budget` SQL statements, e.g. to catch
+    the N+1 loads of a relationship:
+
+        with query_budget(2):
+            await repository.get_all(join_={"type", "configurations"})
+    """
+    return lambda budget: count_queries(budget=budget)
+
+
+@pytest.fixture
+async def redis(monkeypatch) -> FakeAsyncRedis:
+    """
+    An in-process Redis, in place of the shared client of every module
+    already loaded. The data is dropped after the test.
+    """
+    client = FakeAsyncRedis()
+    original = redis_helper.redis_client
+    for module in list(sys.modules.values()):
+        if getattr(module, "redis_client", None) is original:
+            monkeypatch.setattr(module, "redis_client", client)
+
+    yield client
+
+    await client.flushall()
+    await client.aclose()
+
+
+@pytest.fixture
+def cache(monkeypatch) -> CacheManager:
+    """ The shared cache manager, on an in-memory backend """
+    monkeypatch.setattr(Cache, "backend", MemoryBackend())
+    monkeypatch.setattr(Cache, "key_maker", CustomKeyMaker())
+    return Cache
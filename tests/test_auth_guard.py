@@ -0,0 +1,56 @@
+""" Import the required modules """
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Request
+
+from modules.base.config import config
+from modules.base.fastapi.dependencies.authentication import AuthGaurd
+from modules.base.services.auth.claim_service import ClaimService
+from modules.base.services.aws.dynamodb_async import InMemoryDynamoDBService
+from modules.user.models.user import User
+
+
+async def current_user(auth: AuthGaurd = Depends(AuthGaurd, use_cache=False)) -> User:
+    return await auth.get_user()
+
+
+app = FastAPI()
+
+
+@app.get("/claim-fetches", dependencies=[Depends(AuthGaurd)])
+async def claim_fetches(
+        request: Request,
+        auth: AuthGaurd = Depends(AuthGaurd),
+        user: User = Depends(current_user)
+    ) -> int:
+    await auth.valid_token()
+    await auth.get_user()
+    return request.state.claim_fetch_count
+
+
+@pytest.fixture
+async def client(monkeypatch) -> httpx.AsyncClient:
+    monkeypatch.setattr(config, "CLAIM_STORAGE", "memory")
+    monkeypatch.setattr(config, "CLAIM_CACHE_ENABLED", False)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+    InMemoryDynamoDBService.tables.get(config.CLAIM_TABLE_NAME, {}).clear()
+
+
+async def login() -> str:
+    claim = await ClaimService().create(payload={"user_id": 1}, user={"id": 1})
+    return claim.key
+
+
+@pytest.mark.parametrize("mode", ["claim", "jwt"])
+async def test_the_claim_is_fetched_once_per_request(client, monkeypatch, mode):
+    monkeypatch.setattr(config, "AUTH_VERIFICATION_MODE", mode)
+    headers = {"Authorization": f"Bearer {await login()}"}
+
+    for _ in range(2):
+        response = await client.get("/claim-fetches", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == 1
@@ -0,0 +1,45 @@
+""" Import the required modules """
+import pytest
+
+from modules.auth.models.request import LoginRequest
+from modules.auth.services.service import AuthService
+from modules.base.config import config
+from modules.base.exceptions import InvalidTokenException
+
+
+@pytest.fixture
+async def service(monkeypatch, redis) -> AuthService:
+    monkeypatch.setattr(config, "CLAIM_STORAGE", "memory")
+    monkeypatch.setattr(config, "CLAIM_CACHE_ENABLED", False)
+    service = AuthService()
+    yield service
+    service.claim_service.storage_service.table.clear()
+
+
+async def login(service: AuthService) -> str:
+    claim = await service.authenticate(
+        LoginRequest(username="user@example.com", code="123456"), "127.0.0.1"
+    )
+    return claim.key
+
+
+async def test_forced_logout_revokes_every_claim_of_the_user(service):
+    first, second = await login(service), await login(service)
+
+    assert await service.logout(first, is_forced=True) is True
+
+    for token in (first, second):
+        with pytest.raises(InvalidTokenException):
+            await service.claim_service.get(token)
+
+
+async def test_forced_logout_without_the_user_index(service):
+    # The user index is not provisioned on the table
+    service.claim_service.storage_service.indexes = {}
+    first, second = await login(service), await login(service)
+
+    assert await service.logout(first, is_forced=True) is True
+
+    with pytest.raises(InvalidTokenException):
+        await service.claim_service.get(first)
+    assert (await service.claim_service.get(second)).key == second
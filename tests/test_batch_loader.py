@@ -0,0 +1,53 @@
+""" Import the required modules """
+import asyncio
+
+import pytest
+
+from modules.base.exceptions import EntityNotFoundException
+from modules.core.repositories.organization_repository import OrganizationRepository
+
+
+@pytest.fixture
+async def organizations(db) -> list:
+    models = await OrganizationRepository().bulk_create([
+        {"type_id": 1, "display_name": f"Organization {index}"} for index in range(3)
+    ])
+    db.expunge_all()
+    return models
+
+
+async def test_the_loads_of_a_tick_are_batched(organizations, query_budget):
+    loader = OrganizationRepository().loader()
+
+    with query_budget(1):
+        models = await loader.load_many([model.id for model in organizations])
+
+    assert [model.id for model in models] == [model.id for model in organizations]
+
+
+async def test_the_loads_of_a_key_are_coalesced(organizations, query_budget):
+    loader = OrganizationRepository().loader("hash")
+    uid = organizations[0].hash
+
+    with query_budget(1):
+        first, second = await asyncio.gather(loader.load(uid), loader.load(uid))
+        third = await loader.load(uid)
+
+    assert first is second is third
+
+
+async def test_the_loaders_of_a_session_fetch_one_at_a_time(organizations, query_budget):
+    repository = OrganizationRepository()
+
+    with query_budget(2):
+        by_id, by_hash = await asyncio.gather(
+            repository.loader("id").load(organizations[0].id),
+            repository.loader("hash").load(organizations[1].hash),
+        )
+
+    assert (by_id.id, by_hash.id) == (organizations[0].id, organizations[1].id)
+
+
+async def test_a_missing_key_fails(organizations):
+    with pytest.raises(EntityNotFoundException):
+        await OrganizationRepository().loader().load(0)
@@ -0,0 +1,46 @@
+""" Import the required modules """
+from modules.base.db.session import EngineType, engines
+from modules.core.repositories.organization_repository import OrganizationRepository
+
+
+def make_items(count: int) -> list[dict]:
+    return [
+        {"type_id": 1, "display_name": f"Organization {index}"}
+        for index in range(count)
+    ]
+
+
+async def test_bulk_create_returns_the_models(db):
+    models = await OrganizationRepository().bulk_create(make_items(3), user_id=7)
+
+    assert [model.display_name for model in models] == [
+        "Organization 0", "Organization 1", "Organization 2"
+    ]
+    assert all(model.id and model.created_by == 7 for model in models)
+
+
+async def test_bulk_create_without_returning(db, monkeypatch):
+    dialect = engines[EngineType.WRITER].dialect
+    monkeypatch.setattr(dialect, "insert_executemany_returning", False)
+    repository = OrganizationRepository()
+
+    assert await repository.bulk_create(make_items(3)) == 3
+    assert await repository.bulk_create([]) == []
+
+
+async def test_bulk_update_and_soft_delete(db):
+    repository = OrganizationRepository()
+    ids = [model.id for model in await repository.bulk_create(make_items(4))]
+
+    assert await repository.bulk_update(ids[:2], {"city": "Pune"}, user_id=7) == 2
+    assert await repository.bulk_soft_delete(ids[1:], user_id=7) == 3
+    assert await repository.bulk_soft_delete(ids[1:], user_id=7) == 0
+    assert await repository.bulk_soft_delete([]) == 0
+
+    db.expire_all()
+    models = await repository.get_all()
+    assert [(model.id, model.city, model.updated_by) for model in models] == [
+        (ids[0], "Pune", 7)
+    ]
+    deleted = await repository.get_all(include_deleted=True)
+    assert all(model.deleted_at is not None for model in deleted[1:])
@@ -0,0 +1,152 @@
+""" Import the required modules """
+import asyncio
+import sqlite3
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from modules.base.helpers.cache import MemoryBackend, SqliteBackend
+from modules.base.helpers.cache import memory_backend
+from modules.base.helpers.cache.sqlite_backend import _upper_bound
+
+# The last code point, the prefix bound can not be incremented past it
+MAX = chr(sys.maxunicode)
+
+KEYS = ["ta", "tag", "tag::1", "tag::2", f"tag{MAX}", f"tag{MAX}::1", "tah"]
+
+
+@pytest.fixture
+async def sqlite_backend(tmp_path) -> SqliteBackend:
+    backend = SqliteBackend(path=str(tmp_path / "cache.sqlite3"))
+    yield backend
+    await backend.shutdown()
+
+
+async def remaining(backend, keys: list[str] = KEYS) -> list[str]:
+    return [key for key in keys if await backend.get(key=key) is not None]
+
+
+def test_the_upper_bound_of_a_prefix():
+    assert _upper_bound("tag") == "tah"
+    assert _upper_bound(f"tag{MAX}") == "tah"
+    assert _upper_bound(f"tag{MAX}{MAX}") == "tah"
+    assert _upper_bound(MAX) is None
+    # The surrogates are skipped
+    assert _upper_bound("\ud7ff") == "\ue000"
+
+
+async def test_sqlite_expires_on_read(sqlite_backend):
+    await sqlite_backend.set(response=b"value", key="expired", ttl=0)
+    await sqlite_backend.set(response=b"value", key="kept", ttl=60)
+
+    assert await sqlite_backend.get(key="expired") is None
+    assert await sqlite_backend.get(key="kept") == b"value"
+
+    connection = sqlite3.connect(sqlite_backend.path)
+    try:
+        assert connection.execute("SELECT key FROM cache").fetchall() == [("kept",)]
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("prefix, deleted", [
+    ("tag::", ["tag::1", "tag::2"]),
+    ("tag", ["tag", "tag::1", "tag::2", f"tag{MAX}", f"tag{MAX}::1"]),
+    (f"tag{MAX}", [f"tag{MAX}", f"tag{MAX}::1"]),
+    ("", KEYS),
+])
+async def test_sqlite_deletes_a_prefix(sqlite_backend, prefix, deleted):
+    for key in KEYS:
+        await sqlite_backend.set(response=b"value", key=key)
+
+    await sqlite_backend.delete_startswith(value=prefix)
+
+    assert await remaining(sqlite_backend) == [key for key in KEYS if key not in deleted]
+
+
+async def test_sqlite_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = SqliteBackend(path=path)
+    await first.set(response=b"value", key="key", ttl=60)
+    await first.set(response=b"value", key="expired", ttl=0)
+    await first.shutdown()
+
+    second = SqliteBackend(path=path)
+    try:
+        await second.startup()
+        assert await second.get(key="key") == b"value"
+        assert await remaining(second, ["expired"]) == []
+    finally:
+        await second.shutdown()
+
+
+async def test_sqlite_runs_off_the_event_loop(sqlite_backend, monkeypatch):
+    threads = set()
+    execute = sqlite_backend._execute
+
+    def _execute(statement, parameters):
+        threads.add(threading.current_thread())
+        execute(statement, parameters)
+
+    monkeypatch.setattr(sqlite_backend, "_execute", _execute)
+
+    await asyncio.gather(*(
+        sqlite_backend.set(response=str(index).encode(), key=f"key:{index}")
+        for index in range(50)
+    ))
+    values = await asyncio.gather(*(
+        sqlite_backend.get(key=f"key:{index}") for index in range(50)
+    ))
+
+    assert values == [str(index).encode() for index in range(50)]
+    assert threading.main_thread() not in threads
+    connection = sqlite3.connect(sqlite_backend.path)
+    try:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    finally:
+        connection.close()
+
+
+async def test_memory_evicts_the_least_recently_used():
+    backend = MemoryBackend(max_size=2)
+    for key in ("first", "second"):
+        await backend.set(response=b"value", key=key)
+    await backend.get(key="first")
+
+    await backend.set(response=b"value", key="third")
+
+    assert await remaining(backend, ["first", "second", "third"]) == ["first", "third"]
+    assert backend.local._keys == ["first", "third"]
+
+
+async def test_memory_expires_on_read(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(memory_backend, "time", SimpleNamespace(monotonic=lambda: now))
+    backend = MemoryBackend()
+    await backend.set(response=b"value", key="key", ttl=10)
+
+    now += 9
+    assert await backend.get(key="key") == b"value"
+    now += 1
+    assert await backend.get(key="key") is None
+    assert len(backend.local) == 0 and backend.local._keys == []
+
+
+@pytest.mark.parametrize("prefix, deleted", [
+    ("tag::", ["tag::1", "tag::2"]),
+    ("tag", ["tag", "tag::1", "tag::2", f"tag{MAX}", f"tag{MAX}::1"]),
+    (f"tag{MAX}", [f"tag{MAX}", f"tag{MAX}::1"]),
+    ("", KEYS),
+])
+async def test_memory_deletes_a_prefix(prefix, deleted):
+    backend = MemoryBackend()
+    for key in reversed(KEYS):
+        await backend.set(response=b"value", key=key)
+
+    await backend.delete_startswith(value=prefix)
+
+    kept = [key for key in KEYS if key not in deleted]
+    assert await remaining(backend) == kept
+    assert backend.local._keys == kept
@@ -0,0 +1,58 @@
+""" Import the required modules """
+from datetime import datetime, timezone
+from typing import List
+
+from modules.base.helpers.cache import Cache, CacheTag, MsgpackCodec, PydanticCodec
+from modules.core.models.organization import Organization
+
+
+def make_organization(id_: int = 1) -> Organization:
+    return Organization(
+        id=id_,
+        display_name="My Organization",
+        legal_name="My Organization Inc",
+        created_by=7,
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2026, 2, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_an_organization_round_trips_with_its_excluded_fields():
+    codec = PydanticCodec(Organization)
+    organization = make_organization()
+
+    decoded = codec.decode(codec.encode(organization))
+
+    assert decoded == organization
+    assert decoded.legal_name == "My Organization Inc"
+    assert decoded.last_modified_at == organization.updated_at
+
+
+def test_a_list_of_organizations_round_trips():
+    codec = PydanticCodec(List[Organization])
+    organizations = [make_organization(1), make_organization(2)]
+
+    assert codec.decode(codec.encode(organizations)) == organizations
+
+
+def test_msgpack_round_trips_the_json_values():
+    codec = MsgpackCodec()
+    value = {"id": 1, "names": ["a", "b"], "nested": {"active": True}}
+
+    assert codec.decode(codec.encode(value)) == value
+
+
+async def test_a_cached_organization_is_read_back(cache):
+    calls = []
+
+    @Cache.cached(tag=CacheTag.GET_ORGANIZATION, ttl=60)
+    async def get(id_: int) -> Organization:
+        calls.append(id_)
+        return make_organization(id_)
+
+    first = await get(1)
+    second = await get(1)
+
+    assert calls == [1]
+    assert second == first
+    assert (second.legal_name, second.created_by) == ("My Organization Inc", 7)
@@ -0,0 +1,80 @@
+""" Import the required modules """
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from modules.base.config import config
+from modules.base.helpers.cache import CacheTag, JsonCodec, RedisBackend
+from modules.base.helpers.cache.entry import pack_entry
+
+
+async def test_a_local_backend_locks_without_redis(cache):
+    calls = []
+
+    @cache.cached(tag=CacheTag.GET_ORGANIZATION, lock=True)
+    async def get(uid: str):
+        calls.append(uid)
+        return {"uid": uid}
+
+    assert await get("a") == {"uid": "a"}
+    assert await get("a") == {"uid": "a"}
+    assert calls == ["a"]
+
+
+async def test_a_locked_key_serves_the_stale_result(monkeypatch, cache, redis):
+    monkeypatch.setattr(cache, "backend", RedisBackend())
+    calls = []
+
+    @cache.cached(tag=CacheTag.GET_ORGANIZATION, stale_ttl=60, beta=0, lock=True)
+    async def get(uid: str):
+        calls.append(uid)
+        return {"uid": uid}
+
+    await get("a")
+    key = next(k for k in await redis.keys("get_organization::*") if not k.endswith(b":lock"))
+    # Expired, but in its stale window, while another worker holds the lock
+    await redis.set(key, pack_entry(JsonCodec().encode({"uid": "stale"}), time.time() - 1, 0))
+    await redis.set(key + b":lock", "other")
+
+    started = time.monotonic()
+    assert await cache._compute(
+        key.decode(), lambda: get.__wrapped__("a"), JsonCodec(), 60, 60, True
+    ) == {"uid": "stale"}
+    assert time.monotonic() - started < 0.1
+    assert calls == ["a"]
+
+
+async def test_the_lock_wait_is_bounded(monkeypatch, cache, redis):
+    monkeypatch.setattr(cache, "backend", RedisBackend())
+    monkeypatch.setattr(config, "CACHE_LOCK_WAIT", 0.1)
+    # Held by a worker that never caches the key
+    await redis.set("get_organization::key:lock", "other")
+
+    async def compute():
+        return {"uid": "a"}
+
+    started = time.monotonic()
+    assert await cache._compute(
+        "get_organization::key", compute, JsonCodec(), 60, 0, True
+    ) == {"uid": "a"}
+    assert time.monotonic() - started < config.CACHE_LOCK_TIMEOUT
+
+
+async def test_the_refresh_runs_in_the_scope(cache):
+    scopes = []
+
+    @asynccontextmanager
+    async def scope():
+        scopes.append("enter")
+        yield
+        scopes.append("exit")
+
+    @cache.cached(tag=CacheTag.GET_ORGANIZATION, ttl=0, stale_ttl=60, scope=scope)
+    async def get(uid: str):
+        return {"uid": uid}
+
+    await get("a")
+    await get("a")
+    await asyncio.gather(*cache._refreshes)
+
+    assert scopes == ["enter", "exit"]
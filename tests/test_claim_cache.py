@@ -0,0 +1,134 @@
+""" Import the required modules """
+import asyncio
+import time
+
+from modules.base.config import config
+from modules.base.models.auth.claim import AuthClaim
+from modules.base.models.auth.token import Token
+from modules.base.services.auth.claim_cache import ClaimCache
+from modules.base.services.auth.claim_service import ClaimService
+
+
+def make_claim(access_token: str) -> AuthClaim:
+    return AuthClaim(
+        token=Token(access_token=access_token, expires_at=int(time.time()) + 3600),
+        user={"id": 1}
+    )
+
+
+async def wait_until(condition, timeout: float = 1.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+async def test_claims_are_not_served_before_subscribing():
+    cache = ClaimCache(max_size=10, ttl=60)
+
+    cache.set("token", make_claim("token"))
+
+    assert cache.get("token") is None
+
+
+async def test_invalidation_reaches_every_worker(redis):
+    workers = [ClaimCache(max_size=10, ttl=60), ClaimCache(max_size=10, ttl=60)]
+    for cache in workers:
+        await cache.start()
+    try:
+        await wait_until(lambda: all(cache.stats()["subscribed"] for cache in workers))
+        for cache in workers:
+            cache.set("token", make_claim("token"))
+            cache.set("other", make_claim("other"))
+
+        await workers[0].invalidate("token")
+
+        assert workers[0].get("token") is None
+        await wait_until(lambda: workers[1].stats()["size"] == 1)
+        assert workers[1].get("token") is None
+        assert workers[1].get("other") is not None
+    finally:
+        for cache in workers:
+            await cache.stop()
+
+
+async def test_stop_drops_the_claims(redis):
+    cache = ClaimCache(max_size=10, ttl=60)
+    await cache.start()
+    await wait_until(lambda: cache.stats()["subscribed"])
+    cache.set("token", make_claim("token"))
+
+    await cache.stop()
+
+    assert cache.stats()["size"] == 0
+    assert cache.get("token") is None
+
+
+async def test_lru_eviction(redis):
+    cache = ClaimCache(max_size=2, ttl=60)
+    await cache.start()
+    try:
+        await wait_until(lambda: cache.stats()["subscribed"])
+        for key in ("first", "second"):
+            cache.set(key, make_claim(key))
+        cache.get("first")
+        cache.set("third", make_claim("third"))
+
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+        assert cache.stats()["evictions"] == 1
+    finally:
+        await cache.stop()
+
+
+async def test_a_cached_claim_expires_with_its_token(redis):
+    cache = ClaimCache(max_size=10, ttl=60)
+    await cache.start()
+    try:
+        await wait_until(lambda: cache.stats()["subscribed"])
+        claim = make_claim("token")
+        claim.token.expires_at = int(time.time()) + 2
+        expired = make_claim("expired")
+        expired.token.expires_at = int(time.time()) - 1
+
+        cache.set("token", claim)
+        cache.set("expired", expired)
+
+        assert cache._entries["token"][0] == claim.ttl
+        assert "expired" not in cache._entries
+    finally:
+        await cache.stop()
+
+
+async def test_a_claim_revoked_during_the_read_is_not_cached(monkeypatch, redis):
+    monkeypatch.setattr(config, "CLAIM_STORAGE", "memory")
+    cache = ClaimCache(max_size=10, ttl=60)
+    await cache.start()
+    service = ClaimService()
+    service.cache = cache
+    try:
+        await wait_until(lambda: cache.stats()["subscribed"])
+        claim = make_claim("token")
+        await service.store(claim)
+        cache.clear()
+
+        reading, revoked = asyncio.Event(), asyncio.Event()
+        get_data = service.storage_service.get_data
+
+        async def slow_get_data(**kwargs):
+            item = await get_data(**kwargs)
+            reading.set()
+            await revoked.wait()
+            return item
+
+        monkeypatch.setattr(service.storage_service, "get_data", slow_get_data)
+        read = asyncio.create_task(service.get("token"))
+        await reading.wait()
+        await cache.invalidate("token")
+        revoked.set()
+
+        assert (await read).key == "token"
+        assert cache.get("token") is None
+    finally:
+        await cache.stop()
+        service.storage_service.table.clear()
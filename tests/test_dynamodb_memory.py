@@ -0,0 +1,96 @@
+""" Import the required modules """
+import asyncio
+import threading
+import time
+
+import pytest
+
+from modules.base.config import config
+from modules.base.exceptions import AWSValueException
+from modules.base.services.auth.claim_service import ClaimService
+from modules.base.services.aws.dynamodb_async import (
+    AsyncDynamoDBService,
+    InMemoryDynamoDBService
+)
+
+
+@pytest.fixture
+def storage() -> InMemoryDynamoDBService:
+    service = InMemoryDynamoDBService(table_name="test_claims")
+    yield service
+    service.table.clear()
+
+
+def make_item(key: str, user_id: int) -> dict:
+    return {config.CLAIM_TABLE_KEY: key, config.CLAIM_TABLE_USER_KEY: user_id}
+
+
+async def test_query_by_the_user_index(storage):
+    for key, user_id in (("first", 1), ("second", 1), ("third", 2)):
+        await storage.set_data(make_item(key, user_id))
+
+    items = await storage.query_data(
+        {config.CLAIM_TABLE_USER_KEY: 1}, index_name=config.CLAIM_TABLE_USER_INDEX
+    )
+
+    assert sorted(item[config.CLAIM_TABLE_KEY] for item in items) == ["first", "second"]
+
+
+async def test_query_by_an_unknown_index_fails(storage):
+    with pytest.raises(AWSValueException):
+        await storage.query_data({config.CLAIM_TABLE_USER_KEY: 1}, index_name="missing")
+
+
+async def test_query_without_index_needs_the_table_key(storage):
+    await storage.set_data(make_item("first", 1))
+
+    with pytest.raises(AWSValueException):
+        await storage.query_data({config.CLAIM_TABLE_USER_KEY: 1})
+    assert await storage.query_data({config.CLAIM_TABLE_KEY: "first"}) is not None
+
+
+async def test_batch_operations(storage):
+    for key in ("first", "second"):
+        await storage.set_data(make_item(key, 1))
+
+    items = await storage.get_many(["first", "second", "missing"])
+    assert len(items) == 2
+
+    assert await storage.delete_many(["first", "second"]) is True
+    assert await storage.get_many(["first", "second"]) == []
+
+
+class BlockingClient:
+    """ Stands in for the boto3 client, each call blocks its thread """
+
+    def __init__(self):
+        self.threads: list[str] = []
+
+    def get_item(self, **kwargs) -> dict:
+        self.threads.append(threading.current_thread().name)
+        time.sleep(0.2)
+        return {}
+
+
+async def test_dynamodb_claim_storage_does_not_block_the_event_loop(monkeypatch):
+    monkeypatch.setattr(config, "CLAIM_STORAGE", "dynamodb")
+    storage = ClaimService().storage_service
+    assert isinstance(storage, AsyncDynamoDBService)
+    storage.dynamodb_client = BlockingClient()
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    try:
+        assert await storage.get_data("token") is None
+    finally:
+        ticker.cancel()
+
+    assert ticks >= 5
+    assert storage.dynamodb_client.threads[0].startswith("dynamodb")
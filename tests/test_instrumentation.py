@@ -0,0 +1,37 @@
+""" Import the required modules """
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from modules.core.repositories.organization_repository import OrganizationRepository
+
+
+async def test_the_relationships_load_within_the_budget(db, query_budget):
+    repository = OrganizationRepository()
+    await repository.bulk_create([
+        {"type_id": 1, "display_name": f"Organization {index}"} for index in range(5)
+    ])
+    db.expunge_all()
+
+    with query_budget(2) as stats:
+        models = await repository.get_all(join_={"type", "configurations"})
+
+    assert len(models) == 5
+    assert stats.slowest_statement is not None
+
+
+async def test_over_the_budget_fails(db, query_budget):
+    with pytest.raises(AssertionError):
+        with query_budget(1):
+            await db.execute(text("SELECT 1"))
+            await db.execute(text("SELECT 2"))
+
+
+async def test_a_failed_statement_is_not_left_timing(db, query_budget):
+    with query_budget(1) as stats:
+        with pytest.raises(OperationalError):
+            await db.execute(text("SELECT * FROM missing_table"))
+
+    connection = await db.connection()
+    assert connection.sync_connection.info.get("query_started_at") == []
+    assert stats.count == 0
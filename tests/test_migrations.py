@@ -0,0 +1,50 @@
+""" Import the required modules """
+import importlib.util
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import inspect
+
+from modules.base.db.session import EngineType, engines
+from modules.core.schemas import OrganizationSchema
+
+VERSIONS = Path(__file__).parent.parent / "migrations" / "versions"
+
+
+def load_revision(name: str):
+    spec = importlib.util.spec_from_file_location(name, VERSIONS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def soft_delete_indexes(connection) -> dict[str, list[str]]:
+    return {
+        index["name"]: index["column_names"]
+        for index in inspect(connection).get_indexes("organizations")
+        if index["name"].startswith("ix_organizations_deleted_at_")
+    }
+
+
+def run(connection, step) -> dict[str, list[str]]:
+    with Operations.context(MigrationContext.configure(connection)):
+        step()
+    return soft_delete_indexes(connection)
+
+
+async def test_the_soft_delete_indexes_round_trip(database):
+    revision = load_revision("c4d1e7a9f2b6_add_organization_soft_delete_indexes")
+    expected = {
+        index.name: [column.name for column in index.columns]
+        for index in OrganizationSchema.__table__.indexes
+        if index.name.startswith("ix_organizations_deleted_at_")
+    }
+    assert len(expected) == 3
+
+    async with engines[EngineType.WRITER].begin() as connection:
+        # The tables of the test run are created from the schemas
+        assert await connection.run_sync(soft_delete_indexes) == expected
+
+        assert await connection.run_sync(run, revision.downgrade) == {}
+        assert await connection.run_sync(run, revision.upgrade) == expected
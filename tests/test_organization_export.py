@@ -0,0 +1,73 @@
+""" Import the required modules """
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from modules.base.config import config
+from modules.base.services.auth.claim_service import ClaimService
+from modules.base.services.aws.dynamodb_async import InMemoryDynamoDBService
+from modules.core.repositories.organization_repository import OrganizationRepository
+from modules.core.routes.organization_router import router
+
+app = FastAPI()
+app.include_router(router)
+
+
+@pytest.fixture
+async def client(db, monkeypatch) -> httpx.AsyncClient:
+    monkeypatch.setattr(config, "CLAIM_STORAGE", "memory")
+    monkeypatch.setattr(config, "CLAIM_CACHE_ENABLED", False)
+    claim = await ClaimService().create(payload={"user_id": 1}, user={"id": 1})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test",
+        headers={"Authorization": f"Bearer {claim.key}"}
+    ) as client:
+        yield client
+
+    InMemoryDynamoDBService.tables.get(config.CLAIM_TABLE_NAME, {}).clear()
+
+
+async def seed(count: int) -> None:
+    await OrganizationRepository().bulk_create([
+        {"type_id": 1, "display_name": f"Organization \"{index}\" ✓", "legal_name": "Legal"}
+        for index in range(count)
+    ])
+
+
+async def test_the_json_export_matches_the_index(client):
+    await seed(3)
+    index = (await client.get("/organization/")).json()
+    assert len(index["data"]) == 3
+
+    response = await client.get("/organization/export")
+
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    assert body["data"] == index["data"]
+    assert {key: value for key, value in body.items() if key != "data"} == {
+        "status_code": 200, "message": "success", "success": True,
+        "errors": None, "metadata": None,
+    }
+
+
+async def test_the_ndjson_export_matches_the_index(client):
+    await seed(3)
+    index = (await client.get("/organization/")).json()
+
+    response = await client.get("/organization/export", params={"framing": "ndjson"})
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    envelope, *rows = [json.loads(line) for line in response.text.splitlines()]
+    assert envelope["success"] is True and envelope["data"] is None
+    assert rows == index["data"]
+
+
+async def test_an_empty_export(client):
+    body = (await client.get("/organization/export")).json()
+    lines = (await client.get("/organization/export", params={"framing": "ndjson"})).text
+
+    assert body["data"] == [] and body["success"] is True
+    assert [json.loads(line)["data"] for line in lines.splitlines()] == [None]
@@ -0,0 +1,17 @@
+""" Import the required modules """
+from sqlalchemy import text
+
+from modules.base.db.pool_metrics import get_pool_stats, pool_metrics
+from modules.base.db.session import EngineType, engines
+
+
+async def test_the_open_connections_are_tracked(db):
+    await db.execute(text("SELECT 1"))
+
+    stats = get_pool_stats([engines[EngineType.READER]])["reader"]
+
+    assert stats["connections"] >= 1
+    assert stats["oldest_connection_age"] >= 0.0
+    assert all(
+        "connected_at" in record.info for record in pool_metrics["reader"].records
+    )
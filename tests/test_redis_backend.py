@@ -0,0 +1,52 @@
+""" Import the required modules """
+import time
+
+from modules.base.helpers.cache import RedisBackend
+
+
+async def test_deleting_a_tag_deletes_only_its_keys(redis):
+    backend = RedisBackend()
+    for index in range(1200):
+        await backend.set(response=b"value", key=f"tag::{index}")
+    await backend.set(response=b"value", key="other::1")
+
+    await backend.delete_startswith(value="tag")
+
+    assert await redis.keys("tag::*") == []
+    assert await redis.exists("cache:index:tag") == 0
+    assert await backend.get(key="other::1") == b"value"
+    assert await redis.keys("cache:index:tag:*") == []
+
+
+async def test_a_prefix_without_an_index_is_scanned(redis):
+    backend = RedisBackend()
+    for key in ("tag::user:1", "tag::user:2", "tag::group:1"):
+        await backend.set(response=b"value", key=key)
+    await redis.set("unindexed::1", b"value")
+
+    await backend.delete_startswith(value="tag::user")
+    await backend.delete_startswith(value="unindexed")
+
+    assert await redis.keys("tag::*") == [b"tag::group:1"]
+    assert await redis.get("unindexed::1") is None
+
+
+async def test_the_scanned_prefix_is_matched_literally(redis):
+    backend = RedisBackend()
+    await redis.set("tag::a*b", b"value")
+    await redis.set("tag::axb", b"value")
+
+    await backend.delete_startswith(value="tag::a*")
+
+    assert await redis.keys("tag::*") == [b"tag::axb"]
+
+
+async def test_the_index_is_scored_by_expiry_and_pruned(redis):
+    backend = RedisBackend()
+    await redis.zadd("cache:index:tag", {"tag::expired": time.time() - 1})
+
+    await backend.set(response=b"value", key="tag::1", ttl=60)
+
+    members = await redis.zrange("cache:index:tag", 0, -1, withscores=True)
+    assert [member for member, _ in members] == [b"tag::1"]
+    assert members[0][1] > time.time() + 59
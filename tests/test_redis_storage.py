@@ -0,0 +1,43 @@
+""" Import the required modules """
+import time
+
+import pytest
+
+from modules.base.config import config
+from modules.base.services.redis.storage import RedisStorageService
+
+
+@pytest.fixture
+def storage(redis) -> RedisStorageService:
+    return RedisStorageService(prefix="test:claim")
+
+
+def make_item(key: str, user_id: int, **attributes) -> dict:
+    return {
+        config.CLAIM_TABLE_KEY: key,
+        config.CLAIM_TABLE_USER_KEY: user_id,
+        "ttl": int(time.time()) + 60,
+        **attributes
+    }
+
+
+async def test_delete_user_data_deletes_the_claims_and_the_index(storage, redis):
+    for key, user_id in (("first", 1), ("second", 1), ("third", 2)):
+        await storage.set_data(make_item(key, user_id))
+
+    deleted = await storage.delete_user_data(1, values=["first", "orphan"])
+
+    assert sorted(deleted) == ["first", "orphan", "second"]
+    assert await redis.exists(storage._user_key(1)) == 0
+    items = await storage.get_many(["first", "second", "third"])
+    assert [item[config.CLAIM_TABLE_KEY] for item in items] == ["third"]
+
+
+async def test_query_by_another_attribute_scans_the_items(storage):
+    await storage.set_data(make_item("first", 1, ip_address="10.0.0.1"))
+    await storage.set_data(make_item("second", 2, ip_address="10.0.0.2"))
+
+    items = await storage.query_data({"ip_address": "10.0.0.2"})
+
+    assert [item[config.CLAIM_TABLE_KEY] for item in items] == ["second"]
+    assert await storage.query_data({"ip_address": "10.0.0.3"}) is None
@@ -0,0 +1,31 @@
+""" Import the required modules """
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from modules.base.db.replicas import ReplicaBalancer
+
+
+def make_balancer(**kwargs) -> ReplicaBalancer:
+    engines = [
+        create_async_engine("sqlite+aiosqlite://", pool_logging_name=f"replica_{index}")
+        for index in range(2)
+    ]
+    return ReplicaBalancer(engines, **kwargs)
+
+
+def test_without_health_checks_a_replica_is_readmitted_after_the_cooldown():
+    balancer = make_balancer(health_check_interval=0, eject_cooldown=30)
+    replica = balancer.replicas[0]
+
+    replica.eject("connection lost")
+    assert {balancer.choose() for _ in range(4)} == {balancer.replicas[1].engine}
+
+    replica.ejected_at -= 30
+    assert {balancer.choose() for _ in range(4)} == set(balancer.engines)
+
+
+def test_with_health_checks_the_readmission_is_left_to_them():
+    balancer = make_balancer(health_check_interval=10, eject_cooldown=0)
+
+    balancer.replicas[0].eject("connection lost")
+
+    assert {balancer.choose() for _ in range(4)} == {balancer.replicas[1].engine}
@@ -0,0 +1,55 @@
+""" Import the required modules """
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from modules.base.exceptions import BadRequestException
+from modules.core.repositories.organization_repository import OrganizationRepository
+
+
+@pytest.fixture
+async def repository(db) -> OrganizationRepository:
+    repository = OrganizationRepository()
+    await repository.bulk_create([
+        {"type_id": 1, "display_name": f"Organization {index}"} for index in range(3)
+    ])
+    db.expunge_all()
+    return repository
+
+
+async def test_a_dict_spec_picks_the_strategy_of_each_relationship(repository, query_budget):
+    with query_budget(3) as stats:
+        models = await repository.get_all(join_={"type": "selectin", "configurations": "selectin"})
+    assert stats.count == 3
+
+    repository.session.expunge_all()
+    with query_budget(2) as stats:
+        models = await repository.get_all(join_={"type": "joined", "configurations": "selectin"})
+    assert stats.count == 2
+
+    assert len(models) == 3
+    assert all("type" in model.__dict__ and model.configurations == [] for model in models)
+
+
+async def test_a_set_spec_uses_the_strategies_of_the_repository(repository, query_budget):
+    with query_budget(2):
+        models = await repository.get_all(join_={"type", "configurations"})
+
+    assert len(models) == 3
+
+
+async def test_the_raise_strategy_forbids_the_lazy_load(repository):
+    models = await repository.get_all(join_={"type": "raise"})
+
+    with pytest.raises(InvalidRequestError):
+        _ = models[0].type
+
+
+@pytest.mark.parametrize("join_", [
+    {"missing": "selectin"},
+    {"display_name": "selectin"},
+    {"missing"},
+    {"type": "lazy"},
+])
+async def test_an_invalid_join_is_a_bad_request(repository, join_):
+    with pytest.raises(BadRequestException):
+        await repository.get_all(join_=join_)
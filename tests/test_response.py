@@ -0,0 +1,97 @@
+""" Import the required modules """
+import json
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from modules.base.config import config
+from modules.base.exceptions.base import EntityNotFoundException
+from modules.base.models.response import (
+    ErrorModel,
+    JsonErrorResponse,
+    JsonSuccessResponse,
+    SuccessModel,
+)
+
+
+class Item(BaseModel):
+    name: str
+    hash: UUID
+    created_at: datetime
+    tags: list[str]
+
+
+ITEM = Item(
+    name="Société Générale ✓",
+    hash=UUID("6f1c2b7e-2b1a-11ef-9a4e-0242ac120002"),
+    created_at=datetime(2024, 6, 1, 12, 30, 15, 123456),
+    tags=["a", "b"],
+)
+
+
+def dumps(model: BaseModel) -> bytes:
+    """ The rendering before the single pass, through a dict """
+    return json.dumps(
+        model.model_dump(mode="json"),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def test_a_model_renders_as_before():
+    response = JsonSuccessResponse(ITEM, metadata={"total": 1})
+
+    assert response.body == dumps(
+        SuccessModel[BaseModel](data=ITEM, metadata={"total": 1})
+    )
+
+
+def test_a_list_and_a_boolean_render_as_before():
+    assert JsonSuccessResponse([ITEM, ITEM]).body == dumps(
+        SuccessModel[list](data=[ITEM, ITEM])
+    )
+    assert JsonSuccessResponse(True, message="done").body == dumps(
+        SuccessModel[bool](message="done", data=True)
+    )
+
+
+def test_the_metadata_is_rendered():
+    body = json.loads(JsonSuccessResponse([], metadata={"next_cursor": "abc"}).body)
+
+    assert body["metadata"] == {"next_cursor": "abc"}
+    assert json.loads(JsonSuccessResponse([]).body)["metadata"] is None
+
+
+def test_an_error_renders_as_before():
+    response = JsonErrorResponse(EntityNotFoundException(message="Not found ✗"))
+
+    expected = ErrorModel(
+        status_code=response.status_code,
+        message="Not found ✗",
+        errors={
+            "code": EntityNotFoundException.error_code,
+            "msg_code": "error_code_entity_not_found",
+            "context": "EntityNotFoundException",
+        },
+    )
+    assert response.body == dumps(expected)
+
+
+def test_the_static_headers_are_added_once():
+    response = JsonSuccessResponse(ITEM)
+
+    names = [name for name, _ in response.raw_headers]
+    for name, value in config.RESPONSE_HEADERS.items():
+        assert names.count(name.lower().encode()) == 1
+        assert response.headers[name] == value
+    assert response.headers["content-length"] == str(len(response.body))
+
+
+def test_the_headers_of_the_caller_win():
+    response = JsonSuccessResponse(ITEM, headers={"Cache-Control": "max-age=60"})
+
+    assert response.headers.getlist("cache-control") == ["max-age=60"]
+    assert response.headers["content-length"] == str(len(response.body))
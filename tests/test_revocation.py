@@ -0,0 +1,30 @@
+""" Import the required modules """
+import time
+
+import pytest
+
+from modules.base.config import Config, ProductionConfig
+from modules.base.services.auth.revocation_service import TokenRevocationList
+
+
+async def test_a_revocation_is_seen_by_the_other_workers(redis):
+    first = TokenRevocationList(storage="redis", key="test:revoked")
+    second = TokenRevocationList(storage="redis", key="test:revoked")
+
+    await first.revoke("token-id", int(time.time()) + 60)
+    assert second.is_revoked("token-id") is False
+
+    await second.refresh()
+
+    assert second.is_revoked("token-id") is True
+
+
+def test_memory_revocations_are_refused_with_several_workers():
+    with pytest.raises(ValueError):
+        ProductionConfig(
+            AUTH_VERIFICATION_MODE="jwt", AUTH_REVOCATION_STORAGE="memory"
+        )
+
+    assert Config(
+        AUTH_VERIFICATION_MODE="jwt", AUTH_REVOCATION_STORAGE="memory", APP_WORKERS=1
+    ).APP_WORKERS == 1
@@ -0,0 +1,75 @@
+""" Import the required modules """
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import selectinload
+
+from modules.core.repositories.organization_repository import OrganizationRepository
+from modules.core.schemas import OrganizationConfigurationSchema, OrganizationSchema
+
+
+@pytest.fixture
+async def organizations(db) -> tuple[OrganizationSchema, OrganizationSchema]:
+    """ A kept and a soft deleted organization, the latter with a configuration """
+    repository = OrganizationRepository()
+    kept, deleted = await repository.bulk_create([
+        {"type_id": 1, "display_name": "Kept"},
+        {"type_id": 1, "display_name": "Deleted"},
+    ])
+    db.add(OrganizationConfigurationSchema(
+        organization_id=deleted.id, configuration_id=1, data_value="value"
+    ))
+    await db.commit()
+    await repository.bulk_soft_delete([deleted.id])
+    db.expunge_all()
+    return kept, deleted
+
+
+async def test_get_by_hides_the_soft_deleted_rows(organizations):
+    kept, deleted = organizations
+    repository = OrganizationRepository()
+
+    with pytest.raises(NoResultFound):
+        await repository.get_by("id", deleted.id, unique=True)
+    assert [model.id for model in await repository.get_by("type_id", 1)] == [kept.id]
+
+    model = await repository.get_by("id", deleted.id, unique=True, include_deleted=True)
+    assert model.deleted_at is not None
+
+
+async def test_get_by_hash_hides_the_soft_deleted_rows(organizations):
+    _, deleted = organizations
+    repository = OrganizationRepository()
+
+    with pytest.raises(NoResultFound):
+        await repository.get_by_hash(deleted.hash)
+
+    assert (await repository.get_by_hash(deleted.hash, include_deleted=True)).id == deleted.id
+
+
+async def test_get_many_hides_the_soft_deleted_rows(organizations):
+    kept, deleted = organizations
+    repository = OrganizationRepository()
+    ids = [kept.id, deleted.id]
+
+    assert [model.id for model in await repository.get_many("id", ids)] == [kept.id]
+    assert sorted(
+        model.id for model in await repository.get_many("id", ids, include_deleted=True)
+    ) == sorted(ids)
+
+
+async def test_a_relationship_load_hides_the_soft_deleted_rows(db, organizations):
+    _, deleted = organizations
+    query = (
+        select(OrganizationConfigurationSchema)
+        .options(selectinload(OrganizationConfigurationSchema.organization))
+    )
+
+    configuration = (await db.execute(query)).scalar_one()
+    assert configuration.organization is None
+
+    db.expunge_all()
+    configuration = (
+        await db.execute(query.execution_options(include_deleted=True))
+    ).scalar_one()
+    assert configuration.organization.id == deleted.id
@@ -0,0 +1,53 @@
+""" Import the required modules """
+import asyncio
+import time
+
+from redis.asyncio import Redis
+
+from modules.base.helpers.cache import MemoryBackend, TieredBackend
+from modules.base.helpers.cache import tiered_backend
+
+
+async def wait_until(condition, timeout: float = 1.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+async def test_an_invalidation_drops_the_l1_of_every_worker(redis):
+    shared = MemoryBackend()
+    workers = [TieredBackend(shared), TieredBackend(shared)]
+    for worker in workers:
+        await worker.startup()
+    try:
+        await wait_until(lambda: all(worker._subscribed for worker in workers))
+        await workers[0].set(response=b"value", key="tag::key")
+        assert await workers[1].get(key="tag::key") == b"value"
+
+        await workers[0].delete_startswith(value="tag")
+
+        await wait_until(lambda: workers[1].local.get("tag::key") is None)
+        assert await workers[1].get(key="tag::key") is None
+    finally:
+        for worker in workers:
+            await worker.shutdown()
+
+
+async def test_without_redis_the_l2_is_served(monkeypatch):
+    # Nothing listens on the port, every Redis call fails
+    unreachable = Redis(port=1, socket_connect_timeout=0.1)
+    monkeypatch.setattr(tiered_backend, "redis_client", unreachable)
+    worker = TieredBackend(MemoryBackend())
+
+    await worker.startup()
+    try:
+        await worker.set(response=b"value", key="tag::key")
+        assert worker.local.get("tag::key") is None
+        assert await worker.get(key="tag::key") == b"value"
+
+        await worker.delete_startswith(value="tag")
+        assert await worker.get(key="tag::key") is None
+    finally:
+        await worker.shutdown()
+        await unreachable.aclose()
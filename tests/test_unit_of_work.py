@@ -0,0 +1,66 @@
+""" Import the required modules """
+import pytest
+
+from modules.base.db import Transactional
+from modules.core.models.organization.request import OrganizationUpdateRequest
+from modules.core.repositories.organization_repository import OrganizationRepository
+from modules.core.services.organization_service import OrganizationService
+
+
+def make_attributes(index: int) -> dict:
+    return {
+        "type_id": 1,
+        "display_name": f"Organization {index}",
+        "legal_name": f"Organization {index} Inc",
+    }
+
+
+async def test_create_within_a_unit_of_work_sets_the_ids(db, query_budget):
+    repository = OrganizationRepository()
+
+    @Transactional()
+    async def create_two():
+        return [await repository.create(make_attributes(index)) for index in range(2)]
+
+    with query_budget(2) as stats:
+        models = await create_two()
+
+    assert stats.count == 2
+    assert all(model.id is not None for model in models)
+    assert len(await repository.get_all()) == 2
+
+
+async def test_a_failing_unit_of_work_is_rolled_back(db):
+    repository = OrganizationRepository()
+
+    @Transactional()
+    async def create_then_fail():
+        await repository.create(make_attributes(0))
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        await create_then_fail()
+
+    assert await repository.get_all() == []
+
+
+async def test_organization_update_and_delete_queries(db, cache, query_budget):
+    repository = OrganizationRepository()
+    created = await repository.bulk_create([make_attributes(0)])
+    uid = created[0].hash
+    db.expunge_all()
+    service = OrganizationService()
+
+    with query_budget(2) as stats:
+        model = await service.update(
+            uid, OrganizationUpdateRequest.model_construct(display_name="Renamed"),
+            "127.0.0.1", {"id": 7}
+        )
+    assert stats.count == 2
+    assert (model.display_name, model.updated_by) == ("Renamed", 7)
+
+    db.expunge_all()
+    with query_budget(2) as stats:
+        await service.delete(uid, "127.0.0.1", {"id": 7})
+    assert stats.count == 2
+    assert await repository.get_all() == []